@@ -0,0 +1 @@
+"""Micro-benchmarks for the MCP Tool Crawler."""
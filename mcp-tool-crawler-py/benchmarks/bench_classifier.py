@@ -0,0 +1,39 @@
+"""
+Benchmark keyword classification of a large catalog.
+
+Times classifying synthetic tool names and descriptions one at a time and in
+a single batch, as done when a whole catalog is re-tagged after a taxonomy
+change.
+
+Usage:
+    python -m benchmarks.bench_classifier [--tools 100000] [--repeat 3]
+"""
+
+import argparse
+import random
+
+from benchmarks.bench_readme_parser import WORDS, best_of
+from src.crawlers.classifier import get_keyword_classifier
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark keyword classification')
+    parser.add_argument('--tools', type=int, default=100_000, help='Synthetic tools to classify')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per mode')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    texts = [f"tool-{i} " + ' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 25)))
+             for i in range(args.tools)]
+    classifier = get_keyword_classifier()
+
+    single = best_of(lambda: [classifier.classify(text) for text in texts], args.repeat)
+    batch = best_of(lambda: classifier.classify_batch(texts), args.repeat)
+
+    print(f"{args.tools} tools, {classifier.keyword_count} keywords")
+    print(f"one at a time: {single * 1000:.1f}ms")
+    print(f"batch:         {batch * 1000:.1f}ms ({single / batch:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Benchmark building tools from stored catalog records.
+
+Times building every tool of a loaded catalog with full validation and
+through the unvalidated bulk path used for catalogs this package wrote.
+
+Usage:
+    python -m benchmarks.bench_models [--tools 100000] [--repeat 3]
+"""
+
+import argparse
+
+from benchmarks.bench_readme_parser import best_of
+from src.models import MCPTool
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark tool construction')
+    parser.add_argument('--tools', type=int, default=100_000, help='Stored tool records to build')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per mode')
+    args = parser.parse_args()
+
+    records = [
+        MCPTool(name=f"tool-{i}", description=f"An MCP server for service {i}",
+                url=f"https://github.com/org-{i % 500}/tool-{i}",
+                source_url='https://github.com/example/awesome-mcp',
+                metadata={'tags': ['api', 'agent'], 'sections': ['Servers']}).model_dump()
+        for i in range(args.tools)
+    ]
+
+    validated = best_of(lambda: [MCPTool(**record) for record in records], args.repeat)
+    stored = best_of(lambda: MCPTool.bulk_from_stored(records), args.repeat)
+    assert MCPTool.bulk_from_stored(records[:1]) == [MCPTool(**records[0])], 'bulk path changed a tool'
+
+    count = len(records)
+    print(f"{count} tools")
+    print(f"validated: {validated * 1000:8.1f}ms ({validated / count * 1e6:.2f}us per tool)")
+    print(f"stored:    {stored * 1000:8.1f}ms ({stored / count * 1e6:.2f}us per tool, {validated / stored:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark README parsing on synthetic awesome lists.
+
+Compares the streaming Markdown parser used by GitHubAwesomeListCrawler
+against the original two-pass regex implementation on a generated 100k-line
+README.
+
+Usage:
+    python -m benchmarks.bench_readme_parser [--lines 100000] [--repeat 5]
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Callable, List
+
+from src.crawlers.classifier import Classification
+from src.crawlers.github_awesome_list import GitHubAwesomeListCrawler
+from src.crawlers.incremental import LineDiff
+from src.models import MCPTool, Source, SourceType
+
+WORDS = ['fast', 'simple', 'server', 'client', 'python', 'typescript', 'tool', 'data',
+         'mcp', 'context', 'retrieval', 'embedding', 'search', 'agent', 'api', 'cli']
+
+
+def generate_readme(lines: int, seed: int = 0) -> str:
+    """
+    Generate a synthetic awesome-list README.
+
+    Args:
+        lines: Number of lines to generate.
+        seed: Random seed.
+
+    Returns:
+        README markdown content.
+    """
+    rng = random.Random(seed)
+    out = []
+    for i in range(lines):
+        roll = rng.random()
+        words = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 12)))
+        if roll < 0.55:
+            out.append(f"- [tool-{i}](https://github.com/owner{i}/repo{i}) - {words}")
+        elif roll < 0.65:
+            out.append(f"| [tool-{i}](https://github.com/owner{i}/repo{i}) | {words} |")
+        elif roll < 0.70:
+            out.append(f"## Section {i}")
+        elif roll < 0.80:
+            out.append('')
+        else:
+            out.append(words.capitalize() + '.')
+    return '\n'.join(out)
+
+
+def legacy_extract(crawler: GitHubAwesomeListCrawler, content: str) -> List[MCPTool]:
+    """
+    The previous implementation: two passes with uncompiled patterns.
+    """
+    tools = []
+
+    list_pattern = r'^\s*[-*+]\s*\[([^\]]+)\]\(([^)]+)\)(.*?)$'
+    for line in content.split('\n'):
+        match = re.match(list_pattern, line)
+        if match:
+            name = match.group(1).strip()
+            url = match.group(2).strip()
+            description = match.group(3).strip()
+            description = re.sub(r'^[:-]\s*', '', description)
+            if name and url and crawler.is_mcp_tool(name, description):
+                tools.append(MCPTool(name=name, description=description or name, url=url,
+                                     source_url=crawler.source.url,
+                                     metadata={"tags": crawler.extract_tags(name, description)}))
+
+    table_pattern = r'^\s*\|\s*\[([^\]]+)\]\(([^)]+)\)\s*\|\s*([^|]+)'
+    for line in content.split('\n'):
+        match = re.match(table_pattern, line)
+        if match:
+            name = match.group(1).strip()
+            url = match.group(2).strip()
+            description = match.group(3).strip()
+            if name and url and crawler.is_mcp_tool(name, description):
+                tools.append(MCPTool(name=name, description=description, url=url,
+                                     source_url=crawler.source.url,
+                                     metadata={"tags": crawler.extract_tags(name, description)}))
+
+    return tools
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    """
+    Run a function several times and return the fastest wall time.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark README parsing')
+    parser.add_argument('--lines', type=int, default=100_000, help='Lines in the synthetic README')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per implementation')
+    args = parser.parse_args()
+
+    content = generate_readme(args.lines)
+    source = Source(url='https://github.com/example/awesome-mcp', name='bench',
+                    type=SourceType.GITHUB_AWESOME_LIST, has_known_crawler=True)
+    crawler = GitHubAwesomeListCrawler(source)
+
+    # Tokenizing only: no entry is MCP-related, so no tools are built
+    crawler.is_mcp_tool = lambda name, description: False
+    crawler.classify_batch = lambda names, descriptions: [Classification(False, [])] * len(names)
+    legacy_scan = best_of(lambda: legacy_extract(crawler, content), args.repeat)
+    scan = best_of(lambda: crawler._extract_tools_from_readme(content), args.repeat)
+    del crawler.is_mcp_tool
+    del crawler.classify_batch
+
+    expected = legacy_extract(crawler, content)
+    actual = crawler._extract_tools_from_readme(content)
+    assert {t.url for t in expected} <= {t.url for t in actual}, 'streaming parser missed entries'
+
+    legacy_full = best_of(lambda: legacy_extract(crawler, content), args.repeat)
+    full = best_of(lambda: crawler._extract_tools_from_readme(content), args.repeat)
+
+    # Re-crawl after 1% of the entries changed, with and without the last parse
+    signature = crawler.parse_signature()
+    previous = LineDiff(None, signature)
+    crawler._extract_tools_from_readme(content, previous)
+    lines = content.split('\n')
+    entry_lines = [i for i, line in enumerate(lines) if line.startswith(('-', '|'))]
+    for i in entry_lines[::100]:
+        lines[i] += ' (updated)'
+    edited = '\n'.join(lines)
+    recrawl = best_of(lambda: crawler._extract_tools_from_readme(edited), args.repeat)
+    incremental = best_of(
+        lambda: crawler._extract_tools_from_readme(edited, LineDiff(previous.state, signature)), args.repeat
+    )
+
+    print(f"{args.lines} lines, {len(expected)} tools (two-pass), {len(actual)} tools (streaming)")
+    print(f"{'':12}{'two-pass':>12}{'streaming':>14}{'speedup':>10}")
+    print(f"{'tokenize':12}{legacy_scan * 1000:>10.1f}ms{scan * 1000:>12.1f}ms{legacy_scan / scan:>9.1f}x")
+    print(f"{'end-to-end':12}{legacy_full * 1000:>10.1f}ms{full * 1000:>12.1f}ms{legacy_full / full:>9.1f}x")
+    print(f"{'':12}{'full':>12}{'incremental':>14}{'speedup':>10}")
+    print(f"{'1% edited':12}{recrawl * 1000:>10.1f}ms{incremental * 1000:>12.1f}ms{recrawl / incremental:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
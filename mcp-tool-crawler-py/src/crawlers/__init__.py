@@ -8,9 +8,11 @@ This package contains crawlers for different types of sources:
 """
 
 from enum import Enum
-from typing import Type
+from typing import Optional, Type
 
 from ..models import Source, SourceType
+from ..services.catalog_index import CatalogIndex
+from ..utils.http_client import HttpClient
 from .github_awesome_list import GitHubAwesomeListCrawler
 
 
@@ -19,12 +21,16 @@ class CrawlerTypes(Enum):
     GITHUB_AWESOME_LIST = GitHubAwesomeListCrawler
     
 
-def get_crawler_for_source(source: Source):
+def get_crawler_for_source(source: Source, http_client: Optional[HttpClient] = None,
+                           catalog: Optional[CatalogIndex] = None):
     """
     Get the appropriate crawler for a source.
     
     Args:
         source: The source to get a crawler for.
+        http_client: HTTP client the crawler should fetch with. If None, the
+                     crawler uses the shared client.
+        catalog: Catalog index the crawler should count changes against.
         
     Returns:
         An instance of the appropriate crawler for the source.
@@ -33,7 +39,7 @@ def get_crawler_for_source(source: Source):
         ValueError: If no crawler is available for the source type.
     """
     if source.type == SourceType.GITHUB_AWESOME_LIST:
-        return GitHubAwesomeListCrawler(source)
+        return GitHubAwesomeListCrawler(source, http_client, catalog)
     
     # Add more crawler types here as they are implemented
         
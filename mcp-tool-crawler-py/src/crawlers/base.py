@@ -2,33 +2,82 @@
 Base crawler class for MCP tools.
 """
 
+import asyncio
+import hashlib
 import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 
 from ..models import Source, MCPTool, CrawlResult
+from .classifier import Classification, get_keyword_classifier
 from ..utils.logging import get_logger
 from ..utils.helpers import get_timestamp
+from ..utils.http_client import HttpClient, get_http_client
+from ..services.catalog_index import CatalogIndex
 
 logger = get_logger(__name__)
 
 
+class SourceUnchanged(Exception):
+    """
+    Raised by a crawler when the source content has not changed since the last
+    successful crawl, so there is nothing to parse.
+    """
+
+
 class BaseCrawler(ABC):
     """
     Base class for all MCP tool crawlers.
     """
     
-    def __init__(self, source: Source):
+    # Bump when a change to a crawler's parsing should re-parse unchanged content
+    parser_version = '1'
+    
+    def __init__(self, source: Source, http_client: Optional[HttpClient] = None,
+                 catalog: Optional[CatalogIndex] = None):
         """
         Initialize the crawler.
         
         Args:
             source: The source to crawl.
+            http_client: HTTP client to fetch with. If None, uses the shared client.
+            catalog: Index of the tool catalog, shared by the crawlers of a run.
+                     If given, discovered tools are counted as new, updated or
+                     removed against it.
         """
         self.source = source
-        self.user_agent = "MCP-Tool-Crawler/1.0"
+        self.http = http_client or get_http_client()
+        self.catalog = catalog
+        self.user_agent = self.http.user_agent
+        # Content fetched ahead of time by a batch query, if any
+        self.prefetched: Optional[Any] = None
+        # Digest of the content this crawl parsed, set by raise_if_unchanged()
+        self.content_digest: Optional[str] = None
+        # Tool changes since the last crawl, set by crawlers that can diff content
+        self.new_tools: Optional[int] = None
+        self.updated_tools: Optional[int] = None
+    
+    def apply_prefetched(self, prefetched: Any) -> None:
+        """
+        Hand the crawler content that was fetched ahead of time in a batch.
+        
+        Crawlers that can use it skip their own fetch; others ignore it.
+        
+        Args:
+            prefetched: Batch-fetched content for this crawler's source.
+        """
+        self.prefetched = prefetched
     
     def execute(self) -> CrawlResult:
+        """
+        Execute the crawler from synchronous code and return the results.
+        
+        Returns:
+            A CrawlResult object.
+        """
+        return asyncio.run(self.execute_async())
+    
+    async def execute_async(self) -> CrawlResult:
         """
         Execute the crawler and return the results.
         
@@ -40,9 +89,18 @@ class BaseCrawler(ABC):
         
         try:
             # Discover tools
-            discovered_tools = self.discover_tools()
+            async with self.http:
+                discovered_tools = await self.discover_tools()
             
             # Calculate results
+            if self.catalog is not None:
+                changes = self.catalog.apply(self.source.url, discovered_tools)
+                new_tools, updated_tools = len(changes.new), len(changes.updated)
+                removed_tools = len(changes.removed)
+            else:
+                new_tools = self.new_tools if self.new_tools is not None else len(discovered_tools)
+                updated_tools, removed_tools = self.updated_tools or 0, 0
+            
             duration_ms = int((time.time() - start_time) * 1000)
             
             result = CrawlResult(
@@ -50,14 +108,33 @@ class BaseCrawler(ABC):
                 timestamp=get_timestamp(),
                 success=True,
                 tools_discovered=len(discovered_tools),
-                new_tools=len(discovered_tools),  # Simplified - in real implementation, we'd check against existing tools
-                updated_tools=0,
-                duration=duration_ms
+                new_tools=new_tools,
+                updated_tools=updated_tools,
+                removed_tools=removed_tools,
+                duration=duration_ms,
+                content_digest=self.content_digest
             )
             
-            logger.info(f"Crawl completed for {self.source.name}: {result.new_tools} new tools, {result.updated_tools} updated")
+            logger.info(f"Crawl completed for {self.source.name}: {result.new_tools} new tools, "
+                        f"{result.updated_tools} updated, {result.removed_tools} removed")
             return result
         
+        except SourceUnchanged:
+            duration_ms = int((time.time() - start_time) * 1000)
+            logger.info(f"Source unchanged since last crawl, skipped parsing: {self.source.name}")
+            
+            return CrawlResult(
+                source_id=self.source.id,
+                timestamp=get_timestamp(),
+                success=True,
+                tools_discovered=0,
+                new_tools=0,
+                updated_tools=0,
+                duration=duration_ms,
+                unchanged=True,
+                content_digest=self.content_digest
+            )
+        
         except Exception as e:
             logger.error(f"Error crawling {self.source.name}: {str(e)}")
             
@@ -78,7 +155,7 @@ class BaseCrawler(ABC):
             return result
     
     @abstractmethod
-    def discover_tools(self) -> List[MCPTool]:
+    async def discover_tools(self) -> List[MCPTool]:
         """
         Discover tools from the source.
         
@@ -90,6 +167,124 @@ class BaseCrawler(ABC):
         """
         raise NotImplementedError("Subclasses must implement discover_tools()")
     
+    async def commit(self) -> None:
+        """
+        Save what this crawl learned about its source for the next crawl.
+        
+        Call this only once the discovered tools are in the catalog, so that a
+        failed catalog write leaves the next crawl to parse the source again.
+        Crawlers that keep no state between crawls have nothing to save.
+        """
+    
+    async def fetch_text(self, url: str, headers: Optional[Dict[str, str]] = None,
+                         skip_if_unchanged: bool = False) -> str:
+        """
+        Fetch a URL through the crawler's HTTP client.
+        
+        Transient failures are retried by the client with jittered backoff; a
+        host that keeps failing has its circuit opened and is failed fast.
+        
+        Args:
+            url: URL to fetch.
+            headers: Optional extra request headers.
+            skip_if_unchanged: If True and the server reports the content as not
+                               modified, check the cached body against the
+                               source's stored digest as raise_if_unchanged()
+                               does, and raise SourceUnchanged instead of
+                               returning it if they match.
+            
+        Returns:
+            Response body as a string.
+            
+        Raises:
+            HttpError: If the request fails after retries, returns an error
+                       status, or the host's circuit is open.
+            SourceUnchanged: If skip_if_unchanged is set and the content is unchanged.
+        """
+        response = await self.http.get(url, headers=headers)
+        
+        # A 304 only says the body matches the cached one. The stored digest
+        # is saved once the body's tools are in the catalog, and covers the
+        # parser and taxonomy that parsed it
+        if skip_if_unchanged and response.not_modified:
+            self.raise_if_unchanged(response.text)
+        
+        return response.text
+    
+    def parse_signature(self) -> str:
+        """
+        Identify how this crawler turns content into tools.
+        
+        Returns:
+            The crawler class, its parser version and the taxonomy fingerprint.
+        """
+        return f"{type(self).__name__}:{self.parser_version}:{get_keyword_classifier().fingerprint}"
+    
+    def compute_digest(self, content: str) -> str:
+        """
+        Compute the digest that identifies a crawl of some content.
+        
+        The crawler's parser version and the keyword taxonomy are included, so
+        content is parsed again after either changes.
+        
+        Args:
+            content: Source content.
+            
+        Returns:
+            Hex SHA-256 digest.
+        """
+        digest = hashlib.sha256(f"{self.parse_signature()}\n".encode('utf-8'))
+        digest.update(content.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def raise_if_unchanged(self, content: str) -> None:
+        """
+        Record the digest of fetched content and stop the crawl if it matches
+        the digest stored on the source by the last successful crawl.
+        
+        Call this once the content is in hand and before parsing it.
+        
+        Args:
+            content: Source content.
+            
+        Raises:
+            SourceUnchanged: If the content is byte-identical to the last crawl.
+        """
+        self.content_digest = self.compute_digest(content)
+        if (self.source.last_crawl_status == 'success'
+                and self.source.metadata.get('content_digest') == self.content_digest):
+            raise SourceUnchanged(self.source.url)
+    
+    def classify(self, name: str, description: str) -> Classification:
+        """
+        Decide MCP relevance and extract tags in one scan of name and description.
+        
+        Args:
+            name: Tool name.
+            description: Tool description.
+            
+        Returns:
+            The relevance verdict and tags.
+        """
+        return get_keyword_classifier().classify(f"{name} {description}")
+    
+    def classify_batch(self, names: Sequence[str], descriptions: Sequence[str]) -> List[Classification]:
+        """
+        Decide MCP relevance and extract tags for many candidates in one call.
+        
+        Args:
+            names: Tool names.
+            descriptions: Tool descriptions, aligned with names.
+            
+        Returns:
+            One classification per candidate, in order.
+        """
+        if len(names) != len(descriptions):
+            raise ValueError("names and descriptions must have the same length")
+        return get_keyword_classifier().classify_batch(
+            [f"{name} {description}" for name, description in zip(names, descriptions)]
+        )
+    
     def is_mcp_tool(self, name: str, description: str) -> bool:
         """
         Determine if a tool is an MCP tool based on name/description.
@@ -101,39 +296,7 @@ class BaseCrawler(ABC):
         Returns:
             True if the tool appears to be MCP-related, False otherwise.
         """
-        # Combine name and description for keyword matching
-        combined = f"{name} {description}".lower()
-        
-        # Keywords that suggest the tool is MCP-related
-        mcp_keywords = [
-            'mcp',
-            'machine context protocol',
-            'context window',
-            'ai context',
-            'llm context',
-            'large language model',
-            'ai assistant',
-            'code assistant',
-            'rag',
-            'retrieval',
-            'ai tool',
-            'ai agent',
-            'langchain',
-            'claude',
-            'openai',
-            'gpt',
-            'llama',
-            'prompt engineering',
-            'context engineering',
-            'document embedding',
-            'embedding',
-            'vector database',
-            'vector store',
-            'semantic search'
-        ]
-        
-        # Check if any of the keywords are present
-        return any(keyword in combined for keyword in mcp_keywords)
+        return self.classify(name, description).relevant
     
     def extract_tags(self, name: str, description: str) -> List[str]:
         """
@@ -146,38 +309,4 @@ class BaseCrawler(ABC):
         Returns:
             List of tags.
         """
-        tags = set()
-        
-        # Common tag categories for MCP tools
-        tag_categories = {
-            'library': ['library', 'sdk', 'framework', 'package', 'module'],
-            'cli': ['cli', 'command line', 'terminal'],
-            'api': ['api', 'service', 'endpoint', 'rest'],
-            'ui': ['ui', 'interface', 'dashboard', 'web app'],
-            'plugin': ['plugin', 'extension', 'addon'],
-            'rag': ['rag', 'retrieval', 'retrieval augmented', 'augmented generation'],
-            'embedding': ['embedding', 'embeddings', 'vector', 'vectorization'],
-            'indexing': ['index', 'indexing', 'indexer'],
-            'search': ['search', 'semantic search', 'query'],
-            'agent': ['agent', 'autonomous', 'autonomous agent'],
-        }
-        
-        # Combine name and description for keyword matching
-        combined = f"{name} {description}".lower()
-        
-        # Check for each tag category
-        for tag, keywords in tag_categories.items():
-            if any(keyword in combined for keyword in keywords):
-                tags.add(tag)
-        
-        # Add programming language tags if detected
-        languages = [
-            'python', 'javascript', 'typescript', 'java', 'c#', 'ruby',
-            'go', 'rust', 'php', 'swift', 'kotlin'
-        ]
-        
-        for lang in languages:
-            if lang in combined:
-                tags.add(lang)
-        
-        return list(tags)
\ No newline at end of file
+        return self.classify(name, description).tags
\ No newline at end of file
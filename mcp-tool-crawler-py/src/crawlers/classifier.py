@@ -0,0 +1,293 @@
+"""
+Keyword classification of candidate tools.
+
+Decides whether a tool looks MCP-related and which tags it gets, using a
+keyword taxonomy compiled once into a single multi-pattern matcher. Keywords
+only match whole words (with an optional plural "s"), so "go" does not match
+"google" and "rag" does not match "storage".
+"""
+
+import hashlib
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import yaml
+
+from ..utils.config import get_config
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+config = get_config()
+
+# Keywords that suggest a tool is MCP-related, and keywords for each tag.
+# Languages are tagged with their own name.
+DEFAULT_TAXONOMY: Dict[str, object] = {
+    'relevance': [
+        'mcp',
+        'machine context protocol',
+        'model context protocol',
+        'context window',
+        'ai context',
+        'llm context',
+        'large language model',
+        'ai assistant',
+        'code assistant',
+        'rag',
+        'retrieval',
+        'ai tool',
+        'ai agent',
+        'langchain',
+        'claude',
+        'openai',
+        'gpt',
+        'chatgpt',
+        'llama',
+        'llamaindex',
+        'prompt engineering',
+        'context engineering',
+        'document embedding',
+        'embedding',
+        'vector database',
+        'vector store',
+        'semantic search',
+    ],
+    'tags': {
+        'library': ['library', 'sdk', 'framework', 'package', 'module'],
+        'cli': ['cli', 'command line', 'terminal'],
+        'api': ['api', 'service', 'endpoint', 'rest'],
+        'ui': ['ui', 'interface', 'dashboard', 'web app'],
+        'plugin': ['plugin', 'extension', 'addon'],
+        'rag': ['rag', 'retrieval', 'retrieval augmented', 'augmented generation'],
+        'embedding': ['embedding', 'vector', 'vectorization'],
+        'indexing': ['index', 'indexing', 'indexer'],
+        'search': ['search', 'semantic search', 'query'],
+        'agent': ['agent', 'autonomous', 'autonomous agent'],
+    },
+    'languages': [
+        'python', 'javascript', 'typescript', 'java', 'c#', 'ruby',
+        'go', 'rust', 'php', 'swift', 'kotlin',
+    ],
+}
+
+RELEVANT_BIT = 1
+
+
+class Classification:
+    """
+    Result of classifying a piece of text.
+    """
+
+    __slots__ = ('relevant', 'tags')
+
+    def __init__(self, relevant: bool, tags: List[str]):
+        """
+        Initialize the classification.
+
+        Args:
+            relevant: True if the text looks MCP-related.
+            tags: Matched tags, sorted.
+        """
+        self.relevant = relevant
+        self.tags = tags
+
+
+class KeywordClassifier:
+    """
+    Multi-pattern keyword matcher built from a taxonomy.
+
+    All keywords are compiled into one regular expression shaped like a trie,
+    so each word start in the text is tested against every keyword in a single
+    walk. Matches are found with a zero-width lookahead, so overlapping
+    keywords ("ai context" and "context window") are all seen. Each keyword
+    maps to a bitmask of its labels, including those of the shorter keywords
+    it starts with, so taking the longest match at a position loses nothing
+    and combining matches is a bitwise OR.
+    """
+
+    def __init__(self, taxonomy: Mapping[str, object]):
+        """
+        Compile a taxonomy.
+
+        Args:
+            taxonomy: Mapping with a ``relevance`` list of keywords, a ``tags``
+                      mapping of tag to keywords, and an optional
+                      ``languages`` list of names that tag themselves.
+
+        Raises:
+            ValueError: If a keyword is empty or does not start with a letter or digit.
+        """
+        relevance = set(self._normalize(taxonomy.get('relevance') or []))
+        tag_keywords: Dict[str, List[str]] = {
+            tag: self._normalize(keywords) for tag, keywords in (taxonomy.get('tags') or {}).items()
+        }
+        for language in self._normalize(taxonomy.get('languages') or []):
+            tag_keywords.setdefault(language, []).append(language)
+
+        keywords: Dict[str, Tuple[bool, set]] = {}
+        for keyword in relevance:
+            keywords.setdefault(keyword, (True, set()))
+        for tag, tag_list in tag_keywords.items():
+            for keyword in tag_list:
+                relevant, tags = keywords.get(keyword, (False, set()))
+                tags.add(tag)
+                keywords[keyword] = (relevant, tags)
+
+        for keyword in keywords:
+            if not keyword[0].isalnum():
+                raise ValueError(f"Keyword must start with a letter or digit: {keyword!r}")
+
+        # Each keyword maps to a bitmask: bit 0 for relevance, one bit per tag
+        self.tags = sorted({tag for _, tags in keywords.values() for tag in tags})
+        tag_bits = {tag: 1 << (i + 1) for i, tag in enumerate(self.tags)}
+        self._masks: Dict[str, int] = {}
+        for keyword in keywords:
+            mask = 0
+            # Shorter keywords that the longest match would hide
+            for other, (other_relevant, other_tags) in keywords.items():
+                if keyword == other or (keyword.startswith(other)
+                                        and not _is_word_char(keyword[len(other)])):
+                    mask |= RELEVANT_BIT if other_relevant else 0
+                    for tag in other_tags:
+                        mask |= tag_bits[tag]
+            self._masks[keyword] = mask
+            if _is_word_char(keyword[-1]):
+                self._masks.setdefault(keyword + 's', mask)
+        self._tag_bits = tag_bits
+        self._decoded: Dict[int, Tuple[bool, Tuple[str, ...]]] = {}
+
+        self.keyword_count = len(keywords)
+        # Changes whenever the taxonomy would classify anything differently
+        self.fingerprint = hashlib.sha256(repr(sorted(
+            (keyword, relevant, sorted(tags)) for keyword, (relevant, tags) in keywords.items()
+        )).encode('utf-8')).hexdigest()[:16]
+        # A newline is matched too, to mark where one text of a batch ends
+        self._pattern = re.compile(r'(?=(\n|(?<!\w)' + _trie_pattern(sorted(keywords)) + r'))')
+
+    @staticmethod
+    def _normalize(keywords: Iterable[str]) -> List[str]:
+        normalized = [' '.join(str(keyword).lower().split()) for keyword in keywords]
+        if not all(normalized):
+            raise ValueError("Keywords must not be empty")
+        return normalized
+
+    def _decode(self, mask: int) -> Classification:
+        decoded = self._decoded.get(mask)
+        if decoded is None:
+            decoded = (bool(mask & RELEVANT_BIT),
+                       tuple(tag for tag in self.tags if mask & self._tag_bits[tag]))
+            self._decoded[mask] = decoded
+        return Classification(decoded[0], list(decoded[1]))
+
+    def classify(self, text: str) -> Classification:
+        """
+        Classify text in one scan.
+
+        Args:
+            text: Text to classify (matched case-insensitively).
+
+        Returns:
+            The relevance verdict and matched tags.
+        """
+        return self.classify_batch([text])[0]
+
+    def classify_batch(self, texts: Sequence[str]) -> List[Classification]:
+        """
+        Classify many texts in a single scan.
+
+        The texts are joined into one newline-separated string and matched in
+        one pass, with the newlines splitting the matches back into texts.
+        Keywords never contain newlines, so no match spans two texts.
+
+        Args:
+            texts: Texts to classify (matched case-insensitively).
+
+        Returns:
+            One classification per text, in order.
+        """
+        if not texts:
+            return []
+
+        joined = '\n'.join(text.replace('\n', ' ') for text in texts).lower()
+        masks = []
+        mask = 0
+        get_mask = self._masks.get
+        for match in self._pattern.findall(joined):
+            if match == '\n':
+                masks.append(mask)
+                mask = 0
+            else:
+                mask |= get_mask(match, 0)
+        masks.append(mask)
+
+        return [self._decode(mask) for mask in masks]
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def _trie_pattern(keywords: List[str]) -> str:
+    """
+    Build a regex alternation shaped like a trie of the keywords.
+
+    Keywords ending in a word character must be followed by a non-word
+    character, optionally after a plural "s".
+    """
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = keyword
+
+    def build(node: Dict) -> str:
+        alternatives = []
+        # Longer continuations first, so the longest keyword wins
+        for char in sorted(key for key in node if key):
+            alternatives.append(re.escape(char) + build(node[char]))
+        if '' in node:
+            keyword = node['']
+            alternatives.append(r's?(?!\w)' if _is_word_char(keyword[-1]) else '')
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return '(?:' + '|'.join(alternatives) + ')'
+
+    return build(trie)
+
+
+def load_taxonomy(path: Optional[str] = None) -> Mapping[str, object]:
+    """
+    Load the keyword taxonomy.
+
+    Args:
+        path: YAML or JSON file with ``relevance``, ``tags`` and ``languages``
+              keys. If None, uses the file from config, or the built-in
+              taxonomy if none is configured.
+
+    Returns:
+        The taxonomy.
+    """
+    path = path or config['crawler']['taxonomy_file']
+    if not path:
+        return DEFAULT_TAXONOMY
+
+    with open(path, 'r') as f:
+        taxonomy = yaml.safe_load(f) or {}
+    logger.info(f"Loaded keyword taxonomy from {path}")
+    return taxonomy
+
+
+_keyword_classifier: Optional[KeywordClassifier] = None
+
+
+def get_keyword_classifier() -> KeywordClassifier:
+    """
+    Get the shared keyword classifier.
+
+    Returns:
+        The process-wide KeywordClassifier, compiled on first use.
+    """
+    global _keyword_classifier
+    if _keyword_classifier is None:
+        _keyword_classifier = KeywordClassifier(load_taxonomy())
+    return _keyword_classifier
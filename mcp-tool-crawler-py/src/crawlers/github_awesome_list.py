@@ -1,21 +1,43 @@
-import re
-import requests
-from typing import List, Dict, Any
-import os
+import io
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 from urllib.parse import urlparse
 
 from .base import BaseCrawler
+from .github_graphql import RepoSnapshot
+from .github_readme import ReadmeLocation, get_readme_resolver
+from .incremental import LineDiff, LineResult, ParseState
+from .markdown import KnownEntry, MarkdownEntry, iter_markdown_entries
 from ..models import MCPTool, Source
+from ..services.catalog_index import CatalogIndex
 from ..utils.logging import get_logger
-from ..utils.helpers import extract_github_repo_info
+from ..utils.helpers import extract_github_repo_info, slugify
+from ..utils.http_client import HttpClient, HttpError
 
 logger = get_logger(__name__)
 
+# Candidates classified per batch while streaming through a README
+CLASSIFY_BATCH_SIZE = 1000
+
 
 class GitHubAwesomeListCrawler(BaseCrawler):
     """Crawler for GitHub Awesome Lists"""
     
-    def discover_tools(self) -> List[MCPTool]:
+    def __init__(self, source: Source, http_client: Optional[HttpClient] = None,
+                 catalog: Optional[CatalogIndex] = None):
+        """
+        Initialize the crawler.
+        
+        Args:
+            source: The source to crawl.
+            http_client: HTTP client to fetch with. If None, uses the shared client.
+            catalog: Index of the tool catalog to count changes against.
+        """
+        super().__init__(source, http_client, catalog)
+        self.readme_resolver = get_readme_resolver()
+        # Line results of this crawl, saved by commit()
+        self.parse_state: Optional[ParseState] = None
+    
+    async def discover_tools(self) -> List[MCPTool]:
         """
         Discover MCP tools from a GitHub awesome list.
         
@@ -33,18 +55,71 @@ class GitHubAwesomeListCrawler(BaseCrawler):
         
         owner, repo = repo_info['owner'], repo_info['repo']
         
+        # Use README content from a batch query if we were given it
+        readme_content = await self._use_prefetched_readme(owner, repo)
+        
         # Fetch README content
-        readme_content = self._fetch_readme(owner, repo)
+        if readme_content is None:
+            readme_content = await self._fetch_readme(owner, repo)
+        
+        # Most READMEs are byte-identical between crawls
+        self.raise_if_unchanged(readme_content)
+        
+        # The rest usually differ by a few lines, so only those are parsed
+        signature = self.parse_signature()
+        diff = LineDiff(await ParseState.load(self.http, self.source.url, signature), signature)
         
         # Extract tools from README
-        tools = self._extract_tools_from_readme(readme_content)
+        tools = self._extract_tools_from_readme(readme_content, diff)
         
-        logger.info(f"Extracted {len(tools)} tools from {self.source.url}")
+        self.new_tools = diff.new_tools
+        self.updated_tools = diff.updated_tools
+        self.parse_state = diff.state
+        
+        logger.info(f"Extracted {len(tools)} tools from {self.source.url} "
+                    f"({diff.unchanged_tools} carried forward from unchanged lines)")
         return tools
     
-    def _fetch_readme(self, owner: str, repo: str) -> str:
+    async def commit(self) -> None:
+        """
+        Save the line results of this crawl for the next crawl to carry forward.
+        """
+        if self.parse_state is not None:
+            await self.parse_state.save(self.http, self.source.url)
+    
+    async def _use_prefetched_readme(self, owner: str, repo: str) -> Optional[str]:
+        """
+        Take the README from a batch-fetched repository snapshot, if available.
+        
+        The snapshot's branch and README path are also cached so that single
+        fetches of this repository go straight to the right location.
+        
+        Args:
+            owner: Repository owner.
+            repo: Repository name.
+            
+        Returns:
+            README content, or None if no usable snapshot was prefetched.
+        """
+        snapshot = self.prefetched
+        if not isinstance(snapshot, RepoSnapshot) or snapshot.readme_text is None:
+            return None
+        
+        if snapshot.default_branch and snapshot.readme_path:
+            await self.readme_resolver.remember(
+                self.http, ReadmeLocation(owner, repo, snapshot.default_branch, snapshot.readme_path)
+            )
+        
+        logger.info(f"Using batch-fetched README for {owner}/{repo}")
+        return snapshot.readme_text
+    
+    async def _fetch_readme(self, owner: str, repo: str) -> str:
         """
-        Fetch the README.md content from a GitHub repository.
+        Fetch the README content from a GitHub repository.
+        
+        Uses the cached default branch and README path when available, so a
+        repeat crawl costs a single request. Otherwise the location is resolved
+        through the GitHub README API, which also returns the content.
         
         Args:
             owner: Repository owner.
@@ -56,89 +131,169 @@ class GitHubAwesomeListCrawler(BaseCrawler):
         Raises:
             ValueError: If the README cannot be fetched.
         """
-        # Add GitHub token if available
-        headers = {
-            "User-Agent": self.user_agent,
-        }
-        
-        github_token = os.environ.get("GITHUB_TOKEN")
-        if github_token:
-            headers["Authorization"] = f"token {github_token}"
+        # GitHub tokens are added by the HTTP client from its token pool
+        resolver = self.readme_resolver
+        location = await resolver.get_cached(self.http, owner, repo)
         
-        # Try main branch first
-        main_url = f"https://raw.githubusercontent.com/{owner}/{repo}/main/README.md"
+        if location is not None:
+            try:
+                return await self.fetch_text(location.raw_url(resolver.raw_url), skip_if_unchanged=True)
+            except HttpError as e:
+                if e.status != 404:
+                    raise ValueError(f"Failed to fetch README from GitHub repo: {e}")
+                # The README moved or the default branch was renamed
+                logger.info(f"Cached README location for {owner}/{repo} is stale, re-resolving")
+                await resolver.invalidate(self.http, owner, repo)
         
         try:
-            response = requests.get(main_url, headers=headers, timeout=30)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException:
-            # Try master branch as fallback
-            master_url = f"https://raw.githubusercontent.com/{owner}/{repo}/master/README.md"
+            location = await resolver.resolve(self.http, owner, repo)
+            return location.content
+        except HttpError as e:
+            if e.status == 404:
+                raise ValueError(f"No README found in GitHub repo {owner}/{repo}")
+            logger.warning(f"README API unavailable for {owner}/{repo}, probing branches: {e}")
+        
+        return await self._probe_readme(owner, repo)
+    
+    async def _probe_readme(self, owner: str, repo: str) -> str:
+        """
+        Find the README by probing the common branch names on the raw host.
+        
+        Used only when the README API cannot be reached (e.g. its rate limit is
+        exhausted).
+        
+        Args:
+            owner: Repository owner.
+            repo: Repository name.
             
+        Returns:
+            README content as a string.
+            
+        Raises:
+            ValueError: If the README cannot be fetched.
+        """
+        resolver = self.readme_resolver
+        error = None
+        
+        for branch in ('main', 'master'):
+            location = ReadmeLocation(owner, repo, branch, 'README.md')
             try:
-                response = requests.get(master_url, headers=headers, timeout=30)
-                response.raise_for_status()
-                return response.text
-            except requests.RequestException as e:
-                raise ValueError(f"Failed to fetch README from GitHub repo: {e}")
+                content = await self.fetch_text(location.raw_url(resolver.raw_url))
+            except HttpError as e:
+                error = e
+                continue
+            
+            await resolver.remember(self.http, location)
+            return content
+        
+        raise ValueError(f"Failed to fetch README from GitHub repo: {error}")
     
-    def _extract_tools_from_readme(self, content: str) -> List[MCPTool]:
+    def _extract_tools_from_readme(self, content: str, diff: Optional[LineDiff] = None) -> List[MCPTool]:
         """
         Extract MCP tools from README markdown content.
         
         Args:
             content: README markdown content.
+            diff: Diff against the last crawl. If None, every line is parsed.
             
         Returns:
             A list of MCPTool objects.
         """
-        tools = []
-        
-        # Pattern 1: Markdown links in lists (most common format)
-        # Example: "- [Tool Name](https://tool-url.com) - Tool description"
-        list_pattern = r'^\s*[-*+]\s*\[([^\]]+)\]\(([^)]+)\)(.*?)$'
-        
-        for line in content.split('\n'):
-            match = re.match(list_pattern, line)
-            if match:
-                name = match.group(1).strip()
-                url = match.group(2).strip()
-                description = match.group(3).strip()
-                
-                # If description starts with a dash or other separators, remove it
-                description = re.sub(r'^[:-]\s*', '', description)
-                
-                if name and url and self.is_mcp_tool(name, description):
-                    tools.append(MCPTool(
-                        name=name,
-                        description=description or name,
-                        url=url,
-                        source_url=self.source.url,
-                        metadata={
-                            "tags": self.extract_tags(name, description)
-                        }
-                    ))
-        
-        # Pattern 2: Tables (used in some awesome lists)
-        table_pattern = r'^\s*\|\s*\[([^\]]+)\]\(([^)]+)\)\s*\|\s*([^|]+)'
-        
-        for line in content.split('\n'):
-            match = re.match(table_pattern, line)
-            if match:
-                name = match.group(1).strip()
-                url = match.group(2).strip()
-                description = match.group(3).strip()
-                
-                if name and url and self.is_mcp_tool(name, description):
-                    tools.append(MCPTool(
-                        name=name,
-                        description=description,
-                        url=url,
-                        source_url=self.source.url,
-                        metadata={
-                            "tags": self.extract_tags(name, description)
-                        }
-                    ))
-        
-        return tools
\ No newline at end of file
+        return list(self._iter_tools_from_readme(content, diff))
+    
+    def _iter_tools_from_readme(self, content: str, diff: Optional[LineDiff] = None) -> Iterator[MCPTool]:
+        """
+        Stream MCP tools out of README markdown content.
+        
+        Entries from nested lists, tables, HTML and reference-style links are
+        parsed line by line and classified in batches, so tools are produced
+        while the README is still being read. The headings and parent list
+        items an entry is listed under count towards its relevance and are
+        added to its tags.
+        
+        With a diff, lines that are unchanged since the last crawl are carried
+        forward from it and only added or changed lines are parsed and
+        classified.
+        
+        Args:
+            content: README markdown content.
+            diff: Diff against the last crawl, updated with this crawl's lines.
+            
+        Yields:
+            MCPTool objects in document order.
+        """
+        diff = diff or LineDiff(None, self.parse_signature())
+        known = diff.known
+        batch: List[MarkdownEntry] = []
+        for entry in iter_markdown_entries(io.StringIO(content), known):
+            if isinstance(entry, KnownEntry) or entry.key in known:
+                # Keep document order by flushing the changed lines before it
+                yield from self._tools_from_entries(batch, diff)
+                batch = []
+                result = diff.carry(entry.key)
+                if result is not None:
+                    yield self._tool_from_result(result, entry.sections)
+                continue
+            
+            batch.append(entry)
+            if len(batch) >= CLASSIFY_BATCH_SIZE:
+                yield from self._tools_from_entries(batch, diff)
+                batch = []
+        yield from self._tools_from_entries(batch, diff)
+    
+    def _tools_from_entries(self, entries: List[MarkdownEntry], diff: LineDiff) -> Iterator[MCPTool]:
+        """
+        Classify a batch of README entries and build tools for the relevant ones.
+        
+        Args:
+            entries: Parsed README entries.
+            diff: Diff the entries' results are recorded in.
+            
+        Yields:
+            MCPTool objects for the MCP-related entries.
+        """
+        if not entries:
+            return
+        
+        classifications = self.classify_batch(
+            [entry.name for entry in entries],
+            [' '.join((entry.description,) + entry.sections) for entry in entries],
+        )
+        
+        for entry, classification in zip(entries, classifications):
+            if not classification.relevant:
+                diff.record(entry.key, None)
+                continue
+            
+            section_tags = {slugify(section) for section in entry.sections} - {''}
+            result: LineResult = [
+                entry.name,
+                entry.url,
+                entry.description or entry.name,
+                sorted(set(classification.tags) | section_tags),
+            ]
+            diff.record(entry.key, result)
+            yield self._tool_from_result(result, entry.sections)
+    
+    def _tool_from_result(self, result: List, sections: Tuple[str, ...]) -> MCPTool:
+        """
+        Build a tool from a line result.
+        
+        Args:
+            result: The line's name, URL, description and tags.
+            sections: Sections the line is listed under.
+            
+        Returns:
+            An MCPTool object.
+        """
+        name, url, description, tags = result
+        return MCPTool(
+            name=name,
+            description=description,
+            url=url,
+            source_url=self.source.url,
+            metadata={
+                "tags": list(tags),
+                "sections": list(sections),
+            }
+        )
@@ -0,0 +1,246 @@
+"""
+Batched GitHub GraphQL fetching for repository sources.
+
+Groups many repositories into a single GraphQL query that returns each
+repository's default branch, last push time and README blob, so a crawl of
+hundreds of GitHub sources costs a handful of round trips instead of one
+request per source.
+"""
+
+import asyncio
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from ..utils.config import get_config
+from ..utils.http_client import HttpClient, HttpError
+from ..utils.logging import get_logger
+from ..utils.serialization import loads
+
+logger = get_logger(__name__)
+config = get_config()
+
+# README file names tried for each repository, in order of preference
+README_CANDIDATES = ['README.md', 'readme.md', 'Readme.md', 'README.markdown', 'README.rst', 'README']
+
+RepoKey = Tuple[str, str]
+
+
+class RepoSnapshot:
+    """
+    A repository's README and metadata as returned by a batch query.
+    """
+
+    __slots__ = ('owner', 'repo', 'default_branch', 'pushed_at', 'readme_path', 'readme_text')
+
+    def __init__(self, owner: str, repo: str, default_branch: Optional[str],
+                 pushed_at: Optional[str], readme_path: Optional[str],
+                 readme_text: Optional[str]):
+        """
+        Initialize the snapshot.
+
+        Args:
+            owner: Repository owner.
+            repo: Repository name.
+            default_branch: Name of the default branch, if the repository has one.
+            pushed_at: ISO timestamp of the last push.
+            readme_path: Path of the README that was found, if any.
+            readme_text: README content, if found and not truncated.
+        """
+        self.owner = owner
+        self.repo = repo
+        self.default_branch = default_branch
+        self.pushed_at = pushed_at
+        self.readme_path = readme_path
+        self.readme_text = readme_text
+
+
+def repo_key(owner: str, repo: str) -> RepoKey:
+    """
+    Build the lookup key for a repository.
+
+    Args:
+        owner: Repository owner.
+        repo: Repository name.
+
+    Returns:
+        Case-insensitive key for the repository.
+    """
+    return owner.lower(), repo.lower()
+
+
+class GitHubGraphQLBatcher:
+    """
+    Fetches README content for many repositories through the GraphQL API.
+    """
+
+    def __init__(self, graphql_url: Optional[str] = None, batch_size: Optional[int] = None,
+                 concurrency: Optional[int] = None):
+        """
+        Initialize the batcher.
+
+        Args:
+            graphql_url: GraphQL endpoint. If None, uses the value from config.
+            batch_size: Maximum repositories per query. If None, uses the value from config.
+            concurrency: Maximum batch queries in flight. If None, uses the
+                         crawler concurrency limit from config.
+        """
+        self.graphql_url = graphql_url or config['github']['graphql_url']
+        self.batch_size = batch_size if batch_size is not None else config['github']['graphql_batch_size']
+        self.concurrency = concurrency or config['crawler']['concurrency_limit']
+
+    def can_batch(self, http: HttpClient) -> bool:
+        """
+        Check whether batch fetching can be used with a client.
+
+        The GraphQL API rejects anonymous requests, so the client needs GitHub
+        tokens for the GraphQL host.
+
+        Args:
+            http: HTTP client to fetch with.
+
+        Returns:
+            True if batch fetching is enabled and possible.
+        """
+        host = urlparse(self.graphql_url).hostname or ''
+        return (self.batch_size > 0 and http.token_pool is not None
+                and http.token_pool.applies_to(host))
+
+    @staticmethod
+    def build_query(repos: List[RepoKey]) -> str:
+        """
+        Build a GraphQL query for a batch of repositories.
+
+        Args:
+            repos: (owner, repo) pairs.
+
+        Returns:
+            The query document.
+        """
+        parts = []
+        for i, (owner, repo) in enumerate(repos):
+            readmes = ''.join(
+                f' readme{j}: object(expression: {json.dumps("HEAD:" + name)})'
+                f' {{ ... on Blob {{ text isTruncated }} }}'
+                for j, name in enumerate(README_CANDIDATES)
+            )
+            parts.append(
+                f'r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)})'
+                f' {{ defaultBranchRef {{ name }} pushedAt{readmes} }}'
+            )
+        return 'query { ' + ' '.join(parts) + ' }'
+
+    @staticmethod
+    def parse_repository(owner: str, repo: str, data: Optional[Dict]) -> Optional[RepoSnapshot]:
+        """
+        Turn one aliased repository result into a snapshot.
+
+        Args:
+            owner: Repository owner.
+            repo: Repository name.
+            data: The repository object from the response, or None if not found.
+
+        Returns:
+            A snapshot, or None if the repository was not returned.
+        """
+        if not data:
+            return None
+
+        readme_path = None
+        readme_text = None
+        for j, name in enumerate(README_CANDIDATES):
+            blob = data.get(f'readme{j}')
+            if blob and blob.get('text') is not None and not blob.get('isTruncated'):
+                readme_path = name
+                readme_text = blob['text']
+                break
+
+        branch_ref = data.get('defaultBranchRef') or {}
+        return RepoSnapshot(
+            owner=owner,
+            repo=repo,
+            default_branch=branch_ref.get('name'),
+            pushed_at=data.get('pushedAt'),
+            readme_path=readme_path,
+            readme_text=readme_text,
+        )
+
+    async def fetch_batch(self, http: HttpClient, repos: List[RepoKey]) -> Dict[RepoKey, RepoSnapshot]:
+        """
+        Fetch one batch of repositories in a single query.
+
+        Args:
+            http: HTTP client to fetch with.
+            repos: (owner, repo) pairs, at most ``batch_size`` of them.
+
+        Returns:
+            Snapshots keyed by repo_key(). Repositories that were not found are omitted.
+
+        Raises:
+            HttpError: If the request fails.
+            ValueError: If the response is not a GraphQL result.
+        """
+        response = await http.request(
+            'POST',
+            self.graphql_url,
+            json={'query': self.build_query(repos)},
+        )
+
+        try:
+            payload = loads(response.body)
+        except ValueError as e:
+            raise ValueError(f"Invalid GraphQL response: {e}")
+
+        data = payload.get('data') or {}
+        if payload.get('errors'):
+            # Missing repositories come back as per-alias errors alongside partial data
+            logger.warning(f"GraphQL batch returned {len(payload['errors'])} errors")
+        if not data and payload.get('errors'):
+            raise ValueError(f"GraphQL query failed: {payload['errors'][0].get('message')}")
+
+        snapshots = {}
+        for i, (owner, repo) in enumerate(repos):
+            snapshot = self.parse_repository(owner, repo, data.get(f'r{i}'))
+            if snapshot is not None:
+                snapshots[repo_key(owner, repo)] = snapshot
+        return snapshots
+
+    async def fetch_all(self, http: HttpClient, repos: Iterable[RepoKey]) -> Dict[RepoKey, RepoSnapshot]:
+        """
+        Fetch any number of repositories, ``batch_size`` per query.
+
+        Batches that fail are logged and skipped; their sources fall back to
+        fetching individually.
+
+        Args:
+            http: HTTP client to fetch with.
+            repos: (owner, repo) pairs.
+
+        Returns:
+            Snapshots keyed by repo_key().
+        """
+        if not self.can_batch(http):
+            return {}
+
+        unique: Dict[RepoKey, RepoKey] = {}
+        for owner, repo in repos:
+            unique.setdefault(repo_key(owner, repo), (owner, repo))
+        pending = list(unique.values())
+
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(batch: List[RepoKey]) -> Dict[RepoKey, RepoSnapshot]:
+            async with semaphore:
+                try:
+                    return await self.fetch_batch(http, batch)
+                except (HttpError, ValueError) as e:
+                    logger.warning(f"GraphQL batch of {len(batch)} repositories failed: {str(e)}")
+                    return {}
+
+        snapshots: Dict[RepoKey, RepoSnapshot] = {}
+        for result in await asyncio.gather(*(run(batch) for batch in batches)):
+            snapshots.update(result)
+
+        logger.info(f"Fetched {len(snapshots)}/{len(pending)} repositories in {len(batches)} GraphQL batches")
+        return snapshots
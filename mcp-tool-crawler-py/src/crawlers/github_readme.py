@@ -0,0 +1,239 @@
+"""
+README location resolution for GitHub repositories.
+
+Resolves the default branch and README path of a repository once through the
+GitHub README API, and caches the answer per (owner, repo) so later crawls can
+fetch the raw README directly in a single request.
+"""
+
+import base64
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlparse
+
+from ..utils.config import get_config
+from ..utils.http_client import HttpClient
+from ..utils.logging import get_logger
+from ..utils.serialization import loads
+
+logger = get_logger(__name__)
+config = get_config()
+
+
+class ReadmeLocation:
+    """
+    Where a repository's README lives.
+    """
+
+    __slots__ = ('owner', 'repo', 'branch', 'path', 'resolved_at', 'content')
+
+    def __init__(self, owner: str, repo: str, branch: str, path: str,
+                 resolved_at: Optional[float] = None, content: Optional[str] = None):
+        """
+        Initialize the location.
+
+        Args:
+            owner: Repository owner.
+            repo: Repository name.
+            branch: Default branch the README was resolved on.
+            path: Path of the README within the repository.
+            resolved_at: Epoch seconds when the location was resolved.
+            content: README content, if it was returned alongside the location.
+        """
+        self.owner = owner
+        self.repo = repo
+        self.branch = branch
+        self.path = path
+        self.resolved_at = resolved_at if resolved_at is not None else time.time()
+        self.content = content
+
+    def raw_url(self, raw_base_url: str) -> str:
+        """
+        Build the raw content URL for the README.
+
+        Args:
+            raw_base_url: Base URL of the raw content host.
+
+        Returns:
+            The raw README URL.
+        """
+        return f"{raw_base_url}/{self.owner}/{self.repo}/{quote(self.branch)}/{quote(self.path)}"
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'owner': self.owner,
+            'repo': self.repo,
+            'branch': self.branch,
+            'path': self.path,
+            'resolved_at': self.resolved_at,
+        }
+
+
+class ReadmeResolver:
+    """
+    Resolves and caches README locations for GitHub repositories.
+
+    Locations are kept in memory for the life of the process and, if the HTTP
+    client has a cache backend, persisted there so they survive across runs.
+    """
+
+    def __init__(self, api_url: Optional[str] = None, raw_url: Optional[str] = None,
+                 ttl_seconds: Optional[int] = None):
+        """
+        Initialize the resolver.
+
+        Args:
+            api_url: Base URL of the GitHub REST API. If None, uses the value from config.
+            raw_url: Base URL of the raw content host. If None, uses the value from config.
+            ttl_seconds: How long a resolved location stays valid. If None, uses
+                         the value from config.
+        """
+        self.api_url = (api_url or config['github']['api_url']).rstrip('/')
+        self.raw_url = (raw_url or config['github']['raw_url']).rstrip('/')
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else config['github']['readme_cache_ttl']
+        self._locations: Dict[Tuple[str, str], ReadmeLocation] = {}
+
+    @staticmethod
+    def _cache_key(owner: str, repo: str) -> str:
+        return f"readme-location:{owner.lower()}/{repo.lower()}"
+
+    def _is_fresh(self, location: ReadmeLocation) -> bool:
+        return time.time() - location.resolved_at < self.ttl_seconds
+
+    async def get_cached(self, http: HttpClient, owner: str, repo: str) -> Optional[ReadmeLocation]:
+        """
+        Get a previously resolved location, if one is cached and still fresh.
+
+        Args:
+            http: HTTP client whose cache backend persists locations.
+            owner: Repository owner.
+            repo: Repository name.
+
+        Returns:
+            The cached location, or None.
+        """
+        key = (owner.lower(), repo.lower())
+        location = self._locations.get(key)
+
+        if location is None and http.cache is not None:
+            try:
+                record = await http.cache.get(self._cache_key(owner, repo))
+            except Exception as e:
+                logger.warning(f"Error reading README location cache: {str(e)}")
+                record = None
+            if record:
+                location = ReadmeLocation(**record)
+                self._locations[key] = location
+
+        if location is not None and self._is_fresh(location):
+            return location
+        return None
+
+    async def invalidate(self, http: HttpClient, owner: str, repo: str) -> None:
+        """
+        Forget the cached location for a repository.
+
+        Args:
+            http: HTTP client whose cache backend persists locations.
+            owner: Repository owner.
+            repo: Repository name.
+        """
+        self._locations.pop((owner.lower(), repo.lower()), None)
+        if http.cache is not None:
+            try:
+                await http.cache.delete(self._cache_key(owner, repo))
+            except Exception as e:
+                logger.warning(f"Error clearing README location cache: {str(e)}")
+
+    async def remember(self, http: HttpClient, location: ReadmeLocation) -> None:
+        """
+        Cache a resolved location.
+
+        Args:
+            http: HTTP client whose cache backend persists locations.
+            location: The location to cache.
+        """
+        self._locations[(location.owner.lower(), location.repo.lower())] = location
+        if http.cache is not None:
+            try:
+                await http.cache.set(self._cache_key(location.owner, location.repo),
+                                     location.to_dict())
+            except Exception as e:
+                logger.warning(f"Error writing README location cache: {str(e)}")
+
+    async def resolve(self, http: HttpClient, owner: str, repo: str,
+                      headers: Optional[Dict[str, str]] = None) -> ReadmeLocation:
+        """
+        Resolve the README location through the GitHub README API.
+
+        The API response also carries the README content, so the returned
+        location has ``content`` set and no second request is needed.
+
+        Args:
+            http: HTTP client to fetch with.
+            owner: Repository owner.
+            repo: Repository name.
+            headers: Optional extra request headers (e.g. authorization).
+
+        Returns:
+            The resolved location, with content.
+
+        Raises:
+            HttpError: If the API request fails.
+            ValueError: If the API response cannot be interpreted.
+        """
+        request_headers = dict(headers or {})
+        request_headers['Accept'] = 'application/vnd.github+json'
+
+        response = await http.get(f"{self.api_url}/repos/{owner}/{repo}/readme",
+                                  headers=request_headers)
+
+        try:
+            data = loads(response.body)
+            path = data['path']
+            branch = self._branch_from_response(data, owner, repo)
+            content = base64.b64decode(data['content']).decode('utf-8', errors='replace')
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Unexpected README API response for {owner}/{repo}: {e}")
+
+        location = ReadmeLocation(owner, repo, branch, path, content=content)
+        await self.remember(http, location)
+
+        logger.info(f"Resolved README for {owner}/{repo}: {branch}/{path}")
+        return location
+
+    @staticmethod
+    def _branch_from_response(data: Dict[str, object], owner: str, repo: str) -> str:
+        """
+        Work out the branch a README API response refers to.
+
+        The ``url`` field carries the branch as its ``ref`` query parameter; the
+        ``download_url`` is used as a fallback.
+        """
+        ref = parse_qs(urlparse(str(data.get('url') or '')).query).get('ref')
+        if ref:
+            return ref[0]
+
+        download_path = urlparse(str(data['download_url'])).path
+        prefix = f"/{owner}/{repo}/".lower()
+        suffix = f"/{data['path']}"
+        if download_path.lower().startswith(prefix) and download_path.endswith(suffix):
+            return download_path[len(prefix):-len(suffix)]
+
+        raise ValueError("no branch in README API response")
+
+
+_readme_resolver: Optional[ReadmeResolver] = None
+
+
+def get_readme_resolver() -> ReadmeResolver:
+    """
+    Get the shared README resolver.
+
+    Returns:
+        The process-wide ReadmeResolver instance.
+    """
+    global _readme_resolver
+    if _readme_resolver is None:
+        _readme_resolver = ReadmeResolver()
+    return _readme_resolver
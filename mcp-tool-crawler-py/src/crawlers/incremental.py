@@ -0,0 +1,156 @@
+"""
+Line-level incremental re-parsing of list sources.
+
+The result of every linked line of a source's last crawl is kept in the HTTP
+client's cache backend, keyed by a hash of the line and the sections it was
+listed under. On the next crawl, lines with a known key are carried forward
+without being parsed or classified again, so only added and changed lines go
+through the full pipeline. Comparing the two sets of keys is the line-level
+diff: it is linear in the size of the document and is not thrown off by lines
+that moved.
+"""
+
+from typing import Dict, List, Optional, Set
+
+from ..utils.http_client import HttpClient
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# What a line parsed to: [name, url, description, tags] for a tool, or None
+# for an entry that was not MCP-related
+LineResult = Optional[List]
+
+
+class ParseState:
+    """
+    Per-line parse results of one crawl of a source.
+    """
+
+    __slots__ = ('signature', 'lines')
+
+    def __init__(self, signature: str, lines: Optional[Dict[str, LineResult]] = None):
+        """
+        Initialize the state.
+
+        Args:
+            signature: Crawler, parser version and taxonomy the lines were
+                       parsed with. State with a different signature is stale.
+            lines: Line results keyed by line key.
+        """
+        self.signature = signature
+        self.lines: Dict[str, LineResult] = lines if lines is not None else {}
+
+    @staticmethod
+    def _cache_key(source_url: str) -> str:
+        return f"parse-state:{source_url}"
+
+    @classmethod
+    async def load(cls, http: HttpClient, source_url: str, signature: str) -> Optional['ParseState']:
+        """
+        Load the state saved by the last crawl of a source.
+
+        Args:
+            http: HTTP client whose cache backend persists the state.
+            source_url: URL of the source.
+            signature: Signature of the current crawler.
+
+        Returns:
+            The saved state, or None if there is none or it was parsed with a
+            different signature.
+        """
+        if http.cache is None:
+            return None
+
+        try:
+            record = await http.cache.get(cls._cache_key(source_url))
+        except Exception as e:
+            logger.warning(f"Error reading parse state: {str(e)}")
+            return None
+
+        if not record or record.get('signature') != signature:
+            return None
+        return cls(record['signature'], record.get('lines') or {})
+
+    async def save(self, http: HttpClient, source_url: str) -> None:
+        """
+        Save the state for the next crawl of a source.
+
+        Args:
+            http: HTTP client whose cache backend persists the state.
+            source_url: URL of the source.
+        """
+        if http.cache is None:
+            return
+
+        try:
+            await http.cache.set(self._cache_key(source_url),
+                                 {'signature': self.signature, 'lines': self.lines})
+        except Exception as e:
+            logger.warning(f"Error writing parse state: {str(e)}")
+
+
+class LineDiff:
+    """
+    Builds the new parse state of a source and counts how its tools changed.
+
+    A tool is new if its URL was not listed before, and updated if its URL was
+    listed before but on a line that changed.
+    """
+
+    def __init__(self, previous: Optional[ParseState], signature: str):
+        """
+        Initialize the diff.
+
+        Args:
+            previous: State of the last crawl, or None if there is none.
+            signature: Signature of the current crawler.
+        """
+        self.previous = previous
+        self.state = ParseState(signature)
+        self.new_tools = 0
+        self.updated_tools = 0
+        self.unchanged_tools = 0
+        self._previous_urls: Optional[Set[str]] = None
+
+    @property
+    def known(self) -> Dict[str, LineResult]:
+        """
+        Line results of the last crawl, keyed by line key.
+        """
+        return self.previous.lines if self.previous is not None else {}
+
+    def carry(self, key: str) -> LineResult:
+        """
+        Carry an unchanged line forward from the last crawl.
+
+        Args:
+            key: Key of a line known from the last crawl.
+
+        Returns:
+            The line's previous result.
+        """
+        result = self.known[key]
+        self.state.lines[key] = result
+        if result is not None:
+            self.unchanged_tools += 1
+        return result
+
+    def record(self, key: str, result: LineResult) -> None:
+        """
+        Record the result of a line that was parsed in this crawl.
+
+        Args:
+            key: The line's key.
+            result: What the line parsed to.
+        """
+        self.state.lines[key] = result
+        if result is None:
+            return
+
+        if self._previous_urls is None:
+            self._previous_urls = {line[1] for line in self.known.values() if line is not None}
+        if result[1] in self._previous_urls:
+            self.updated_tools += 1
+        else:
+            self.new_tools += 1
@@ -0,0 +1,346 @@
+"""
+Streaming, structure-aware Markdown parsing for awesome lists.
+
+Visits each line of a README once and yields candidate tool entries as they
+are found, without building a document tree. Section headings and link-less
+parent list items are tracked on a stack so every entry knows the categories
+it was listed under.
+
+Every linked line also gets a key that hashes the line together with the
+sections it sits in. A caller holding the keys of a previous parse can pass
+them in, and lines with a known key are reported as KnownEntry without being
+parsed again.
+"""
+
+import re
+from hashlib import blake2b
+from typing import Container, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+ATX_HEADING_PATTERN = re.compile(r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+SETEXT_UNDERLINE_PATTERN = re.compile(r'^ {0,3}(=+|-+)[ \t]*$')
+FENCE_PATTERN = re.compile(r'^[ \t]*(`{3,}|~{3,})')
+LIST_ITEM_PATTERN = re.compile(r'^([ \t]*)(?:[-*+]|\d{1,9}[.)])(?:[ \t]+(.*))?$')
+REFERENCE_DEFINITION_PATTERN = re.compile(
+    r'^ {0,3}\[(?P<label>[^\]]+)\]:[ \t]*<?(?P<url>[^\s>]+)>?(?:[ \t]+.*)?$'
+)
+
+# A link at the start of an item or cell, optionally wrapped in emphasis:
+# inline "[name](url)", HTML "<a href="url">name</a>" or reference "[name][ref]"
+LEADING_LINK_PATTERN = re.compile(
+    r'^(?:\*\*|__|\*|_)?(?:'
+    r'\[(?P<inline_name>[^\]]+)\]\((?P<inline_url>[^)\s]+)(?:[ \t]+"[^"]*")?\)'
+    r'|<a\s[^>]*?href=["\'](?P<html_url>[^"\']+)["\'][^>]*>(?P<html_name>.*?)</a>'
+    r'|\[(?P<ref_name>[^\]]+)\](?:\[(?P<ref_label>[^\]]*)\])?'
+    r')(?:\*\*|__|\*|_)?',
+    re.IGNORECASE,
+)
+TABLE_CELL_SEPARATOR_PATTERN = re.compile(r'(?<!\\)\|')
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+# Characters stripped from the start of a description
+LEADING_SEPARATORS = ' \t:-\u2013\u2014'
+
+# Inline markup removed from heading and category text
+HEADING_MARKUP_PATTERN = re.compile(r'!?\[([^\]]*)\]\([^)]*\)|[*_`]')
+
+
+class MarkdownEntry:
+    """
+    A linked entry found in a list item or table row.
+    """
+
+    __slots__ = ('name', 'url', 'description', 'sections', 'key')
+
+    def __init__(self, name: str, url: str, description: str, sections: Tuple[str, ...],
+                 key: Optional[str] = None):
+        """
+        Initialize the entry.
+
+        Args:
+            name: Link text.
+            url: Link target.
+            description: Text following the link, with leading separators removed.
+            sections: Headings and parent list items the entry is nested under,
+                      outermost first. Level-1 headings are left out, as they
+                      are normally the document title.
+            key: Hash of the line and its sections. For a reference-style
+                 link, which the line alone does not determine, a hash of the
+                 resolved entry instead. If None, it is computed from the entry.
+        """
+        self.name = name
+        self.url = url
+        self.description = description
+        self.sections = sections
+        if key is None:
+            key = line_key('\x1f'.join(sections) + '\x1e', f"{name}\x00{url}\x00{description}")
+        self.key = key
+
+
+class KnownEntry:
+    """
+    A linked line whose key was passed to the parser as already known.
+
+    The line is identical to one from a previous parse, under the same
+    sections, so it parses to the same entry and was not parsed again.
+    """
+
+    __slots__ = ('key', 'sections')
+
+    def __init__(self, key: str, sections: Tuple[str, ...]):
+        """
+        Initialize the known entry.
+
+        Args:
+            key: Hash of the line and its sections.
+            sections: Headings and parent list items the line is nested under.
+        """
+        self.key = key
+        self.sections = sections
+
+
+ParsedLine = Union[MarkdownEntry, KnownEntry]
+
+
+class MarkdownListParser:
+    """
+    Event-driven parser that turns Markdown lines into entries.
+
+    Feed lines with ``feed()``, which returns an entry as soon as a line
+    completes one, then call ``close()`` to get the entries whose
+    reference-style links could only be resolved once the whole document was
+    seen.
+    """
+
+    def __init__(self, known: Optional[Container[str]] = None):
+        """
+        Initialize the parser.
+
+        Args:
+            known: Keys of lines parsed before. Such lines are returned as
+                   KnownEntry instead of being parsed.
+        """
+        self._known = known
+        self._headings: List[Tuple[int, str]] = []
+        self._categories: List[Tuple[int, str]] = []
+        self._definitions: Dict[str, str] = {}
+        self._deferred: List[Tuple[str, str, str, Tuple[str, ...]]] = []
+        self._fence: Optional[str] = None
+        self._paragraph: Optional[str] = None
+        self._section_cache: Optional[Tuple[str, ...]] = None
+        self._section_prefix = ''
+
+    def feed(self, line: str) -> Optional[ParsedLine]:
+        """
+        Parse one line.
+
+        Args:
+            line: A line of Markdown, with or without its line ending.
+
+        Returns:
+            The entry on this line, or a KnownEntry if the line's key is
+            known, or None.
+        """
+        line = line.rstrip('\r\n')
+        stripped = line.lstrip()
+        first = stripped[:1]
+        paragraph, self._paragraph = self._paragraph, None
+
+        if self._fence is not None:
+            if stripped.startswith(self._fence):
+                self._fence = None
+            return None
+        if first in ('`', '~'):
+            fence = FENCE_PATTERN.match(line)
+            if fence:
+                self._fence = fence.group(1)[0] * 3
+                return None
+
+        if not stripped:
+            return None
+
+        if first == '#':
+            heading = ATX_HEADING_PATTERN.match(line)
+            if heading:
+                self._push_heading(len(heading.group(1)), heading.group(2) or '')
+                return None
+
+        if first in ('=', '-') and paragraph is not None:
+            underline = SETEXT_UNDERLINE_PATTERN.match(line)
+            if underline:
+                self._push_heading(1 if underline.group(1)[0] == '=' else 2, paragraph)
+                return None
+
+        if first in ('-', '*', '+') or first.isdigit():
+            item = LIST_ITEM_PATTERN.match(line)
+            if item:
+                return self._list_item(len(item.group(1).expandtabs(4)), item.group(2) or '')
+
+        if first == '|':
+            return self._table_row(stripped)
+
+        if first == '[':
+            definition = REFERENCE_DEFINITION_PATTERN.match(line)
+            if definition:
+                self._definitions[_normalize_label(definition.group('label'))] = definition.group('url')
+                return None
+
+        # Plain paragraph text: a possible setext heading, and the end of any
+        # list whose parent items were being used as categories
+        if len(line) == len(stripped) and self._categories:
+            self._categories.clear()
+            self._section_cache = None
+        self._paragraph = stripped
+        return None
+
+    def close(self) -> List[MarkdownEntry]:
+        """
+        Finish parsing.
+
+        Returns:
+            Entries with reference-style links that are defined in the document.
+        """
+        entries = []
+        for name, label, description, sections in self._deferred:
+            url = self._definitions.get(label)
+            if url is not None:
+                entry = _make_entry(name, url, description, sections)
+                if entry is not None:
+                    entries.append(entry)
+        self._deferred.clear()
+        return entries
+
+    def _push_heading(self, level: int, text: str) -> None:
+        while self._headings and self._headings[-1][0] >= level:
+            self._headings.pop()
+        text = _clean_text(text)
+        if text:
+            self._headings.append((level, text))
+        self._categories.clear()
+        self._section_cache = None
+
+    def _sections(self) -> Tuple[str, ...]:
+        if self._section_cache is None:
+            self._section_cache = (tuple(text for level, text in self._headings if level > 1)
+                                   + tuple(text for _, text in self._categories))
+            self._section_prefix = '\x1f'.join(self._section_cache) + '\x1e'
+        return self._section_cache
+
+    def _list_item(self, indent: int, content: str) -> Optional[ParsedLine]:
+        while self._categories and self._categories[-1][0] >= indent:
+            self._categories.pop()
+            self._section_cache = None
+
+        sections = self._sections()
+        key = line_key(self._section_prefix, content)
+        if self._known is not None and key in self._known:
+            return KnownEntry(key, sections)
+
+        link = LEADING_LINK_PATTERN.match(content)
+        if link is not None:
+            return self._entry(link, content[link.end():], key)
+
+        # A link-less item may be the parent of a nested list
+        text = _clean_text(content)
+        if text:
+            self._categories.append((indent, text))
+            self._section_cache = None
+        return None
+
+    def _table_row(self, row: str) -> Optional[ParsedLine]:
+        sections = self._sections()
+        key: Optional[str] = line_key(self._section_prefix, row)
+        if self._known is not None and key in self._known:
+            return KnownEntry(key, sections)
+
+        cells = [cell.strip() for cell in TABLE_CELL_SEPARATOR_PATTERN.split(row.strip().strip('|'))]
+        for i, cell in enumerate(cells):
+            link = LEADING_LINK_PATTERN.match(cell)
+            if link is None:
+                continue
+            # A bare "[text]" in a cell is only a link if it is already defined
+            if (link.group('ref_name') is not None and link.group('ref_label') is None
+                    and _normalize_label(link.group('ref_name')) not in self._definitions):
+                # Which cell wins now depends on the definitions seen so far
+                key = None
+                continue
+            description = next((other for other in cells[i + 1:] if other), '')
+            return self._entry(link, description, key)
+        return None
+
+    def _entry(self, link: re.Match, description: str, key: Optional[str]) -> Optional[MarkdownEntry]:
+        sections = self._sections()
+
+        if link.group('inline_url') is not None:
+            return _make_entry(link.group('inline_name'), link.group('inline_url'), description, sections, key)
+        if link.group('html_url') is not None:
+            return _make_entry(link.group('html_name'), link.group('html_url'), description, sections, key)
+
+        name = link.group('ref_name')
+        label = _normalize_label(link.group('ref_label') or name)
+        url = self._definitions.get(label)
+        if url is None:
+            # Usually defined at the end of the document
+            self._deferred.append((name, label, description, sections))
+            return None
+        return _make_entry(name, url, description, sections)
+
+
+def line_key(section_prefix: str, text: str) -> str:
+    """
+    Hash a line together with the sections it is listed under.
+
+    Args:
+        section_prefix: The sections, joined into a prefix.
+        text: The line's content.
+
+    Returns:
+        Hex digest identifying the line in its context.
+    """
+    return blake2b((section_prefix + text).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _normalize_label(label: str) -> str:
+    return ' '.join(label.lower().split())
+
+
+def _clean_text(text: str) -> str:
+    text = HEADING_MARKUP_PATTERN.sub(lambda m: m.group(1) or '', text)
+    return HTML_TAG_PATTERN.sub('', text).strip()
+
+
+def _make_entry(name: str, url: str, description: str, sections: Tuple[str, ...],
+                key: Optional[str] = None) -> Optional[MarkdownEntry]:
+    url = url.strip()
+    # In-page anchors and relative links point back into the list itself
+    if not url.startswith(('http://', 'https://')):
+        return None
+
+    if '<' in name:
+        name = HTML_TAG_PATTERN.sub('', name)
+    name = name.strip().strip('*_`').strip()
+    if not name:
+        return None
+
+    return MarkdownEntry(name, url, description.strip().lstrip(LEADING_SEPARATORS), sections, key)
+
+
+def iter_markdown_entries(lines: Iterable[str],
+                          known: Optional[Container[str]] = None) -> Iterator[ParsedLine]:
+    """
+    Parse Markdown lines into entries, one line at a time.
+
+    Args:
+        lines: Lines of a Markdown document, e.g. an open file or
+               ``io.StringIO(text)``.
+        known: Keys of lines parsed before, which are yielded as KnownEntry.
+               If None, every line is parsed.
+
+    Yields:
+        Linked list items and table rows in document order, followed by
+        entries whose reference-style links were defined after them.
+    """
+    parser = MarkdownListParser(known)
+    for line in lines:
+        entry = parser.feed(line)
+        if entry is not None:
+            yield entry
+    yield from parser.close()
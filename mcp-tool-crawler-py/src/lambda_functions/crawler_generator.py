@@ -2,7 +2,6 @@ import json
 import os
 import time
 import uuid
-import requests
 from datetime import datetime
 import logging
 from typing import Dict, Any
@@ -11,6 +10,7 @@ import boto3
 from openai import OpenAI
 
 from ..models import Source, CrawlerStrategy, SourceType
+from ..utils.http_client import fetch_text_sync
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -22,6 +22,9 @@ openai_client = OpenAI(api_key=os.environ.get('OPENAI_API_KEY'))
 dynamodb = boto3.resource('dynamodb')
 crawler_table = dynamodb.Table(os.environ.get('DYNAMODB_CRAWLERS_TABLE', 'mcp-crawlers'))
 
+# Bytes of a page sent to the model when generating its crawler
+SAMPLE_BYTES = int(os.environ.get('CRAWLER_GENERATOR_SAMPLE_BYTES', '20000'))
+
 
 def generate_crawler_for_website(source: Source) -> CrawlerStrategy:
     """
@@ -36,11 +39,8 @@ def generate_crawler_for_website(source: Source) -> CrawlerStrategy:
     start_time = time.time()
     
     try:
-        # Fetch the website content
-        headers = {"User-Agent": "MCP-Tool-Crawler/1.0"}
-        response = requests.get(source.url, headers=headers, timeout=30)
-        response.raise_for_status()
-        html = response.text[:20000]  # Limit to first 20k chars
+        # Fetch only the start of the page; the rest is never downloaded
+        html = fetch_text_sync(source.url, max_bytes=SAMPLE_BYTES)
         
         # Use OpenAI to generate a crawler function
         logger.info(f"Calling OpenAI to generate crawler for {source.url}")
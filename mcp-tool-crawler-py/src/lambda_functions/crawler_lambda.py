@@ -10,6 +10,7 @@ from ..models import Source, SourceType
 from ..services.crawler_service import CrawlerService
 from ..services.source_manager import SourceManager
 from ..utils.logging import get_logger
+from ..utils.serialization import model_to_dict
 
 logger = get_logger(__name__)
 
@@ -35,7 +36,7 @@ def initialize_sources_handler(event, context):
         sources = asyncio.run(source_manager.initialize_sources())
         
         # Convert to JSON-serializable format
-        sources_json = [source.dict() for source in sources]
+        sources_json = [model_to_dict(source) for source in sources]
         
         logger.info(f"Initialized {len(sources)} sources")
         
@@ -77,7 +78,7 @@ def get_sources_to_crawl_handler(event, context):
         sources = asyncio.run(source_manager.get_sources_to_crawl(time_threshold_hours))
         
         # Convert to JSON-serializable format
-        sources_json = [source.dict() for source in sources]
+        sources_json = [model_to_dict(source) for source in sources]
         
         logger.info(f"Found {len(sources)} sources to crawl")
         
@@ -120,7 +121,7 @@ def crawl_source_handler(event, context):
         result = asyncio.run(crawler_service.crawl_source(source))
         
         # Convert to JSON-serializable format
-        result_json = result.dict()
+        result_json = model_to_dict(result)
         
         logger.info(f"Crawl completed for source {source.name}: {result.tools_discovered} tools discovered")
         
@@ -167,13 +168,14 @@ def crawl_all_sources_handler(event, context):
         results = asyncio.run(crawler_service.crawl_all_sources(force, concurrency))
         
         # Convert to JSON-serializable format
-        results_json = [result.dict() for result in results]
+        results_json = [model_to_dict(result) for result in results]
         
         # Calculate summary
         success_count = sum(1 for result in results if result.success)
         total_tools = sum(result.tools_discovered for result in results if result.success)
         new_tools = sum(result.new_tools for result in results if result.success)
         updated_tools = sum(result.updated_tools for result in results if result.success)
+        removed_tools = sum(result.removed_tools for result in results if result.success)
         
         logger.info(f"Crawl all sources completed: {success_count}/{len(results)} successful")
         
@@ -188,6 +190,7 @@ def crawl_all_sources_handler(event, context):
                     'total_tools': total_tools,
                     'new_tools': new_tools,
                     'updated_tools': updated_tools,
+                    'removed_tools': removed_tools,
                 },
             },
         }
@@ -0,0 +1,48 @@
+"""
+Lambda function that post-processes the tool catalog after a crawl.
+
+Runs as the ProcessCatalog step of the crawler state machine and merges
+near-duplicate tools found across sources.
+"""
+
+import asyncio
+
+from ..services.dedup import deduplicate_catalog
+from ..storage import get_storage
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def handler(event, context):
+    """
+    Lambda function handler for processing the catalog.
+    
+    Args:
+        event: The event payload, with the state machine's ``crawlResults``.
+        context: The Lambda context.
+        
+    Returns:
+        Dictionary with status code and deduplication summary.
+    """
+    logger.info(f"Process catalog handler called for {len(event.get('crawlResults') or [])} crawl results")
+    
+    try:
+        result = asyncio.run(deduplicate_catalog(get_storage()))
+        
+        return {
+            'statusCode': 200,
+            'body': {
+                'total_tools': len(result.tools),
+                'merged_tools': len(result.merged),
+                'removed_duplicates': len(result.removed_ids),
+            },
+        }
+    except Exception as e:
+        logger.error(f"Error processing catalog: {str(e)}")
+        return {
+            'statusCode': 500,
+            'body': {
+                'error': str(e),
+            },
+        }
@@ -1,8 +1,6 @@
 import json
 import os
 import time
-import uuid
-import requests
 from datetime import datetime
 import logging
 from typing import Dict, Any, List
@@ -12,7 +10,9 @@ from bs4 import BeautifulSoup
 
 import boto3
 
+from ..crawlers.classifier import get_keyword_classifier
 from ..models import Source, CrawlerStrategy, MCPTool, SourceType
+from ..utils.http_client import fetch_text_sync
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -86,30 +86,31 @@ def run_generated_crawler(source: Source, strategy: CrawlerStrategy) -> List[MCP
     This function:
     1. Fetches the website content
     2. Executes the crawler strategy
-    3. Processes and returns the discovered tools
+    3. Tags the extracted items in one classification batch
+    4. Processes and returns the discovered tools
     """
     logger.info(f"Running generated crawler for {source.url}")
     start_time = time.time()
     
     try:
-        # Fetch the website content
-        headers = {"User-Agent": "MCP-Tool-Crawler/1.0"}
-        response = requests.get(source.url, headers=headers, timeout=30)
-        response.raise_for_status()
-        html = response.text
+        # Fetch the website content, stopping at CRAWLER_MAX_BODY_BYTES
+        html = fetch_text_sync(source.url)
         
         # Execute the crawler strategy
         extracted_items = execute_crawler_safely(strategy.implementation, html)
         
+        # Tag every extracted item in one batch
+        classifications = get_keyword_classifier().classify_batch(
+            [f"{item['name']} {item['description'] or ''}" for item in extracted_items]
+        )
+        
         # Convert to MCPTool objects
         timestamp = datetime.utcnow().isoformat()
         tools = []
         
-        for item in extracted_items:
-            tool_id = f"tool-{uuid.uuid4()}"
-            
+        for item, classification in zip(extracted_items, classifications):
+            # The ID is derived from the URL, so a re-crawl upserts the same item
             tool = MCPTool(
-                id=tool_id,
                 name=item['name'],
                 description=item['description'] or item['name'],
                 url=item['url'],
@@ -117,13 +118,10 @@ def run_generated_crawler(source: Source, strategy: CrawlerStrategy) -> List[MCP
                 first_discovered=timestamp,
                 last_updated=timestamp,
                 metadata={
-                    "tags": item.get('tags', [])
+                    "tags": sorted(set(item.get('tags', [])) | set(classification.tags))
                 }
             )
             
-            # Save to DynamoDB
-            # TODO: In a real implementation, we would handle deduplication here
-            
             tools.append(tool)
         
         logger.info(f"Discovered {len(tools)} tools from {source.url} in {time.time() - start_time:.2f}s")
@@ -8,8 +8,11 @@ import sys
 from typing import List, Dict, Any
 
 from .models import Source, SourceType
+from .services.catalog_query import CatalogQuery
 from .services.crawler_service import CrawlerService
+from .services.dedup import deduplicate_catalog
 from .services.source_manager import SourceManager
+from .storage import get_changelog, get_storage
 from .utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -84,7 +87,9 @@ async def crawl_source(source_id):
     # Crawl the source
     result = await crawler_service.crawl_source(source)
     
-    if result.success:
+    if result.success and result.unchanged:
+        print("Source unchanged since last crawl")
+    elif result.success:
         print(f"Crawl completed successfully:")
         print(f"- Tools discovered: {result.tools_discovered}")
         print(f"- New tools: {result.new_tools}")
@@ -113,6 +118,7 @@ async def crawl_all(force=False, concurrency=None):
     # Calculate summary
     success_count = sum(1 for result in results if result.success)
     failure_count = len(results) - success_count
+    unchanged_count = sum(1 for result in results if result.unchanged)
     total_tools = sum(result.tools_discovered for result in results if result.success)
     new_tools = sum(result.new_tools for result in results if result.success)
     updated_tools = sum(result.updated_tools for result in results if result.success)
@@ -122,6 +128,7 @@ async def crawl_all(force=False, concurrency=None):
     print(f"Total sources: {len(results)}")
     print(f"Successful: {success_count}")
     print(f"Failed: {failure_count}")
+    print(f"Unchanged: {unchanged_count}")
     print(f"Total tools discovered: {total_tools}")
     print(f"New tools: {new_tools}")
     print(f"Updated tools: {updated_tools}")
@@ -137,6 +144,62 @@ async def crawl_all(force=False, concurrency=None):
                     print(f"- {source.name} ({source.url}): {result.error}")
 
 
+async def dedup():
+    """Merge near-duplicate tools in the catalog."""
+    result = await deduplicate_catalog(get_storage())
+    
+    print("\nDeduplication Summary:")
+    print("-" * 80)
+    print(f"Tools remaining: {len(result.tools)}")
+    print(f"Records merged: {len(result.merged)}")
+    print(f"Duplicates removed: {len(result.removed_ids)}")
+    print("-" * 80)
+
+
+async def search(tags=None, source=None, name=None, limit=20):
+    """Search the catalog by tags, source and name."""
+    query = await CatalogQuery.from_storage(get_storage())
+    tools = query.search(tags or [], source, name, limit)
+    
+    if not tools:
+        print("No matching tools found")
+        return
+    
+    print("\nMatching Tools:")
+    print("-" * 80)
+    print(f"{'Name':<30} {'Tags':<30} {'URL'}")
+    print("-" * 80)
+    
+    for tool in tools:
+        tags_text = ", ".join(tool.metadata.get('tags') or [])
+        print(f"{tool.name[:30]:<30} {tags_text[:30]:<30} {tool.url}")
+    
+    print("-" * 80)
+    print(f"Showing: {len(tools)} of {len(query)} tools")
+
+
+async def show_changes(since=0, limit=None):
+    """Show the catalog changes after a cursor."""
+    changelog = get_changelog(get_storage())
+    entries = await changelog.since(since, limit) if changelog else []
+    
+    if not entries:
+        print(f"No catalog changes after {since}")
+        return
+    
+    print("\nCatalog Changes:")
+    print("-" * 80)
+    print(f"{'Cursor':<10} {'Time':<28} {'Added':>8} {'Updated':>8} {'Removed':>8}")
+    print("-" * 80)
+    
+    for entry in entries:
+        print(f"{entry['sequence']:<10} {entry['created_at']:<28} {len(entry['added']):>8} "
+              f"{len(entry['updated']):>8} {len(entry['removed']):>8}")
+    
+    print("-" * 80)
+    print(f"Next cursor: {entries[-1]['sequence']}")
+
+
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="MCP Tool Crawler")
@@ -163,6 +226,21 @@ def parse_args():
     crawl_parser.add_argument("--force", action="store_true", help="Force crawl all sources")
     crawl_parser.add_argument("--concurrency", type=int, help="Maximum number of sources to crawl concurrently")
     
+    # Dedup command
+    dedup_parser = subparsers.add_parser("dedup", help="Merge near-duplicate tools in the catalog")
+    
+    # Search command
+    search_parser = subparsers.add_parser("search", help="Search the tool catalog")
+    search_parser.add_argument("--tag", action="append", dest="tags", help="Tag the tools must have (repeat to require several)")
+    search_parser.add_argument("--source", help="URL of a source the tools must be listed in")
+    search_parser.add_argument("--name", help="Text the tool names must contain")
+    search_parser.add_argument("--limit", type=int, default=20, help="Maximum number of tools to show")
+    
+    # Changes command
+    changes_parser = subparsers.add_parser("changes", help="Show the catalog change feed")
+    changes_parser.add_argument("--since", type=int, default=0, help="Cursor of the last change already seen")
+    changes_parser.add_argument("--limit", type=int, help="Maximum number of changes to show")
+    
     return parser.parse_args()
 
 
@@ -183,6 +261,12 @@ async def main_async():
             await crawl_all(args.force, args.concurrency)
         else:
             print("Please specify either --id or --all")
+    elif args.command == "dedup":
+        await dedup()
+    elif args.command == "search":
+        await search(args.tags, args.source, args.name, args.limit)
+    elif args.command == "changes":
+        await show_changes(args.since, args.limit)
     else:
         print("Please specify a command")
 
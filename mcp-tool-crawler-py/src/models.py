@@ -1,8 +1,10 @@
 from enum import Enum
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 from datetime import datetime
 from uuid import uuid4, UUID
-from pydantic import BaseModel, Field, HttpUrl, field_validator, ConfigDict
+from pydantic import BaseModel, Field, HttpUrl, field_validator, model_validator, ConfigDict
+
+from .utils.helpers import generate_tool_id, get_timestamp
 
 
 class SourceType(str, Enum):
@@ -42,7 +44,8 @@ class MCPTool(BaseModel):
     """Model representing an MCP tool"""
     model_config = ConfigDict(validate_assignment=True)
     
-    id: str = Field(default_factory=lambda: f"tool-{uuid4()}")
+    # Derived from the canonical URL unless given
+    id: str
     name: str
     description: str
     url: str
@@ -54,6 +57,65 @@ class MCPTool(BaseModel):
     last_updated: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
     # Optional metadata
     metadata: Dict[str, Any] = Field(default_factory=dict)
+    
+    @model_validator(mode='before')
+    @classmethod
+    def derive_id(cls, data):
+        if isinstance(data, dict) and not data.get('id') and isinstance(data.get('url'), str):
+            data = {**data, 'id': generate_tool_id(data['url'])}
+        return data
+    
+    @classmethod
+    def from_stored(cls, data: Dict[str, Any], timestamp: Optional[str] = None) -> 'MCPTool':
+        """
+        Build a tool from a record this package stored, without validation.
+        
+        Catalogs we wrote ourselves hold tools that were validated when they
+        were created, so their records are taken as they are. Records missing
+        a required field or with an unknown field are validated as usual so
+        the problem is reported.
+        
+        Args:
+            data: A tool record read from a stored catalog.
+            timestamp: Time to fill in for missing timestamps. If None, uses
+                       the current time.
+            
+        Returns:
+            The tool.
+        """
+        if not _TOOL_REQUIRED_FIELDS <= data.keys() <= _TOOL_FIELDS:
+            return cls(**data)
+        
+        values = dict(data)
+        # Validation counts a derived ID as given, and defaults as not
+        fields_set = set(data)
+        fields_set.add('id')
+        if not values.get('id'):
+            values['id'] = generate_tool_id(values['url'])
+        if 'first_discovered' not in values or 'last_updated' not in values:
+            timestamp = timestamp or get_timestamp()
+            values.setdefault('first_discovered', timestamp)
+            values.setdefault('last_updated', timestamp)
+        return cls.model_construct(fields_set, **values)
+    
+    @classmethod
+    def bulk_from_stored(cls, records: Iterable[Dict[str, Any]]) -> List['MCPTool']:
+        """
+        Build tools from records this package stored, without validation.
+        
+        Args:
+            records: Tool records read from a stored catalog.
+            
+        Returns:
+            The tools, sharing one timestamp for any missing timestamps.
+        """
+        timestamp = get_timestamp()
+        return [cls.from_stored(record, timestamp) for record in records]
+
+
+# Fields a stored tool record must have, and may have, to skip validation
+_TOOL_REQUIRED_FIELDS = frozenset({'name', 'description', 'url', 'source_url'})
+_TOOL_FIELDS = frozenset(MCPTool.model_fields)
 
 
 class CrawlerStrategy(BaseModel):
@@ -83,5 +145,13 @@ class CrawlResult(BaseModel):
     tools_discovered: int
     new_tools: int
     updated_tools: int
+    # Tools the source no longer lists and no other source lists either
+    removed_tools: int = 0
     duration: int  # milliseconds
-    error: Optional[str] = None
\ No newline at end of file
+    error: Optional[str] = None
+    # True if the source content had not changed since the last crawl and
+    # parsing was skipped
+    unchanged: bool = False
+    # Digest of the content that was crawled, stored on the source so the
+    # next crawl can tell whether anything changed
+    content_digest: Optional[str] = None
\ No newline at end of file
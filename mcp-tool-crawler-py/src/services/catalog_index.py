@@ -0,0 +1,305 @@
+"""
+In-memory index of the tool catalog for change accounting.
+
+Loaded once per run and shared by every crawler, the index maps each tool's
+canonical URL to a compact record holding its ID and a hash of its content.
+Each discovered tool is then new, updated or unchanged after a single lookup,
+tools a source no longer lists are removed, and only those changes need to be
+written back to storage.
+
+The sources that list a tool are stored in its ``sources`` metadata, so a tool
+whose sources change is written back even when its content did not. Records
+listed by several sources or merged by deduplication also keep the stored
+tool, so that its sources, merged URLs and tags can be carried into what is
+written back.
+"""
+
+import hashlib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..models import MCPTool
+from ..utils.helpers import canonicalize_url
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def content_hash(tool: MCPTool) -> str:
+    """
+    Hash the crawled content of a tool.
+
+    Written tools carry this hash in their ``content_hash`` metadata, so a
+    stored tool whose tags deduplication extended still compares equal to
+    the tool its source lists.
+
+    Args:
+        tool: The tool.
+
+    Returns:
+        Hex digest of the tool's name, description and tags.
+    """
+    tags = '\x1f'.join(sorted(tool.metadata.get('tags') or []))
+    return hashlib.blake2b(f"{tool.name}\x00{tool.description}\x00{tags}".encode('utf-8'),
+                           digest_size=8).hexdigest()
+
+
+class CatalogRecord:
+    """
+    What the index keeps about one tool.
+    """
+
+    __slots__ = ('tool_id', 'content_hash', 'first_discovered', 'sources', 'stored')
+
+    def __init__(self, tool_id: str, content_hash: str, first_discovered: str, sources: Set[str]):
+        """
+        Initialize the record.
+
+        Args:
+            tool_id: ID of the stored tool.
+            content_hash: Hash of the tool's content, see content_hash().
+            first_discovered: When the tool was first discovered.
+            sources: URLs of the sources that list the tool.
+        """
+        self.tool_id = tool_id
+        self.content_hash = content_hash
+        self.first_discovered = first_discovered
+        self.sources = sources
+        # The stored tool, kept only while it has more than its crawled content
+        self.stored: Optional[MCPTool] = None
+
+
+class CatalogChanges:
+    """
+    How a crawl of one source changed the catalog.
+    """
+
+    __slots__ = ('new', 'updated', 'unchanged', 'removed')
+
+    def __init__(self):
+        self.new: List[MCPTool] = []
+        self.updated: List[MCPTool] = []
+        self.unchanged = 0
+        # IDs of tools no source lists any more
+        self.removed: List[str] = []
+
+
+class CatalogIndex:
+    """
+    Hash map from canonical tool URL to catalog record.
+    """
+
+    def __init__(self, tools: Iterable[MCPTool] = ()):
+        """
+        Build the index.
+
+        Args:
+            tools: Tools currently in the catalog.
+        """
+        self._records: Dict[str, CatalogRecord] = {}
+        self._by_source: Dict[str, Set[str]] = {}
+        # Changes not yet written to storage
+        self._upserted: Dict[str, MCPTool] = {}
+        self._removed: Dict[str, CatalogRecord] = {}
+        # Keys of upserted tools that were not in the catalog before
+        self._added: Set[str] = set()
+
+        # URLs of duplicates merged into a record, mapped to the record's URL
+        self._aliases: Dict[str, str] = {}
+
+        for tool in tools:
+            self.add(tool)
+
+    @classmethod
+    async def from_storage(cls, storage) -> 'CatalogIndex':
+        """
+        Build the index from a stored catalog, one tool at a time.
+
+        Only the compact records are kept, so the full catalog is never held
+        in memory.
+
+        Args:
+            storage: Tool storage service with an ``iter_tools()`` method.
+
+        Returns:
+            The index.
+        """
+        index = cls()
+        async for tool in storage.iter_tools():
+            index.add(tool)
+        return index
+
+    def add(self, tool: MCPTool) -> None:
+        """
+        Add a stored tool to the index.
+
+        Args:
+            tool: A tool in the catalog.
+        """
+        key = canonicalize_url(tool.url)
+        record = self._records.get(key)
+        if record is None:
+            digest = tool.metadata.get('content_hash') or content_hash(tool)
+            record = CatalogRecord(tool.id, digest, tool.first_discovered, set())
+            self._records[key] = record
+        for source_url in [tool.source_url] + list(tool.metadata.get('sources') or []):
+            record.sources.add(source_url)
+            self._by_source.setdefault(source_url, set()).add(key)
+        for url in tool.metadata.get('duplicate_urls') or []:
+            self._aliases.setdefault(canonicalize_url(url), key)
+        if len(record.sources) > 1 or tool.metadata.get('duplicate_urls'):
+            record.stored = tool
+
+    def _write(self, key: str, record: CatalogRecord, tool: MCPTool) -> None:
+        """
+        Queue a tool to be written with the record's sources and content hash.
+
+        Args:
+            key: Canonical URL of the tool.
+            record: The tool's record.
+            tool: The tool to write.
+        """
+        source_url = tool.source_url if tool.source_url in record.sources else min(record.sources)
+        tool = tool.model_copy(update={
+            'id': record.tool_id,
+            'first_discovered': record.first_discovered,
+            'source_url': source_url,
+            'metadata': {
+                **tool.metadata,
+                'sources': sorted(record.sources),
+                'content_hash': record.content_hash,
+            },
+        })
+        self._upserted[key] = tool
+        if len(record.sources) > 1 or tool.metadata.get('duplicate_urls'):
+            record.stored = tool
+
+    def _latest(self, key: str, record: CatalogRecord) -> Optional[MCPTool]:
+        # The tool as it will be stored after this run, if the index has it
+        return self._upserted.get(key) or record.stored
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, url: str) -> bool:
+        return canonicalize_url(url) in self._records
+
+    def apply(self, source_url: str, tools: List[MCPTool]) -> CatalogChanges:
+        """
+        Record the tools a crawl of a source discovered.
+
+        New tools are added to the index. Tools already in it keep their ID
+        and first-discovered time, which are copied onto the discovered tool.
+        Duplicates that deduplication merged into another record count as
+        that record, unchanged. Tools the source listed before but not now
+        lose the source, and are removed once no source lists them.
+
+        Args:
+            source_url: URL of the crawled source.
+            tools: Every tool the crawl discovered.
+
+        Returns:
+            The changes, with tools in discovery order.
+        """
+        changes = CatalogChanges()
+        seen: Set[str] = set()
+
+        for tool in tools:
+            key = canonicalize_url(tool.url)
+            if key not in self._records and key in self._aliases:
+                # A known duplicate of a merged record, which stands in for it
+                key = self._aliases[key]
+                if key in self._records and key not in seen:
+                    seen.add(key)
+                    record = self._records[key]
+                    if source_url not in record.sources:
+                        record.sources.add(source_url)
+                        stored = self._latest(key, record)
+                        if stored is not None:
+                            self._write(key, record, stored)
+                    changes.unchanged += 1
+                continue
+            if key in seen:
+                # Listed twice in the same source
+                continue
+            seen.add(key)
+
+            digest = content_hash(tool)
+            record = self._records.get(key)
+            if record is None and key in self._removed:
+                # Dropped by another source earlier in this run; write it again
+                # so the pending removal cannot win
+                record = self._records[key] = self._removed.pop(key)
+                record.content_hash = ''
+            if record is None:
+                record = self._records[key] = CatalogRecord(tool.id, digest, tool.first_discovered, {source_url})
+                self._write(key, record, tool)
+                self._added.add(key)
+                changes.new.append(self._upserted[key])
+                continue
+
+            joined = source_url not in record.sources
+            record.sources.add(source_url)
+            stored = self._latest(key, record)
+            if record.content_hash == digest:
+                if joined:
+                    # Same content, but the stored sources must list this one
+                    self._write(key, record, stored if stored is not None else tool)
+                changes.unchanged += 1
+                continue
+
+            record.content_hash = digest
+            tool.id = record.tool_id
+            tool.first_discovered = record.first_discovered
+            if stored is not None and stored.metadata.get('duplicate_urls'):
+                # Keep what deduplication merged into the record
+                tool = tool.model_copy(update={'metadata': {
+                    **tool.metadata,
+                    'tags': sorted(set(tool.metadata.get('tags') or []) | set(stored.metadata.get('tags') or [])),
+                    'duplicate_urls': stored.metadata['duplicate_urls'],
+                }})
+            self._write(key, record, tool)
+            changes.updated.append(self._upserted[key])
+
+        for key in self._by_source.get(source_url, set()) - seen:
+            record = self._records.get(key)
+            if record is None:
+                continue
+            record.sources.discard(source_url)
+            if not record.sources:
+                del self._records[key]
+                self._upserted.pop(key, None)
+                self._added.discard(key)
+                self._removed[key] = record
+                changes.removed.append(record.tool_id)
+                continue
+
+            # Still listed elsewhere; the stored sources must drop this one
+            stored = self._latest(key, record)
+            if stored is not None:
+                self._write(key, record, stored)
+        self._by_source[source_url] = seen
+
+        return changes
+
+    def added_ids(self) -> Set[str]:
+        """
+        Get the IDs of the tools among the changes that are new to the catalog.
+
+        Returns:
+            IDs of the tools to upsert that were not stored before.
+        """
+        return {self._upserted[key].id for key in self._added}
+
+    def take_changes(self) -> Tuple[List[MCPTool], List[str]]:
+        """
+        Get the changes recorded since the last call, and forget them.
+
+        Returns:
+            Tools to upsert, and IDs of tools to remove.
+        """
+        upserted = list(self._upserted.values())
+        removed = [record.tool_id for record in self._removed.values()]
+        self._upserted.clear()
+        self._removed.clear()
+        self._added.clear()
+        return upserted, removed
@@ -0,0 +1,195 @@
+"""
+In-process query engine over the tool catalog.
+
+Each tool is numbered by its position in the catalog, and inverted indexes
+map every tag, every source and every trigram of a lowercased name to the
+sorted array of numbers of the tools that have it. A query intersects the
+arrays of its terms, smallest first, so its cost follows the rarest term
+rather than the size of the catalog. Name substrings of three or more
+characters are narrowed down by their trigrams before the names themselves
+are checked.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from ..models import MCPTool
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Array type code of tool numbers
+POSTING_TYPE = 'I'
+# Arrays up to this many times longer than the running result are
+# intersected through a set; longer ones by binary search
+SET_INTERSECT_RATIO = 8
+
+
+def trigrams(text: str) -> List[str]:
+    """
+    Split text into its distinct overlapping three-character substrings.
+
+    Args:
+        text: Lowercased text.
+
+    Returns:
+        The trigrams, in order of first appearance.
+    """
+    return list(dict.fromkeys(text[i:i + 3] for i in range(len(text) - 2)))
+
+
+def intersect(postings: Sequence[Sequence[int]]) -> List[int]:
+    """
+    Intersect sorted arrays of tool numbers.
+
+    Starts from the shortest array and keeps the numbers found in each of the
+    others, by a set lookup when the other array is of similar size and by
+    binary search when it is much longer, so the cost is bounded by the
+    shortest array rather than the longest.
+
+    Args:
+        postings: Sorted arrays of tool numbers.
+
+    Returns:
+        The numbers in every array, sorted.
+    """
+    if not postings:
+        return []
+
+    postings = sorted(postings, key=len)
+    result = list(postings[0])
+    for posting in postings[1:]:
+        if not result:
+            break
+        size = len(posting)
+        if size <= len(result) * SET_INTERSECT_RATIO:
+            members = set(posting)
+            result = [number for number in result if number in members]
+            continue
+        matched = []
+        low = 0
+        for number in result:
+            # Numbers only grow, so each search starts where the last one ended
+            low = bisect_left(posting, number, low)
+            if low == size:
+                break
+            if posting[low] == number:
+                matched.append(number)
+        result = matched
+    return result
+
+
+class CatalogQuery:
+    """
+    Inverted tag, source and name trigram indexes over a catalog.
+    """
+
+    def __init__(self, tools: Iterable[MCPTool] = ()):
+        """
+        Build the indexes.
+
+        Args:
+            tools: Tools in the catalog.
+        """
+        self._tools: List[MCPTool] = []
+        self._names: List[str] = []
+        self._by_tag: Dict[str, array] = {}
+        self._by_source: Dict[str, array] = {}
+        self._by_trigram: Dict[str, array] = {}
+
+        for tool in tools:
+            self.add(tool)
+
+    @classmethod
+    async def from_storage(cls, storage) -> 'CatalogQuery':
+        """
+        Build the indexes from a stored catalog, one tool at a time.
+
+        Args:
+            storage: Tool storage service with an ``iter_tools()`` method.
+
+        Returns:
+            The query engine.
+        """
+        query = cls()
+        async for tool in storage.iter_tools():
+            query.add(tool)
+        logger.info(f"Indexed {len(query)} tools, {len(query._by_tag)} tags and "
+                    f"{len(query._by_source)} sources")
+        return query
+
+    @staticmethod
+    def _post(index: Dict[str, array], keys: Iterable[str], number: int) -> None:
+        for key in keys:
+            posting = index.get(key)
+            if posting is None:
+                posting = index[key] = array(POSTING_TYPE)
+            # Tools are numbered in the order they are added, so arrays stay sorted
+            posting.append(number)
+
+    def add(self, tool: MCPTool) -> None:
+        """
+        Add a tool to the indexes.
+
+        Args:
+            tool: A tool in the catalog.
+        """
+        number = len(self._tools)
+        name = tool.name.lower()
+        self._tools.append(tool)
+        self._names.append(name)
+
+        self._post(self._by_tag, {tag.lower() for tag in tool.metadata.get('tags') or []}, number)
+        self._post(self._by_source, {tool.source_url, *(tool.metadata.get('sources') or [])}, number)
+        self._post(self._by_trigram, trigrams(name), number)
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    def tag_counts(self) -> Dict[str, int]:
+        """
+        Count the tools with each tag.
+
+        Returns:
+            Number of tools per tag, most common first.
+        """
+        counts = {tag: len(posting) for tag, posting in self._by_tag.items()}
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+    def search(self, tags: Iterable[str] = (), source: Optional[str] = None, name: Optional[str] = None,
+               limit: Optional[int] = None) -> List[MCPTool]:
+        """
+        Find the tools that match every given condition.
+
+        Args:
+            tags: Tags the tools must all have, in any case.
+            source: URL of a source the tools must be listed in.
+            name: Substring the tool names must contain, in any case.
+            limit: Most tools to return. If None, returns every match.
+
+        Returns:
+            Matching tools, in catalog order. With no conditions, the whole
+            catalog.
+        """
+        postings: List[Sequence[int]] = []
+        for tag in {tag.lower() for tag in tags}:
+            postings.append(self._by_tag.get(tag, ()))
+        if source is not None:
+            postings.append(self._by_source.get(source, ()))
+
+        needle = name.lower() if name else ''
+        if len(needle) >= 3:
+            postings.extend(self._by_trigram.get(trigram, ()) for trigram in trigrams(needle))
+
+        numbers: Iterable[int] = intersect(postings) if postings else range(len(self._tools))
+        if needle:
+            # Trigrams only narrow the candidates; the substring decides
+            numbers = (number for number in numbers if needle in self._names[number])
+
+        results = []
+        for number in numbers:
+            if limit is not None and len(results) >= limit:
+                break
+            results.append(self._tools[number])
+        return results
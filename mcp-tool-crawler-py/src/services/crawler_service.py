@@ -5,12 +5,17 @@ Crawler orchestration service for MCP tool crawler.
 import asyncio
 from typing import List, Dict, Any, Optional
 
-from ..models import Source, MCPTool, CrawlResult
+from ..models import Source, MCPTool, CrawlResult, SourceType
 from ..crawlers import get_crawler_for_source
+from ..crawlers.base import BaseCrawler
+from ..crawlers.github_graphql import GitHubGraphQLBatcher, RepoSnapshot, repo_key
 from ..utils.logging import get_logger
 from ..utils.config import get_config
+from ..utils.helpers import extract_github_repo_info
+from ..utils.http_client import get_http_client
+from .catalog_index import CatalogIndex
 from .source_manager import SourceManager
-from ..storage import get_storage
+from ..storage import get_storage, save_and_record_changes
 
 logger = get_logger(__name__)
 config = get_config()
@@ -27,13 +32,22 @@ class CrawlerService:
         """
         self.source_manager = SourceManager()
         self.storage = get_storage()
+        self.http_client = get_http_client()
+        self.github_batcher = GitHubGraphQLBatcher()
     
-    async def crawl_source(self, source: Source) -> CrawlResult:
+    async def crawl_source(self, source: Source,
+                           prefetched: Optional[RepoSnapshot] = None,
+                           catalog: Optional[CatalogIndex] = None,
+                           crawlers: Optional[Dict[str, BaseCrawler]] = None) -> CrawlResult:
         """
         Crawl a specific source.
         
         Args:
             source: Source to crawl.
+            prefetched: Content for the source fetched ahead of time in a batch.
+            catalog: Catalog index to record the discovered tools in.
+            crawlers: If given, the crawler is kept here by source ID, so that
+                      its state can be committed once the catalog is written.
             
         Returns:
             A CrawlResult object.
@@ -42,12 +56,18 @@ class CrawlerService:
         
         try:
             # Get the appropriate crawler for this source
-            crawler = get_crawler_for_source(source)
+            crawler = get_crawler_for_source(source, self.http_client, catalog)
+            if crawlers is not None:
+                crawlers[source.id] = crawler
+            if prefetched is not None:
+                crawler.apply_prefetched(prefetched)
             
             # Execute the crawler
-            result = crawler.execute()
+            result = await crawler.execute_async()
             
-            # Update the source's last crawl time
+            # Update the source's last crawl time. The content digest and
+            # crawler state wait until the discovered tools are in the catalog,
+            # see commit_sources()
             await self.source_manager.update_source_last_crawl(source.id, result.success)
             
             return result
@@ -98,27 +118,111 @@ class CrawlerService:
         tasks = []
         semaphore = asyncio.Semaphore(concurrency)
         
-        async def crawl_with_semaphore(source):
+        # Every crawler counts its changes against the same catalog index
+        try:
+            catalog = await CatalogIndex.from_storage(self.storage)
+        except Exception as e:
+            logger.error(f"Error loading tool catalog: {str(e)}")
+            catalog = CatalogIndex()
+        
+        crawlers: Dict[str, BaseCrawler] = {}
+        
+        async def crawl_with_semaphore(source, prefetched):
             async with semaphore:
-                return await self.crawl_source(source)
+                return await self.crawl_source(source, prefetched, catalog, crawlers)
         
-        for source in sources:
-            tasks.append(crawl_with_semaphore(source))
+        # Run all tasks concurrently with limited concurrency, sharing one
+        # connection pool across every crawler
+        async with self.http_client:
+            # Fetch GitHub sources a whole batch per round trip up front
+            prefetched = await self.prefetch_github_sources(sources)
+            
+            for source in sources:
+                tasks.append(crawl_with_semaphore(source, prefetched.get(source.id)))
+            
+            results = await asyncio.gather(*tasks)
         
-        # Run all tasks concurrently with limited concurrency
-        results = await asyncio.gather(*tasks)
+        # Write only what changed, and publish it to the change feed
+        added_ids = catalog.added_ids()
+        upserted, removed_ids = catalog.take_changes()
+        if await save_and_record_changes(self.storage, upserted, removed_ids, added_ids):
+            await self.commit_sources(sources, results, crawlers)
         
         # Calculate totals
         total_tools = sum(result.tools_discovered for result in results if result.success)
         total_new_tools = sum(result.new_tools for result in results if result.success)
         total_updated_tools = sum(result.updated_tools for result in results if result.success)
+        total_removed_tools = sum(result.removed_tools for result in results if result.success)
         success_count = sum(1 for result in results if result.success)
+        unchanged_count = sum(1 for result in results if result.unchanged)
         
         logger.info(f"Completed crawling {len(sources)} sources:")
         logger.info(f"- Success: {success_count}")
         logger.info(f"- Failed: {len(sources) - success_count}")
+        logger.info(f"- Unchanged: {unchanged_count}")
         logger.info(f"- Total tools discovered: {total_tools}")
         logger.info(f"- New tools: {total_new_tools}")
         logger.info(f"- Updated tools: {total_updated_tools}")
+        logger.info(f"- Removed tools: {total_removed_tools}")
+        
+        return results
+    
+    async def commit_sources(self, sources: List[Source], results: List[CrawlResult],
+                             crawlers: Dict[str, BaseCrawler]) -> None:
+        """
+        Store the digest of each source's crawled content on the source, and
+        let each crawler save its state for the next crawl.
+        
+        Call this only once the tools the crawls discovered are in the catalog.
+        The next crawl of a source whose content matches its digest skips
+        parsing it, so a digest saved before a failed catalog write would leave
+        the source's tools out of the catalog until it changes again; crawler
+        state saved then would count those tools as already known.
+        
+        Args:
+            sources: Crawled sources.
+            results: Crawl results, in the same order as the sources.
+            crawlers: The crawler of each source, by source ID.
+        """
+        for source, result in zip(sources, results):
+            if not result.success or result.unchanged:
+                continue
+            crawler = crawlers.get(source.id)
+            if crawler is not None:
+                await crawler.commit()
+            if not result.content_digest:
+                continue
+            if await self.source_manager.update_source_digest(source.id, result.content_digest):
+                source.metadata['content_digest'] = result.content_digest
+    
+    async def prefetch_github_sources(self, sources: List[Source]) -> Dict[str, RepoSnapshot]:
+        """
+        Fetch README content for all GitHub sources in batched GraphQL queries.
+        
+        Args:
+            sources: Sources about to be crawled.
+            
+        Returns:
+            Repository snapshots keyed by source ID. Sources that could not be
+            batch-fetched are omitted and fetch individually when crawled.
+        """
+        github_types = (SourceType.GITHUB_AWESOME_LIST, SourceType.GITHUB_REPOSITORY)
+        repos_by_source = {}
+        
+        for source in sources:
+            if source.type not in github_types:
+                continue
+            repo_info = extract_github_repo_info(source.url)
+            if repo_info:
+                repos_by_source[source.id] = (repo_info['owner'], repo_info['repo'])
+        
+        if not repos_by_source or not self.github_batcher.can_batch(self.http_client):
+            return {}
+        
+        snapshots = await self.github_batcher.fetch_all(self.http_client, repos_by_source.values())
         
-        return results
\ No newline at end of file
+        return {
+            source_id: snapshots[repo_key(owner, repo)]
+            for source_id, (owner, repo) in repos_by_source.items()
+            if repo_key(owner, repo) in snapshots
+        }
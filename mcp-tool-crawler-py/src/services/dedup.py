@@ -0,0 +1,320 @@
+"""
+Cross-source near-duplicate detection for the tool catalog.
+
+The same tool often appears in several sources under different URLs (an npm
+package and its GitHub repository) with reworded descriptions. Tools whose
+URLs canonicalize to the same form are merged outright. The rest are compared
+by MinHash signatures of their name and description, and LSH banding puts
+likely duplicates in the same bucket, so candidates are found in roughly
+linear time instead of comparing every pair. Each cluster is merged into one
+canonical record that lists all of its sources.
+"""
+
+import bisect
+import re
+from hashlib import blake2b
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from ..models import MCPTool
+from ..storage import save_and_record_changes
+from ..utils.config import get_config
+from ..utils.helpers import canonicalize_url, get_timestamp
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+config = get_config()
+
+# Characters per shingle
+SHINGLE_SIZE = 4
+# Added to a value borrowed from another position, per position of distance,
+# to keep it apart from any 64-bit hash
+BORROW_OFFSET = 1 << 64
+# Comparisons made for each tool added to an LSH bucket
+MAX_BUCKET_COMPARISONS = 50
+
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+# Name words too common to show two tools are the same
+GENERIC_NAME_WORDS = {
+    'mcp', 'server', 'servers', 'client', 'tool', 'tools', 'model', 'context',
+    'protocol', 'ai', 'the', 'for', 'and', 'a', 'an', 'of',
+}
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures of character shingles.
+
+    Uses one-permutation hashing: each shingle is hashed once and the hash
+    picks both a signature position and the value competing for its minimum,
+    so a signature costs one pass over the shingles instead of one per
+    position, and is the smallest hash landing in each position. Positions
+    no shingle landed in borrow the value of the next filled position
+    (densification), which keeps the signatures of similar texts agreeing
+    with the right probability.
+    """
+
+    def __init__(self, num_hashes: int):
+        """
+        Initialize the hasher.
+
+        Args:
+            num_hashes: Signature length.
+        """
+        self.num_hashes = num_hashes
+        # Shingles repeat across tools, so their hashes are kept for the
+        # life of the hasher; Deduplicator uses one per clustering run
+        self._hashes: Dict[str, int] = {}
+
+    def _hash(self, shingle: str) -> int:
+        h = int.from_bytes(blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+        self._hashes[shingle] = h
+        return h
+
+    @staticmethod
+    def shingles(text: str) -> Set[str]:
+        """
+        Split text into overlapping character shingles.
+
+        Args:
+            text: Text to split.
+
+        Returns:
+            Shingles of the lowercased words of the text.
+        """
+        normalized = ' '.join(WORD_PATTERN.findall(text.lower()))
+        if len(normalized) <= SHINGLE_SIZE:
+            return {normalized} if normalized else set()
+        return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+    def signature(self, shingles: Iterable[str]) -> Optional[Tuple[int, ...]]:
+        """
+        Compute the MinHash signature of a set of shingles.
+
+        Args:
+            shingles: The shingles.
+
+        Returns:
+            The signature, or None if there are no shingles.
+        """
+        k = self.num_hashes
+        hashes = self._hashes
+        values = sorted((hashes[shingle] if shingle in hashes else self._hash(shingle)
+                         for shingle in shingles), reverse=True)
+        if not values:
+            return None
+
+        # Within a position, a smaller hash is a smaller value; writing them
+        # largest first leaves each position's minimum
+        table = dict(zip(map(k.__rmod__, values), values))
+        if len(table) == k:
+            return tuple(table[i] for i in range(k))
+
+        filled = sorted(table)
+        bins = []
+        for i in range(k):
+            value = table.get(i)
+            if value is None:
+                source = filled[bisect.bisect(filled, i) % len(filled)]
+                value = table[source] + ((source - i) % k) * BORROW_OFFSET
+            bins.append(value)
+        return tuple(bins)
+
+
+class DedupResult:
+    """
+    Outcome of deduplicating a catalog.
+    """
+
+    __slots__ = ('tools', 'merged', 'removed_ids')
+
+    def __init__(self, tools: List[MCPTool], merged: List[MCPTool], removed_ids: List[str]):
+        """
+        Initialize the result.
+
+        Args:
+            tools: The deduplicated catalog.
+            merged: Canonical records that absorbed duplicates.
+            removed_ids: IDs of the duplicates that were merged away.
+        """
+        self.tools = tools
+        self.merged = merged
+        self.removed_ids = removed_ids
+
+
+class Deduplicator:
+    """
+    Clusters near-duplicate tools with MinHash and LSH.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, bands: Optional[int] = None,
+                 rows: Optional[int] = None):
+        """
+        Initialize the deduplicator.
+
+        Args:
+            threshold: Minimum Jaccard similarity of two tools' shingles to
+                       merge them. If None, uses the value from config.
+            bands: LSH bands. If None, uses the value from config.
+            rows: Signature rows per band. If None, uses the value from config.
+                  Pairs with similarity around (1/bands)^(1/rows) or more are
+                  likely to share a bucket.
+        """
+        self.threshold = threshold if threshold is not None else config['dedup']['similarity_threshold']
+        self.bands = bands or config['dedup']['lsh_bands']
+        self.rows = rows or config['dedup']['lsh_rows']
+
+    def cluster(self, tools: Sequence[MCPTool]) -> List[List[int]]:
+        """
+        Group tools that are the same tool.
+
+        Args:
+            tools: Tools to group.
+
+        Returns:
+            Clusters of two or more tool indexes, each in index order.
+        """
+        parent = list(range(len(tools)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        urls = [canonicalize_url(tool.url) for tool in tools]
+        # The GitHub repository each cluster is hosted at, if any
+        github: Dict[int, str] = {i: url for i, url in enumerate(urls) if url.startswith('https://github.com/')}
+
+        def union(i: int, j: int) -> None:
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                root, child = min(root_i, root_j), max(root_i, root_j)
+                parent[child] = root
+                if child in github:
+                    github.setdefault(root, github.pop(child))
+
+        def conflicting(i: int, j: int) -> bool:
+            # Distinct GitHub URLs are distinct repositories
+            url_i, url_j = github.get(find(i)), github.get(find(j))
+            return url_i is not None and url_j is not None and url_i != url_j
+
+        # Same canonical URL, including URLs already merged into a record
+        by_url: Dict[str, int] = {}
+        for i, tool in enumerate(tools):
+            aliases = [canonicalize_url(url) for url in tool.metadata.get('duplicate_urls') or []]
+            for key in [urls[i]] + aliases:
+                if key in by_url:
+                    union(by_url[key], i)
+                else:
+                    by_url[key] = i
+
+        # Similar name and description. A hasher per run bounds its cache of
+        # shingle hashes by the catalog being clustered
+        hasher = MinHasher(self.bands * self.rows)
+        shingles = [hasher.shingles(f"{tool.name} {tool.description}") for tool in tools]
+        name_words = [set(WORD_PATTERN.findall(tool.name.lower())) - GENERIC_NAME_WORDS for tool in tools]
+
+        rows = self.rows
+        bands: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(self.bands)]
+        for i in range(len(tools)):
+            signature = hasher.signature(shingles[i])
+            if signature is None:
+                continue
+            for band, buckets in enumerate(bands):
+                bucket = buckets.setdefault(signature[band * rows:(band + 1) * rows], [])
+                for j in bucket[:MAX_BUCKET_COMPARISONS]:
+                    if not name_words[i] & name_words[j] or find(i) == find(j) or conflicting(i, j):
+                        continue
+                    if _jaccard(shingles[i], shingles[j]) >= self.threshold:
+                        union(i, j)
+                bucket.append(i)
+
+        clusters: Dict[int, List[int]] = {}
+        for i in range(len(tools)):
+            clusters.setdefault(find(i), []).append(i)
+        return [members for members in clusters.values() if len(members) > 1]
+
+    def deduplicate(self, tools: List[MCPTool]) -> DedupResult:
+        """
+        Merge each cluster of duplicates into one canonical record.
+
+        The canonical record is the GitHub-hosted one if there is one, then
+        the one listed by the most sources, then the earliest discovered. It
+        keeps its ID and description, and gains the sources, URLs and tags of
+        the rest in its metadata.
+
+        Args:
+            tools: The catalog.
+
+        Returns:
+            The deduplicated catalog and what changed.
+        """
+        clusters = self.cluster(tools)
+        merged: List[MCPTool] = []
+        removed: Set[int] = set()
+
+        for members in clusters:
+            ranked = sorted(members, key=lambda i: _canonical_rank(tools[i]))
+            canonical = tools[ranked[0]]
+
+            sources: Set[str] = set()
+            urls: Set[str] = set()
+            tags: Set[str] = set()
+            for i in ranked:
+                tool = tools[i]
+                sources.add(tool.source_url)
+                sources.update(tool.metadata.get('sources') or [])
+                urls.add(tool.url)
+                urls.update(tool.metadata.get('duplicate_urls') or [])
+                tags.update(tool.metadata.get('tags') or [])
+            urls.discard(canonical.url)
+
+            merged.append(canonical.model_copy(update={
+                'first_discovered': min(tools[i].first_discovered for i in members),
+                'last_updated': get_timestamp(),
+                'metadata': {
+                    **canonical.metadata,
+                    'tags': sorted(tags),
+                    'sources': sorted(sources),
+                    'duplicate_urls': sorted(urls),
+                },
+            }))
+            removed.update(ranked[1:])
+
+        replacements = {tool.id: tool for tool in merged}
+        deduplicated = [replacements.get(tool.id, tool) for i, tool in enumerate(tools) if i not in removed]
+        removed_ids = [tools[i].id for i in sorted(removed)]
+
+        logger.info(f"Merged {len(removed_ids)} duplicates into {len(merged)} tools "
+                    f"({len(deduplicated)} tools remain)")
+        return DedupResult(deduplicated, merged, removed_ids)
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _canonical_rank(tool: MCPTool) -> Tuple[bool, int, str]:
+    sources = set(tool.metadata.get('sources') or []) | {tool.source_url}
+    return (not canonicalize_url(tool.url).startswith('https://github.com/'),
+            -len(sources), tool.first_discovered)
+
+
+async def deduplicate_catalog(storage, deduplicator: Optional[Deduplicator] = None) -> DedupResult:
+    """
+    Deduplicate the stored catalog and write back only what changed.
+
+    Args:
+        storage: Tool storage service.
+        deduplicator: Deduplicator to use. If None, uses one configured from config.
+
+    Returns:
+        The deduplication result.
+    """
+    tools = await storage.load_tools()
+    result = (deduplicator or Deduplicator()).deduplicate(tools)
+    if result.removed_ids:
+        await save_and_record_changes(storage, result.merged, result.removed_ids)
+    return result
@@ -2,6 +2,7 @@
 Source management service for MCP tool crawler.
 """
 
+import asyncio
 import time
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Optional
@@ -13,6 +14,7 @@ from ..models import Source, SourceType
 from ..utils.logging import get_logger
 from ..utils.config import get_config
 from ..utils.helpers import is_github_repo, extract_domain
+from ..utils.serialization import model_to_dict
 
 logger = get_logger(__name__)
 config = get_config()
@@ -125,7 +127,7 @@ class SourceManager:
         """
         try:
             # Save to DynamoDB
-            self.table.put_item(Item=source.dict())
+            self.table.put_item(Item=model_to_dict(source))
             logger.info(f"Added source: {source.name} ({source.url})")
             return source
         except Exception as e:
@@ -235,8 +237,9 @@ class SourceManager:
             True if successful, False otherwise.
         """
         try:
-            # Update source
-            self.table.update_item(
+            # Update source off the event loop so concurrent crawls keep running
+            await asyncio.to_thread(
+                self.table.update_item,
                 Key={'id': source_id},
                 UpdateExpression='SET last_crawled = :timestamp, last_crawl_status = :status',
                 ExpressionAttributeValues={
@@ -249,4 +252,29 @@ class SourceManager:
             return True
         except Exception as e:
             logger.error(f"Error updating source last crawl: {str(e)}")
+            return False
+    
+    async def update_source_digest(self, source_id: str, content_digest: str) -> bool:
+        """
+        Store the digest of a source's crawled content in its metadata.
+        
+        Args:
+            source_id: ID of the source to update.
+            content_digest: Digest of the content whose tools are in the catalog.
+            
+        Returns:
+            True if successful, False otherwise.
+        """
+        try:
+            await asyncio.to_thread(
+                self.table.update_item,
+                Key={'id': source_id},
+                UpdateExpression='SET metadata.content_digest = :digest',
+                ExpressionAttributeValues={':digest': content_digest},
+            )
+            
+            logger.info(f"Updated content digest for source {source_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Error updating source content digest: {str(e)}")
             return False
\ No newline at end of file
@@ -3,23 +3,142 @@ Storage services for MCP tools.
 """
 
 import os
-from typing import List, Union
+import posixpath
+from typing import AsyncIterator, Iterable, List, Optional, Union
 
 from ..models import MCPTool
+from ..utils.config import get_config
+from ..utils.logging import get_logger
+from .changelog import LocalChangelog, S3Changelog, change_entry
+from .jsonl_storage import JsonLinesStorage
 from .local_storage import LocalStorage
 from .s3_storage import S3Storage
+from .sharded_s3_storage import ShardedS3Storage
+from .sqlite_storage import SqliteStorage
+
+logger = get_logger(__name__)
 
 
 def get_storage():
     """
-    Get the appropriate storage service based on the environment.
+    Get the configured storage service.
     
-    In production, uses S3Storage, in development, uses LocalStorage.
+    With the default ``auto`` setting, uses S3Storage in production and
+    LocalStorage in development. ``jsonl`` selects the append-only
+    JsonLinesStorage, ``sqlite`` the indexed SqliteStorage and ``s3_sharded``
+    the sharded ShardedS3Storage.
     
     Returns:
         A storage service instance.
+        
+    Raises:
+        ValueError: If the configured backend is unknown.
     """
-    if os.environ.get('ENVIRONMENT', 'development') == 'production':
+    backend = get_config()['storage']['backend']
+    
+    if backend == 'auto':
+        backend = 's3' if os.environ.get('ENVIRONMENT', 'development') == 'production' else 'local'
+    
+    if backend == 's3':
         return S3Storage()
-    else:
+    if backend == 's3_sharded':
+        return ShardedS3Storage()
+    if backend == 'local':
         return LocalStorage()
+    if backend == 'jsonl':
+        return JsonLinesStorage()
+    if backend == 'sqlite':
+        return SqliteStorage()
+    
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def get_changelog(storage) -> Optional[Union[LocalChangelog, S3Changelog]]:
+    """
+    Get the changelog stored next to a storage service's catalog.
+    
+    Local catalogs get a ``<name>.changes.jsonl`` file beside the catalog
+    file. S3 catalogs get a ``changes/`` prefix beside the catalog object or
+    under the sharded catalog's prefix.
+    
+    Args:
+        storage: Tool storage service.
+        
+    Returns:
+        The changelog, or None if the storage is not one of this package's
+        backends.
+    """
+    if isinstance(storage, (LocalStorage, JsonLinesStorage, SqliteStorage)):
+        stem = storage.file_path.name.split('.')[0]
+        return LocalChangelog(storage.file_path.with_name(f"{stem}.changes.jsonl"))
+    if isinstance(storage, ShardedS3Storage):
+        return S3Changelog(storage.bucket_name, f"{storage.prefix}changes/")
+    if isinstance(storage, S3Storage):
+        directory = posixpath.dirname(storage.key)
+        return S3Changelog(storage.bucket_name, f"{directory}/changes/" if directory else 'changes/')
+    return None
+
+
+async def save_and_record_changes(storage, upserted: List[MCPTool], removed_ids: List[str],
+                                  added_ids: Iterable[str] = ()) -> bool:
+    """
+    Save a set of catalog changes and record them in the storage's changelog.
+    
+    The changelog entry is staged as pending before the catalog is written,
+    so an entry that cannot be appended after the write stays pending and is
+    appended by the next call instead of being lost. If the entry cannot even
+    be staged, the catalog is not written.
+    
+    Args:
+        storage: Tool storage service to save the changes to.
+        upserted: Tools that were added or updated.
+        removed_ids: IDs of tools that were removed.
+        added_ids: IDs of the upserted tools that were not in the catalog
+                   before. The others count as updated.
+        
+    Returns:
+        True if the catalog changes were saved, False otherwise.
+    """
+    changelog = get_changelog(storage)
+    if changelog is None:
+        return await storage.save_changes(upserted, removed_ids)
+    
+    # Entries left over from a run whose append failed go first
+    await changelog.publish_pending()
+    if not upserted and not removed_ids:
+        return await storage.save_changes(upserted, removed_ids)
+    
+    pending = await changelog.stage(change_entry(upserted, removed_ids, added_ids))
+    if pending is None:
+        logger.error("Not saving catalog changes that could not be recorded in the changelog")
+        return False
+    
+    if not await storage.save_changes(upserted, removed_ids):
+        await changelog.discard(pending)
+        return False
+    
+    if not await changelog.publish_pending():
+        logger.error("Catalog changes were saved but not recorded in the changelog, "
+                     "they will be recorded on the next run")
+    return True
+
+
+async def iter_tool_batches(storage, batch_size: int) -> AsyncIterator[List[MCPTool]]:
+    """
+    Iterate over a storage service's tools in fixed-size batches.
+    
+    Args:
+        storage: Storage service with an ``iter_tools()`` method.
+        batch_size: Tools per batch.
+        
+    Yields:
+        Lists of batch_size tools, the last one possibly shorter.
+    """
+    batch: List[MCPTool] = []
+    async for tool in storage.iter_tools():
+        batch.append(tool)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
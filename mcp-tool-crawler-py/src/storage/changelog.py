@@ -0,0 +1,428 @@
+"""
+Change feed of the tool catalog.
+
+Every write of catalog changes appends one entry to a changelog stored next
+to the catalog. An entry lists the IDs of the tools that write added,
+updated and removed, with the version (last-updated time) of each tool it
+added or updated, and carries a sequence number one higher than the entry
+before it. The sequence number is the cursor: a consumer keeps the last one
+it applied and asks for the entries after it, instead of downloading the
+whole catalog to find out what changed.
+
+An entry is staged as pending before the catalog write it describes, and
+appended once the write succeeds. A pending entry that could not be appended
+stays pending and is appended by the next write, so consumers are told of
+every change at least once. Staged entries of writes that failed are
+discarded.
+
+Locally the changelog is a JSON Lines file appended under a file lock, with
+pending entries as files in a directory beside it. In S3 it is one object per
+entry, named by its zero-padded sequence number so that listing returns
+entries in order, with pending entries under a ``pending/`` prefix. Like the
+catalog itself, an S3 changelog expects one crawl run to write at a time.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from uuid import uuid4
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+import boto3
+
+from ..models import MCPTool
+from ..utils.helpers import get_timestamp
+from ..utils.logging import get_logger
+from ..utils.serialization import dumps, loads
+
+logger = get_logger(__name__)
+
+# Bytes read at a time when looking for the last entry of a local changelog
+TAIL_CHUNK_SIZE = 64 * 1024
+
+
+def change_entry(upserted: List[MCPTool], removed_ids: List[str], added_ids: Iterable[str]) -> Dict[str, Any]:
+    """
+    Describe a set of catalog changes.
+
+    Args:
+        upserted: Tools that were added or updated.
+        removed_ids: IDs of tools that were removed.
+        added_ids: IDs of the upserted tools that were not in the catalog before.
+
+    Returns:
+        The entry, without its sequence number.
+    """
+    added_ids = set(added_ids)
+    added, updated = [], []
+    for tool in upserted:
+        (added if tool.id in added_ids else updated).append({'id': tool.id, 'version': tool.last_updated})
+    return {
+        'created_at': get_timestamp(),
+        'added': added,
+        'updated': updated,
+        'removed': list(removed_ids),
+    }
+
+
+def _pending_name() -> str:
+    # Names sort in the order entries were staged
+    return f"{time.time_ns():020d}-{uuid4().hex}.json"
+
+
+class LocalChangelog:
+    """
+    Changelog kept in a local JSON Lines file.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        Initialize the local changelog.
+
+        Args:
+            file_path: Path to the changelog file.
+        """
+        self.file_path = Path(file_path)
+        self.lock_path = self.file_path.with_name(self.file_path.name + '.lock')
+        self.pending_dir = self.file_path.with_name(self.file_path.name + '.pending')
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._thread_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _tail(self) -> bytes:
+        """
+        Read the end of the file, back to the start of its last complete line.
+        """
+        with open(self.file_path, 'rb') as f:
+            end = f.seek(0, os.SEEK_END)
+            data = b''
+            position = end
+            while position > 0:
+                position = max(0, position - TAIL_CHUNK_SIZE)
+                f.seek(position)
+                data = f.read(TAIL_CHUNK_SIZE) + data
+                # A newline before the final one starts the last line
+                if data.rfind(b'\n', 0, len(data) - 1) >= 0:
+                    break
+            return data
+
+    def _last_sequence(self) -> int:
+        if not self.file_path.exists():
+            return 0
+        for line in reversed(self._tail().splitlines()):
+            try:
+                return loads(line)['sequence']
+            except (ValueError, KeyError, TypeError):
+                # A line torn by a crash
+                continue
+        return 0
+
+    def _append_sync(self, entry: Dict[str, Any]) -> int:
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._locked():
+            sequence = self._last_sequence() + 1
+            with open(self.file_path, 'ab') as f:
+                if f.tell() and not self._tail().endswith(b'\n'):
+                    # Finish a line torn by a crash so the entry starts its own
+                    f.write(b'\n')
+                f.write(dumps({'sequence': sequence, **entry}) + b'\n')
+                f.flush()
+                os.fsync(f.fileno())
+            return sequence
+
+    def _stage_sync(self, entry: Dict[str, Any]) -> str:
+        self.pending_dir.mkdir(parents=True, exist_ok=True)
+        path = self.pending_dir / _pending_name()
+        with open(path, 'wb') as f:
+            f.write(dumps(entry))
+            f.flush()
+            os.fsync(f.fileno())
+        return path.name
+
+    def _discard_sync(self, name: str) -> None:
+        (self.pending_dir / name).unlink(missing_ok=True)
+
+    def _publish_pending_sync(self) -> List[int]:
+        if not self.pending_dir.exists():
+            return []
+        sequences = []
+        for path in sorted(self.pending_dir.glob('*.json')):
+            with open(path, 'rb') as f:
+                entry = loads(f.read())
+            sequences.append(self._append_sync(entry))
+            path.unlink()
+        return sequences
+
+    def _since_sync(self, cursor: int, limit: Optional[int]) -> List[Dict[str, Any]]:
+        entries = []
+        if not self.file_path.exists():
+            return entries
+        with open(self.file_path, 'rb') as f:
+            for line in f:
+                try:
+                    entry = loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(entry, dict) or entry.get('sequence', 0) <= cursor:
+                    continue
+                entries.append(entry)
+                if limit is not None and len(entries) >= limit:
+                    break
+        return entries
+
+    async def append(self, entry: Dict[str, Any]) -> Optional[int]:
+        """
+        Append an entry to the changelog.
+
+        Args:
+            entry: The entry, see change_entry().
+
+        Returns:
+            The entry's sequence number, or None if it could not be written.
+        """
+        try:
+            sequence = await asyncio.to_thread(self._append_sync, entry)
+            logger.info(f"Recorded catalog change {sequence} in {self.file_path}")
+            return sequence
+        except Exception as e:
+            logger.error(f"Error recording catalog change: {str(e)}")
+            return None
+
+    async def stage(self, entry: Dict[str, Any]) -> Optional[str]:
+        """
+        Stage an entry as pending, before the catalog write it describes.
+
+        Args:
+            entry: The entry, see change_entry().
+
+        Returns:
+            Name of the pending entry, or None if it could not be staged.
+        """
+        try:
+            return await asyncio.to_thread(self._stage_sync, entry)
+        except Exception as e:
+            logger.error(f"Error staging catalog change: {str(e)}")
+            return None
+
+    async def discard(self, name: str) -> None:
+        """
+        Drop a pending entry whose catalog write failed.
+
+        Args:
+            name: Name of the pending entry, as returned by stage().
+        """
+        try:
+            await asyncio.to_thread(self._discard_sync, name)
+        except Exception as e:
+            logger.error(f"Error discarding pending catalog change {name}: {str(e)}")
+
+    async def publish_pending(self) -> bool:
+        """
+        Append every pending entry to the changelog, oldest first.
+
+        Returns:
+            True if no entry is left pending, False otherwise.
+        """
+        try:
+            sequences = await asyncio.to_thread(self._publish_pending_sync)
+        except Exception as e:
+            logger.error(f"Error recording pending catalog changes, they stay pending: {str(e)}")
+            return False
+        if sequences:
+            logger.info(f"Recorded catalog changes {sequences[0]} to {sequences[-1]}")
+        return True
+
+    async def since(self, cursor: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Read the entries after a cursor.
+
+        Args:
+            cursor: Sequence number of the last entry already applied, or 0
+                    to read from the start.
+            limit: Most entries to return. If None, returns every one.
+
+        Returns:
+            Entries in sequence order.
+        """
+        return await asyncio.to_thread(self._since_sync, cursor, limit)
+
+
+class S3Changelog:
+    """
+    Changelog kept as one S3 object per entry.
+    """
+
+    def __init__(self, bucket_name: str, prefix: str):
+        """
+        Initialize the S3 changelog.
+
+        Args:
+            bucket_name: S3 bucket name.
+            prefix: Key prefix of the changelog's objects.
+        """
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+        self.head_key = f"{prefix}head.json"
+        self.pending_prefix = f"{prefix}pending/"
+        self.s3_client = boto3.client('s3')
+
+    def _entry_key(self, sequence: int) -> str:
+        return f"{self.prefix}entries/{sequence:012d}.json"
+
+    def _exists(self, key: str) -> bool:
+        try:
+            self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
+        except self.s3_client.exceptions.ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+        return True
+
+    def _append_sync(self, entry: Dict[str, Any]) -> int:
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=self.head_key)
+            sequence = loads(response['Body'].read())['sequence'] + 1
+        except self.s3_client.exceptions.NoSuchKey:
+            sequence = 1
+
+        # The head can lag behind the entries if a writer stopped between the two
+        while self._exists(self._entry_key(sequence)):
+            sequence += 1
+        self.s3_client.put_object(
+            Bucket=self.bucket_name,
+            Key=self._entry_key(sequence),
+            Body=dumps({'sequence': sequence, **entry}),
+            ContentType='application/json',
+        )
+
+        # The head only speeds up finding the next number; entries are the record
+        self.s3_client.put_object(Bucket=self.bucket_name, Key=self.head_key,
+                                  Body=dumps({'sequence': sequence}), ContentType='application/json')
+        return sequence
+
+    def _stage_sync(self, entry: Dict[str, Any]) -> str:
+        name = _pending_name()
+        self.s3_client.put_object(Bucket=self.bucket_name, Key=f"{self.pending_prefix}{name}",
+                                  Body=dumps(entry), ContentType='application/json')
+        return name
+
+    def _discard_sync(self, name: str) -> None:
+        self.s3_client.delete_object(Bucket=self.bucket_name, Key=f"{self.pending_prefix}{name}")
+
+    def _publish_pending_sync(self) -> List[int]:
+        sequences = []
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=self.pending_prefix):
+            for item in page.get('Contents', []):
+                response = self.s3_client.get_object(Bucket=self.bucket_name, Key=item['Key'])
+                sequences.append(self._append_sync(loads(response['Body'].read())))
+                self.s3_client.delete_object(Bucket=self.bucket_name, Key=item['Key'])
+        return sequences
+
+    def _since_sync(self, cursor: int, limit: Optional[int]) -> List[Dict[str, Any]]:
+        entries = []
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        pages = paginator.paginate(Bucket=self.bucket_name, Prefix=f"{self.prefix}entries/",
+                                   StartAfter=self._entry_key(cursor))
+        for page in pages:
+            for item in page.get('Contents', []):
+                response = self.s3_client.get_object(Bucket=self.bucket_name, Key=item['Key'])
+                entries.append(loads(response['Body'].read()))
+                if limit is not None and len(entries) >= limit:
+                    return entries
+        return entries
+
+    async def append(self, entry: Dict[str, Any]) -> Optional[int]:
+        """
+        Append an entry to the changelog.
+
+        Args:
+            entry: The entry, see change_entry().
+
+        Returns:
+            The entry's sequence number, or None if it could not be written.
+        """
+        try:
+            sequence = await asyncio.to_thread(self._append_sync, entry)
+            logger.info(f"Recorded catalog change {sequence} in S3 bucket: {self.bucket_name}/{self.prefix}")
+            return sequence
+        except Exception as e:
+            logger.error(f"Error recording catalog change in S3: {str(e)}")
+            return None
+
+    async def stage(self, entry: Dict[str, Any]) -> Optional[str]:
+        """
+        Stage an entry as pending, before the catalog write it describes.
+
+        Args:
+            entry: The entry, see change_entry().
+
+        Returns:
+            Name of the pending entry, or None if it could not be staged.
+        """
+        try:
+            return await asyncio.to_thread(self._stage_sync, entry)
+        except Exception as e:
+            logger.error(f"Error staging catalog change: {str(e)}")
+            return None
+
+    async def discard(self, name: str) -> None:
+        """
+        Drop a pending entry whose catalog write failed.
+
+        Args:
+            name: Name of the pending entry, as returned by stage().
+        """
+        try:
+            await asyncio.to_thread(self._discard_sync, name)
+        except Exception as e:
+            logger.error(f"Error discarding pending catalog change {name}: {str(e)}")
+
+    async def publish_pending(self) -> bool:
+        """
+        Append every pending entry to the changelog, oldest first.
+
+        Returns:
+            True if no entry is left pending, False otherwise.
+        """
+        try:
+            sequences = await asyncio.to_thread(self._publish_pending_sync)
+        except Exception as e:
+            logger.error(f"Error recording pending catalog changes, they stay pending: {str(e)}")
+            return False
+        if sequences:
+            logger.info(f"Recorded catalog changes {sequences[0]} to {sequences[-1]}")
+        return True
+
+    async def since(self, cursor: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Read the entries after a cursor.
+
+        Args:
+            cursor: Sequence number of the last entry already applied, or 0
+                    to read from the start.
+            limit: Most entries to return. If None, returns every one.
+
+        Returns:
+            Entries in sequence order.
+        """
+        return await asyncio.to_thread(self._since_sync, cursor, limit)
@@ -0,0 +1,324 @@
+"""
+Streaming encoding of the tool catalog.
+
+A catalog is a JSON array of tool records, written one compact record per
+line and optionally compressed with gzip or zstd. Encoding writes records
+straight into the compressor and decoding parses records as the decompressed
+bytes arrive, so neither direction holds the whole uncompressed catalog in
+memory. Decoding accepts any JSON array layout, including the pretty-printed
+catalogs written before, and detects the compression from the data itself.
+"""
+
+import codecs
+import gzip
+import io
+import json
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from ..utils.config import get_config
+from ..utils.serialization import loads, record_to_json
+
+config = get_config()
+
+COMPRESSIONS = ('none', 'gzip', 'zstd')
+
+# Content-Encoding of each compression
+CONTENT_ENCODINGS = {'gzip': 'gzip', 'zstd': 'zstd'}
+# File name suffix of each compression
+FILE_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# A tool to encode, or a record decoded from a catalog
+Record = Union[BaseModel, Dict[str, Any]]
+
+# Bytes read from the decompressed stream at a time
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def get_compression(compression: Optional[str] = None) -> str:
+    """
+    Validate a catalog compression.
+
+    Args:
+        compression: ``none``, ``gzip`` or ``zstd``. If None, uses the value from config.
+
+    Returns:
+        The compression.
+
+    Raises:
+        ValueError: If the compression is unknown, or is zstd and the
+                    zstandard package is not installed.
+    """
+    compression = compression or config['storage']['compression']
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown catalog compression: {compression}")
+    if compression == 'zstd' and zstandard is None:
+        raise ValueError("zstd catalog compression requires the zstandard package")
+    return compression
+
+
+def detect_compression(head: bytes) -> str:
+    """
+    Detect the compression of encoded catalog data.
+
+    Args:
+        head: The first bytes of the data.
+
+    Returns:
+        ``gzip``, ``zstd`` or ``none``.
+    """
+    if head.startswith(GZIP_MAGIC):
+        return 'gzip'
+    if head.startswith(ZSTD_MAGIC):
+        return 'zstd'
+    return 'none'
+
+
+def write_catalog(records: Iterable[Record], out: BinaryIO, compression: str = 'none') -> int:
+    """
+    Encode catalog records into a binary stream.
+
+    Args:
+        records: Tools, or tool records decoded from a catalog.
+        out: Stream to write to. It is not closed.
+        compression: ``none``, ``gzip`` or ``zstd``.
+
+    Returns:
+        Number of records written.
+    """
+    if compression == 'gzip':
+        # A fixed mtime keeps the output a function of the records alone
+        writer = gzip.GzipFile(fileobj=out, mode='wb', mtime=0)
+    elif compression == 'zstd':
+        writer = zstandard.ZstdCompressor().stream_writer(out, closefd=False)
+    else:
+        writer = None
+
+    target = writer if writer is not None else out
+    count = 0
+    target.write(b'[')
+    for record in records:
+        target.write((b',\n' if count else b'\n') + record_to_json(record))
+        count += 1
+    target.write(b'\n]\n')
+
+    if writer is not None:
+        writer.close()
+    return count
+
+
+def encode_catalog(records: Iterable[Record], compression: str = 'none') -> bytes:
+    """
+    Encode catalog records into bytes.
+
+    Args:
+        records: Tools, or tool records decoded from a catalog.
+        compression: ``none``, ``gzip`` or ``zstd``.
+
+    Returns:
+        The encoded catalog.
+    """
+    out = io.BytesIO()
+    write_catalog(records, out, compression)
+    return out.getvalue()
+
+
+def _decompressed(stream: BinaryIO, compression: Optional[str]) -> BinaryIO:
+    if compression is None:
+        head = stream.read(len(ZSTD_MAGIC))
+        compression = detect_compression(head)
+        stream = _Prepended(head, stream)
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=stream, mode='rb')
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ValueError("Reading a zstd catalog requires the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(stream)
+    return stream
+
+
+def iter_catalog(stream: BinaryIO, compression: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Decode catalog records from a binary stream, one at a time.
+
+    Catalogs in the layout write_catalog() produces are decoded a line at a
+    time with the fast decoder. Anything else falls back to an incremental
+    parse of the JSON array from where the layout stopped matching.
+
+    Args:
+        stream: Stream of the encoded catalog.
+        compression: ``none``, ``gzip`` or ``zstd``. If None, it is detected
+                     from the data.
+
+    Yields:
+        Tool records in catalog order.
+
+    Raises:
+        ValueError: If the data is not a JSON array of records.
+    """
+    reader = _ChunkReader(_decompressed(stream, compression))
+    started = False
+
+    for line in reader.lines():
+        record = line.strip()
+        if not record:
+            continue
+        if not started:
+            if record != b'[':
+                # Not one record per line
+                reader.push_back(line)
+                break
+            started = True
+            continue
+        if record == b']':
+            return
+        try:
+            value = loads(record[:-1] if record.endswith(b',') else record)
+        except ValueError:
+            value = None
+        if not isinstance(value, dict):
+            reader.push_back(line)
+            break
+        yield value
+    else:
+        if started:
+            raise ValueError("Catalog ends before its closing bracket")
+        return
+
+    yield from _iter_json_array(reader, started)
+
+
+def _iter_json_array(reader: '_ChunkReader', started: bool) -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally parse the records of a JSON array in any layout.
+
+    Args:
+        reader: Reader positioned at the start of the array, or after its
+                opening bracket.
+        started: True if the opening bracket was already read.
+
+    Yields:
+        The array's elements.
+    """
+    text = codecs.getincrementaldecoder('utf-8')()
+
+    def read() -> Tuple[str, bool]:
+        data = reader.read()
+        return text.decode(data, final=not data), not data
+
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+
+    while True:
+        # Skip what separates records
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position += 1
+        if position == len(buffer):
+            if eof:
+                break
+            buffer, eof = read()
+            position = 0
+            continue
+
+        if not started:
+            if buffer[position] != '[':
+                raise ValueError("Catalog is not a JSON array")
+            started = True
+            position += 1
+            continue
+        if buffer[position] == ']':
+            return
+
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # The record continues in the next chunk
+            chunk, eof = read()
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        if end == len(buffer) and not eof:
+            # A number or literal may continue in the next chunk
+            chunk, eof = read()
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        yield record
+        position = end
+
+    if started:
+        raise ValueError("Catalog ends before its closing bracket")
+
+
+class _ChunkReader:
+    """
+    Reads a binary stream in chunks, or a line at a time, with the option to
+    put the last line back.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._pending = b''
+        # What lines() has read but not yet yielded
+        self._buffer = b''
+        self._start = 0
+
+    def read(self) -> bytes:
+        if self._pending:
+            data, self._pending = self._pending, b''
+            return data
+        return self._stream.read(READ_CHUNK_SIZE)
+
+    def push_back(self, line: bytes) -> None:
+        """
+        Put back the line lines() last yielded, and stop reading lines.
+        """
+        self._pending = line + self._buffer[self._start:] + self._pending
+        self._buffer, self._start = b'', 0
+
+    def lines(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read()
+            if not chunk:
+                if self._start < len(self._buffer):
+                    line = self._buffer[self._start:]
+                    self._buffer, self._start = b'', 0
+                    yield line
+                return
+            self._buffer, self._start = self._buffer[self._start:] + chunk, 0
+            newline = self._buffer.find(b'\n')
+            while newline >= 0:
+                line = self._buffer[self._start:newline + 1]
+                self._start = newline + 1
+                yield line
+                newline = self._buffer.find(b'\n', self._start)
+
+
+class _Prepended:
+    """
+    A read-only stream with some already-read bytes put back in front.
+    """
+
+    def __init__(self, head: bytes, stream: BinaryIO):
+        self._head = head
+        self._stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        if not self._head:
+            return self._stream.read(size)
+        if size is None or size < 0:
+            data, self._head = self._head + self._stream.read(), b''
+        else:
+            data, self._head = self._head[:size], self._head[size:]
+        return data
@@ -0,0 +1,329 @@
+"""
+Append-only JSON Lines storage service for MCP tools.
+
+The catalog is a log with one record per line: a ``put`` carrying a whole
+tool, or a ``delete`` carrying a tool ID. Saving a set of changes appends
+their records and fsyncs, so it costs as much as the change rather than the
+catalog, and a crash can at worst leave a torn last line, which is skipped
+when the log is read. Loading replays the log, with later records winning.
+
+Once superseded records outnumber live ones, the log is compacted in the
+background: the live records are written to a temp file, records appended in
+the meantime are copied after them, and the temp file is renamed over the
+log. Appends and the rename take a file lock, so concurrent crawls on the
+same machine never lose each other's records.
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+from ..models import MCPTool
+from ..utils.config import get_config
+from ..utils.helpers import get_timestamp
+from ..utils.logging import get_logger
+from ..utils.serialization import dumps, loads, model_to_json
+
+logger = get_logger(__name__)
+config = get_config()
+
+
+class JsonLinesStorage:
+    """
+    Local append-log storage service for MCP tools.
+    """
+
+    def __init__(self, file_path: Optional[str] = None, compaction_min_records: Optional[int] = None):
+        """
+        Initialize the JSON Lines storage service.
+
+        Args:
+            file_path: Path to the log file. If None, uses the default path.
+            compaction_min_records: Superseded records to tolerate before
+                                    compacting, however small the catalog.
+                                    If None, uses the value from config.
+        """
+        if file_path:
+            self.file_path = Path(file_path)
+        else:
+            self.file_path = Path(__file__).parents[3] / 'data' / 'tools.jsonl'
+        self.lock_path = self.file_path.with_name(self.file_path.name + '.lock')
+        self.compaction_min_records = (compaction_min_records if compaction_min_records is not None
+                                       else config['storage']['compaction_min_records'])
+
+        # Ensure data directory exists
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._thread_lock = threading.Lock()
+        # Records in the log and live tools, once the log has been read
+        self._log_records: Optional[int] = None
+        self._live_records: Optional[int] = None
+        self._compaction: Optional[asyncio.Future] = None
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._thread_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _put(tool: MCPTool) -> bytes:
+        return b'{"op":"put","tool":' + model_to_json(tool) + b'}\n'
+
+    @staticmethod
+    def _delete(tool_id: str) -> bytes:
+        return dumps({'op': 'delete', 'id': tool_id}) + b'\n'
+
+    def _replay(self, data: bytes) -> Tuple[Dict[str, bytes], int]:
+        """
+        Replay log records.
+
+        Args:
+            data: Contents of the log.
+
+        Returns:
+            The ``put`` line of each live tool keyed by ID, and the number of
+            records read.
+        """
+        lines: Dict[str, bytes] = {}
+        records = 0
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = loads(line)
+                if record['op'] == 'put':
+                    lines[record['tool']['id']] = line
+                elif record['op'] == 'delete':
+                    lines.pop(record['id'], None)
+                else:
+                    raise ValueError(f"unknown op {record['op']!r}")
+            except (ValueError, KeyError, TypeError) as e:
+                # Most likely the torn tail of an interrupted append
+                logger.warning(f"Skipping unreadable record in {self.file_path}: {str(e)}")
+                continue
+            records += 1
+        return lines, records
+
+    def _fsync_directory(self) -> None:
+        if os.name == 'nt':
+            return
+        fd = os.open(self.file_path.parent, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _write_atomically(self, lines: List[bytes], tail: bytes = b'') -> None:
+        # Write to a temp file and rename so readers never see a partial log
+        fd, tmp_path = tempfile.mkstemp(dir=self.file_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for line in lines:
+                    f.write(line)
+                    if not line.endswith(b'\n'):
+                        f.write(b'\n')
+                f.write(tail)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.file_path)
+            self._fsync_directory()
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _append(self, records: List[bytes]) -> None:
+        with self._locked():
+            with open(self.file_path, 'ab+') as f:
+                # Start on a fresh line if the last append was torn
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        f.write(b'\n')
+                f.write(b''.join(records))
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _compact_sync(self) -> bool:
+        with self._locked():
+            if not self.file_path.exists():
+                return False
+            inode = os.stat(self.file_path).st_ino
+            with open(self.file_path, 'rb') as f:
+                data = f.read()
+
+        # Rewriting the snapshot does not hold up appends
+        lines, _ = self._replay(data)
+
+        with self._locked():
+            stat = os.stat(self.file_path)
+            if stat.st_ino != inode:
+                # Another writer compacted or replaced the log meanwhile
+                return False
+            with open(self.file_path, 'rb') as f:
+                f.seek(len(data))
+                tail = f.read()
+            self._write_atomically(list(lines.values()), tail)
+
+        self._log_records = self._live_records = len(lines)
+        if tail:
+            # Records appended during compaction are counted on the next load
+            self._log_records = self._live_records = None
+        logger.info(f"Compacted {self.file_path} to {len(lines)} tools")
+        return True
+
+    def _try_compact(self) -> bool:
+        try:
+            return self._compact_sync()
+        except Exception as e:
+            logger.error(f"Error compacting local log: {str(e)}")
+            return False
+
+    def _needs_compaction(self) -> bool:
+        if self._log_records is None or self._live_records is None:
+            return False
+        # An estimate: appended records are all counted as superseding others
+        superseded = self._log_records - self._live_records
+        return superseded > max(self._live_records, self.compaction_min_records)
+
+    async def save_tools(self, tools: List[MCPTool]) -> bool:
+        """
+        Replace the catalog with a set of tools.
+
+        Args:
+            tools: List of tools to save.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        try:
+            # One record per ID so re-saving is idempotent
+            lines = list({tool.id: self._put(tool) for tool in tools}.values())
+
+            def write() -> None:
+                with self._locked():
+                    self._write_atomically(lines)
+
+            await asyncio.to_thread(write)
+            self._log_records = self._live_records = len(lines)
+
+            logger.info(f"Saved {len(tools)} tools to {self.file_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving tools to local log: {str(e)}")
+            return False
+
+    async def load_tools(self) -> List[MCPTool]:
+        """
+        Load tools by replaying the log.
+
+        Returns:
+            List of tools loaded from the log.
+        """
+        try:
+            if not self.file_path.exists():
+                logger.warning(f"No tool catalog found at {self.file_path}")
+                return []
+
+            def read() -> bytes:
+                with open(self.file_path, 'rb') as f:
+                    return f.read()
+
+            lines, records = self._replay(await asyncio.to_thread(read))
+            tools = MCPTool.bulk_from_stored(loads(line)['tool'] for line in lines.values())
+            self._log_records, self._live_records = records, len(lines)
+
+            logger.info(f"Loaded {len(tools)} tools from {self.file_path} ({records} log records)")
+            return tools
+        except Exception as e:
+            logger.error(f"Error loading tools from local log: {str(e)}")
+            return []
+
+    async def iter_tools(self) -> AsyncIterator[MCPTool]:
+        """
+        Iterate over the tools in the log without building them all.
+
+        The log must be replayed in full before any tool is known to be
+        live, but only the raw records are kept, and tools are built one at
+        a time as they are consumed.
+
+        Yields:
+            Live tools, in the order they were first written.
+        """
+        if not self.file_path.exists():
+            return
+
+        def read() -> bytes:
+            with open(self.file_path, 'rb') as f:
+                return f.read()
+
+        lines, records = self._replay(await asyncio.to_thread(read))
+        # Crawls read the catalog this way, so save_changes() can tell when to compact
+        self._log_records, self._live_records = records, len(lines)
+        timestamp = get_timestamp()
+        for line in lines.values():
+            yield MCPTool.from_stored(loads(line)['tool'], timestamp)
+
+    async def save_changes(self, upserted: List[MCPTool], removed_ids: List[str]) -> bool:
+        """
+        Append a set of catalog changes to the log.
+
+        Starts a background compaction if the log has grown well past the
+        catalog.
+
+        Args:
+            upserted: Tools to add, or to replace the stored tool with the same ID.
+            removed_ids: IDs of tools to remove.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        if not upserted and not removed_ids:
+            return True
+
+        try:
+            records = [self._delete(tool_id) for tool_id in removed_ids]
+            records.extend(self._put(tool) for tool in upserted)
+            await asyncio.to_thread(self._append, records)
+
+            logger.info(f"Appended {len(upserted)} changed and {len(removed_ids)} removed tools to {self.file_path}")
+        except Exception as e:
+            logger.error(f"Error appending tool changes to local log: {str(e)}")
+            return False
+
+        if self._log_records is not None:
+            self._log_records += len(records)
+        if self._needs_compaction() and (self._compaction is None or self._compaction.done()):
+            self._compaction = asyncio.ensure_future(asyncio.to_thread(self._try_compact))
+        return True
+
+    async def compact(self) -> bool:
+        """
+        Rewrite the log with only its live records.
+
+        Waits for any background compaction first.
+
+        Returns:
+            True if the log was compacted, False otherwise.
+        """
+        if self._compaction is not None:
+            await self._compaction
+            self._compaction = None
+        return await asyncio.to_thread(self._try_compact)
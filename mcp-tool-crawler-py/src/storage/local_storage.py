@@ -2,33 +2,49 @@
 Local file storage service for MCP tools.
 """
 
-import json
 import os
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 
 from ..models import MCPTool
+from ..utils.helpers import get_timestamp
 from ..utils.logging import get_logger
+from .encoding import FILE_SUFFIXES, get_compression, iter_catalog, write_catalog
 
 logger = get_logger(__name__)
 
+# Where catalogs are kept when no path is given
+DATA_DIR = Path(__file__).parents[3] / 'data'
+
 
 class LocalStorage:
     """
     Local file storage service for MCP tools.
     """
     
-    def __init__(self, file_path: Optional[str] = None):
+    def __init__(self, file_path: Optional[str] = None, compression: Optional[str] = None):
         """
         Initialize the local storage service.
         
         Args:
-            file_path: Path to the file to store tools in. If None, uses the default path.
+            file_path: Path to the file to store tools in. If None, uses the
+                       default path, with a suffix for the compression unless
+                       only an existing uncompressed-name catalog is there.
+            compression: Compression of saved catalogs: ``none``, ``gzip`` or
+                         ``zstd``. If None, uses the value from config. Loading
+                         detects the compression of the file.
         """
+        self.compression = get_compression(compression)
         if file_path:
             self.file_path = Path(file_path)
         else:
-            self.file_path = Path(__file__).parents[3] / 'data' / 'tools.json'
+            suffix = FILE_SUFFIXES.get(self.compression, '')
+            self.file_path = DATA_DIR / f"tools.json{suffix}"
+            # Keep using a catalog saved before compression was enabled;
+            # loading detects its compression either way
+            legacy_path = DATA_DIR / 'tools.json'
+            if not self.file_path.exists() and legacy_path.exists():
+                self.file_path = legacy_path
         
         # Ensure data directory exists
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -44,12 +60,12 @@ class LocalStorage:
             True if successful, False otherwise.
         """
         try:
-            # Convert tools to JSON
-            tools_json = [tool.dict() for tool in tools]
+            # One record per ID so re-saving is idempotent
+            unique = {tool.id: tool for tool in tools}.values()
             
-            # Write to file
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(tools_json, f, indent=2)
+            # Stream the records into the file
+            with open(self.file_path, 'wb') as f:
+                write_catalog(unique, f, self.compression)
             
             logger.info(f"Saved {len(tools)} tools to {self.file_path}")
             return True
@@ -70,15 +86,64 @@ class LocalStorage:
                 logger.warning(f"No tool catalog found at {self.file_path}")
                 return []
             
-            # Read file
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Convert to MCPTool objects
-            tools = [MCPTool(**item) for item in data]
+            # Parse records as the file is read
+            with open(self.file_path, 'rb') as f:
+                tools = MCPTool.bulk_from_stored(iter_catalog(f))
             
             logger.info(f"Loaded {len(tools)} tools from {self.file_path}")
             return tools
         except Exception as e:
             logger.error(f"Error loading tools from local file: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+    
+    async def iter_tools(self) -> AsyncIterator[MCPTool]:
+        """
+        Iterate over the tools in the local file without loading them all.
+        
+        Yields:
+            Tools in catalog order, parsed as the file is read.
+            
+        Raises:
+            ValueError: If the file is not a valid catalog.
+        """
+        if not self.file_path.exists():
+            return
+        
+        timestamp = get_timestamp()
+        with open(self.file_path, 'rb') as f:
+            for item in iter_catalog(f):
+                yield MCPTool.from_stored(item, timestamp)
+    
+    async def save_changes(self, upserted: List[MCPTool], removed_ids: List[str]) -> bool:
+        """
+        Apply a set of catalog changes to the local file.
+        
+        Args:
+            upserted: Tools to add, or to replace the stored tool with the same ID.
+            removed_ids: IDs of tools to remove.
+            
+        Returns:
+            True if successful, False otherwise.
+        """
+        if not upserted and not removed_ids:
+            return True
+        
+        try:
+            tools_by_id = {}
+            if self.file_path.exists():
+                with open(self.file_path, 'rb') as f:
+                    tools_by_id = {item['id']: item for item in iter_catalog(f)}
+            
+            for tool_id in removed_ids:
+                tools_by_id.pop(tool_id, None)
+            for tool in upserted:
+                tools_by_id[tool.id] = tool
+            
+            with open(self.file_path, 'wb') as f:
+                write_catalog(tools_by_id.values(), f, self.compression)
+            
+            logger.info(f"Saved {len(upserted)} changed and {len(removed_ids)} removed tools to {self.file_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving tool changes to local file: {str(e)}")
+            return False
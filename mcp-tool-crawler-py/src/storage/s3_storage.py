@@ -2,38 +2,96 @@
 S3 storage services for MCP tools and sources.
 """
 
-import json
+import asyncio
 import yaml
 import boto3
-import io
-from typing import List, Dict, Any, Optional, Union
+import tempfile
+from itertools import islice
+from typing import AsyncIterator, List, Dict, Any, Optional
 
 from ..models import MCPTool, Source, SourceType
 from ..utils.logging import get_logger
 from ..utils.config import get_config
-from ..utils.helpers import is_github_repo, extract_domain
+from ..utils.helpers import is_github_repo, extract_domain, get_timestamp
+from .encoding import CONTENT_ENCODINGS, get_compression, iter_catalog, write_catalog
 
 logger = get_logger(__name__)
 config = get_config()
 
+# Encoded catalog bytes kept in memory before spilling to a temp file
+UPLOAD_SPOOL_SIZE = 8 * 1024 * 1024
+# Records read and decoded at a time while iterating over the catalog
+ITER_BATCH_SIZE = 1000
+
 
 class S3Storage:
     """
     S3 storage service for MCP tools.
     """
     
-    def __init__(self, bucket_name: Optional[str] = None, key: Optional[str] = None):
+    def __init__(self, bucket_name: Optional[str] = None, key: Optional[str] = None,
+                 compression: Optional[str] = None):
         """
         Initialize the S3 storage service.
         
         Args:
             bucket_name: S3 bucket name. If None, uses the value from config.
             key: S3 object key. If None, uses the value from config.
+            compression: Compression of saved catalogs: ``none``, ``gzip`` or
+                         ``zstd``, recorded as the object's Content-Encoding.
+                         If None, uses the value from config.
         """
         self.bucket_name = bucket_name or config['aws']['s3']['bucket_name']
         self.key = key or config['aws']['s3']['tool_catalog_key']
+        self.compression = get_compression(compression)
         self.s3_client = boto3.client('s3')
     
+    def _upload(self, records) -> None:
+        # Encode into a spooled file so the uncompressed catalog is never built in memory
+        with tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE) as f:
+            write_catalog(records, f, self.compression)
+            f.seek(0)
+            extra_args = {'ContentType': 'application/json'}
+            if self.compression in CONTENT_ENCODINGS:
+                extra_args['ContentEncoding'] = CONTENT_ENCODINGS[self.compression]
+            self.s3_client.upload_fileobj(f, self.bucket_name, self.key, ExtraArgs=extra_args)
+    
+    def _download(self):
+        return self._records(self.s3_client.get_object(Bucket=self.bucket_name, Key=self.key))
+    
+    def _records(self, response: Dict[str, Any]):
+        # Transfer encodings such as aws-chunked may follow the content coding
+        encoding = (response.get('ContentEncoding') or '').split(',')[0].strip()
+        compression = next((name for name, value in CONTENT_ENCODINGS.items() if value == encoding), None)
+        return iter_catalog(response['Body'], compression)
+    
+    def _load(self) -> Optional[List[MCPTool]]:
+        # Check if object exists
+        try:
+            self.s3_client.head_object(
+                Bucket=self.bucket_name,
+                Key=self.key
+            )
+        except Exception:
+            logger.warning(f"No tool catalog found in S3 bucket: {self.bucket_name}/{self.key}")
+            return None
+        
+        # Parse records as the object is downloaded
+        return MCPTool.bulk_from_stored(self._download())
+    
+    def _apply_changes(self, upserted: List[MCPTool], removed_ids: List[str]) -> None:
+        try:
+            tools_by_id = {item['id']: item for item in self._download()}
+        except self.s3_client.exceptions.NoSuchKey:
+            tools_by_id = {}
+        
+        for tool_id in removed_ids:
+            tools_by_id.pop(tool_id, None)
+        for tool in upserted:
+            tools_by_id[tool.id] = tool
+        
+        self._upload(tools_by_id.values())
+    
     async def save_tools(self, tools: List[MCPTool]) -> bool:
         """
         Save tools to S3.
@@ -45,16 +103,11 @@ class S3Storage:
             True if successful, False otherwise.
         """
         try:
-            # Convert tools to JSON
-            tools_json = [tool.dict() for tool in tools]
+            # One record per ID so re-saving is idempotent
+            unique = {tool.id: tool for tool in tools}.values()
             
-            # Upload to S3
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=self.key,
-                Body=json.dumps(tools_json, indent=2),
-                ContentType='application/json'
-            )
+            # Encode and upload off the event loop
+            await asyncio.to_thread(self._upload, unique)
             
             logger.info(f"Saved {len(tools)} tools to S3 bucket: {self.bucket_name}/{self.key}")
             return True
@@ -70,33 +123,82 @@ class S3Storage:
             List of tools loaded from S3.
         """
         try:
-            # Check if object exists
-            try:
-                self.s3_client.head_object(
-                    Bucket=self.bucket_name,
-                    Key=self.key
-                )
-            except Exception:
-                logger.warning(f"No tool catalog found in S3 bucket: {self.bucket_name}/{self.key}")
+            # Download and decode off the event loop
+            tools = await asyncio.to_thread(self._load)
+            if tools is None:
                 return []
             
-            # Get object from S3
-            response = self.s3_client.get_object(
-                Bucket=self.bucket_name,
-                Key=self.key
-            )
-            
-            # Parse JSON
-            data = json.loads(response['Body'].read().decode('utf-8'))
-            
-            # Convert to MCPTool objects
-            tools = [MCPTool(**item) for item in data]
-            
             logger.info(f"Loaded {len(tools)} tools from S3 bucket: {self.bucket_name}/{self.key}")
             return tools
         except Exception as e:
             logger.error(f"Error loading tools from S3: {str(e)}")
             return []
+    
+    async def iter_tools(self) -> AsyncIterator[MCPTool]:
+        """
+        Iterate over the tools in S3 without loading them all.
+        
+        The object is parsed as it downloads, a batch of records at a time in
+        a worker thread, with the next batch read while the current one is
+        consumed, so memory use does not grow with the size of the catalog.
+        Tools missing timestamps share one timestamp per iteration.
+        
+        Yields:
+            Tools in catalog order.
+            
+        Raises:
+            ValueError: If the object is not a valid catalog.
+        """
+        try:
+            response = await asyncio.to_thread(self.s3_client.get_object,
+                                               Bucket=self.bucket_name, Key=self.key)
+        except self.s3_client.exceptions.NoSuchKey:
+            return
+        records = self._records(response)
+        
+        def read_batch() -> List[Dict[str, Any]]:
+            return list(islice(records, ITER_BATCH_SIZE))
+        
+        timestamp = get_timestamp()
+        pending = asyncio.create_task(asyncio.to_thread(read_batch))
+        try:
+            while True:
+                batch = await pending
+                if not batch:
+                    break
+                pending = asyncio.create_task(asyncio.to_thread(read_batch))
+                for item in batch:
+                    yield MCPTool.from_stored(item, timestamp)
+        finally:
+            # A consumer that stopped early leaves a read in flight; let it
+            # finish before closing the body it reads from
+            await asyncio.gather(pending, return_exceptions=True)
+            response['Body'].close()
+    
+    async def save_changes(self, upserted: List[MCPTool], removed_ids: List[str]) -> bool:
+        """
+        Apply a set of catalog changes to the catalog in S3.
+        
+        Args:
+            upserted: Tools to add, or to replace the stored tool with the same ID.
+            removed_ids: IDs of tools to remove.
+            
+        Returns:
+            True if successful, False otherwise.
+        """
+        if not upserted and not removed_ids:
+            return True
+        
+        try:
+            # Download, merge and upload off the event loop
+            await asyncio.to_thread(self._apply_changes, upserted, removed_ids)
+            
+            logger.info(f"Saved {len(upserted)} changed and {len(removed_ids)} removed tools to S3 bucket: "
+                        f"{self.bucket_name}/{self.key}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving tool changes to S3: {str(e)}")
+            return False
 
 
 class S3SourceStorage:
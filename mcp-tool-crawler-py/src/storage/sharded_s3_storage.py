@@ -0,0 +1,375 @@
+"""
+Sharded S3 storage service for MCP tools.
+
+The catalog is split into a fixed number of shards by a hash of each tool's
+ID, and each shard is stored as an immutable object whose key includes a hash
+of its content. A versioned manifest lists the shard objects that make up one
+version of the catalog, and a small pointer object names the current manifest.
+
+Writers upload only the shards whose content changed, then a new manifest,
+then swap the pointer with a single conditional PUT. Readers follow the
+pointer once and fetch the shards it lists in parallel, so they always see
+one consistent version even while a writer is uploading the next. The swap
+only succeeds if the pointer is still the one the writer read its manifest
+through, so of two writers building on the same version one publishes and
+the other gives up rather than drop the first one's changes. Old manifests, and
+shards that no retained manifest references and that are older than all of
+them, are pruned after a few versions; a newer shard may belong to a version
+that another writer has not published yet.
+"""
+
+import asyncio
+from hashlib import blake2b
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import boto3
+
+from ..models import MCPTool
+from ..utils.config import get_config
+from ..utils.helpers import get_timestamp
+from ..utils.logging import get_logger
+from ..utils.serialization import dumps, loads
+from .encoding import CONTENT_ENCODINGS, FILE_SUFFIXES, Record, encode_catalog, get_compression, iter_catalog
+
+logger = get_logger(__name__)
+config = get_config()
+
+# Objects per DeleteObjects request
+DELETE_BATCH_SIZE = 1000
+# Shards fetched ahead of the one being consumed when iterating
+ITER_PREFETCH_SHARDS = 4
+
+
+class CatalogVersionConflict(Exception):
+    """
+    Raised by a writer when another writer published a catalog version after
+    the one it read, so its own version would drop the other's changes.
+    """
+
+
+class ShardedS3Storage:
+    """
+    S3 storage service that keeps the tool catalog in hash-bucketed shards.
+    """
+
+    def __init__(self, bucket_name: Optional[str] = None, prefix: Optional[str] = None,
+                 shard_count: Optional[int] = None, retained_versions: Optional[int] = None,
+                 compression: Optional[str] = None):
+        """
+        Initialize the sharded S3 storage service.
+
+        Args:
+            bucket_name: S3 bucket name. If None, uses the value from config.
+            prefix: Key prefix of the catalog objects. If None, uses the value from config.
+            shard_count: Shards to split the catalog into. If None, uses the value from config.
+            retained_versions: Catalog versions to keep, at least 2 so readers
+                               of the previous version can finish. If None,
+                               uses the value from config.
+            compression: Compression of the shards: ``none``, ``gzip`` or
+                         ``zstd``. If None, uses the value from config.
+        """
+        self.bucket_name = bucket_name or config['aws']['s3']['bucket_name']
+        self.prefix = prefix if prefix is not None else config['aws']['s3']['tool_catalog_prefix']
+        self.shard_count = shard_count or config['storage']['s3_shard_count']
+        self.retained_versions = max(2, retained_versions or config['storage']['s3_retained_versions'])
+        self.compression = get_compression(compression)
+        self.pointer_key = f"{self.prefix}manifest.json"
+        self.s3_client = boto3.client('s3')
+
+    def shard_of(self, tool_id: str) -> str:
+        """
+        Get the shard a tool belongs in.
+
+        Args:
+            tool_id: The tool's ID.
+
+        Returns:
+            The shard's name.
+        """
+        bucket = int.from_bytes(blake2b(tool_id.encode('utf-8'), digest_size=8).digest(), 'big')
+        width = len(f"{self.shard_count - 1:x}")
+        return f"{bucket % self.shard_count:0{width}x}"
+
+    def _get_json(self, key: str) -> Any:
+        response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+        return loads(response['Body'].read())
+
+    def _get_records(self, key: str) -> List[Dict[str, Any]]:
+        response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+        return list(iter_catalog(response['Body']))
+
+    def _put_json(self, key: str, value: Any, **conditions: str) -> None:
+        self.s3_client.put_object(
+            Bucket=self.bucket_name,
+            Key=key,
+            Body=dumps(value),
+            ContentType='application/json',
+            **conditions,
+        )
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=self.pointer_key)
+        except self.s3_client.exceptions.NoSuchKey:
+            return None
+        pointer = loads(response['Body'].read())
+        manifest = self._get_json(pointer['key'])
+        # Not stored: the pointer this version was read through, for the swap
+        manifest['pointer_etag'] = response['ETag']
+        return manifest
+
+    async def _read_shards(self, manifest: Dict[str, Any], names: Optional[Set[str]] = None
+                           ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch shards of a catalog version in parallel.
+
+        Args:
+            manifest: Manifest of the version.
+            names: Names of the shards to fetch. If None, fetches all of them.
+
+        Returns:
+            The tool records of each shard, keyed by shard name.
+        """
+        shards = {name: shard for name, shard in manifest['shards'].items()
+                  if names is None or name in names}
+        records = await asyncio.gather(*[
+            asyncio.to_thread(self._get_records, shard['key']) for shard in shards.values()
+        ])
+        return dict(zip(shards, records))
+
+    def _write_version(self, manifest: Optional[Dict[str, Any]],
+                       shards: Dict[str, List[Record]]) -> Tuple[int, int]:
+        """
+        Upload changed shards and make a new catalog version current.
+
+        Args:
+            manifest: Manifest of the current version, or None if there is none.
+            shards: Full contents of every shard that may have changed. Shards
+                    of the current version that are not given are kept as they are.
+
+        Returns:
+            The new version number, and the number of shards uploaded.
+        """
+        entries = dict(manifest['shards']) if manifest is not None else {}
+        uploaded = 0
+        for name, records in shards.items():
+            if not records:
+                entries.pop(name, None)
+                continue
+            body = encode_catalog(sorted(records, key=self._id_of), self.compression)
+            digest = blake2b(body, digest_size=16).hexdigest()
+            key = f"{self.prefix}shards/{name}-{digest}.json{FILE_SUFFIXES.get(self.compression, '')}"
+            if entries.get(name, {}).get('key') != key:
+                # Shard keys are content-addressed, so an unchanged shard is never uploaded again
+                extra_args = {}
+                if self.compression in CONTENT_ENCODINGS:
+                    extra_args['ContentEncoding'] = CONTENT_ENCODINGS[self.compression]
+                self.s3_client.put_object(Bucket=self.bucket_name, Key=key, Body=body,
+                                          ContentType='application/json', **extra_args)
+                uploaded += 1
+            entries[name] = {'key': key, 'tools': len(records)}
+
+        version = (manifest['version'] if manifest is not None else 0) + 1
+        body = dumps({
+            'version': version,
+            'created_at': get_timestamp(),
+            'shard_count': self.shard_count,
+            'tool_count': sum(entry['tools'] for entry in entries.values()),
+            'shards': dict(sorted(entries.items())),
+        })
+        # Writers racing for the same version each upload their own manifest
+        manifest_key = f"{self.prefix}manifests/{version:012d}-{blake2b(body, digest_size=8).hexdigest()}.json"
+        self.s3_client.put_object(Bucket=self.bucket_name, Key=manifest_key, Body=body,
+                                  ContentType='application/json')
+
+        # The swap: readers see either the old version or the new one, and it
+        # fails if another writer swapped the pointer since it was read
+        condition = {'IfMatch': manifest['pointer_etag']} if manifest is not None else {'IfNoneMatch': '*'}
+        try:
+            self._put_json(self.pointer_key, {'version': version, 'key': manifest_key}, **condition)
+        except self.s3_client.exceptions.ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                raise CatalogVersionConflict(f"Another writer published a catalog version after version "
+                                             f"{version - 1}; not publishing over it") from e
+            raise
+
+        try:
+            self._prune()
+        except Exception as e:
+            logger.warning(f"Error pruning old catalog versions: {str(e)}")
+        return version, uploaded
+
+    def _list_objects(self, prefix: str) -> List[Dict[str, Any]]:
+        objects = []
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            objects.extend(page.get('Contents', []))
+        return objects
+
+    def _prune(self) -> None:
+        """
+        Delete manifests older than the retained versions, and shards that no
+        retained manifest references and that are older than all of them.
+        """
+        manifests = sorted(self._list_objects(f"{self.prefix}manifests/"), key=lambda item: item['Key'])
+        retained, expired = manifests[-self.retained_versions:], manifests[:-self.retained_versions]
+        if not expired:
+            return
+
+        referenced = {shard['key'] for item in retained for shard in self._get_json(item['Key'])['shards'].values()}
+        # Writers upload shards before their manifest, so a newer shard may
+        # belong to a version that is not published yet
+        cutoff = min(item['LastModified'] for item in retained)
+        garbage = [item['Key'] for item in expired] + [
+            item['Key'] for item in self._list_objects(f"{self.prefix}shards/")
+            if item['Key'] not in referenced and item['LastModified'] < cutoff
+        ]
+        for i in range(0, len(garbage), DELETE_BATCH_SIZE):
+            self.s3_client.delete_objects(Bucket=self.bucket_name, Delete={
+                'Objects': [{'Key': key} for key in garbage[i:i + DELETE_BATCH_SIZE]],
+                'Quiet': True,
+            })
+        logger.info(f"Pruned {len(garbage)} old catalog objects from S3 bucket: {self.bucket_name}/{self.prefix}")
+
+    @staticmethod
+    def _id_of(record: Record) -> str:
+        return record.id if isinstance(record, MCPTool) else record['id']
+
+    def _bucket(self, records: List[Record]) -> Dict[str, List[Record]]:
+        shards: Dict[str, List[Record]] = {}
+        for record in records:
+            shards.setdefault(self.shard_of(self._id_of(record)), []).append(record)
+        return shards
+
+    async def save_tools(self, tools: List[MCPTool]) -> bool:
+        """
+        Replace the catalog in S3 with a set of tools.
+
+        Args:
+            tools: List of tools to save.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        try:
+            # One record per ID so re-saving is idempotent
+            records = list({tool.id: tool for tool in tools}.values())
+            manifest = await asyncio.to_thread(self._read_manifest)
+
+            shards = self._bucket(records)
+            if manifest is not None:
+                # Shards that are now empty
+                for name in manifest['shards']:
+                    shards.setdefault(name, [])
+
+            version, uploaded = await asyncio.to_thread(self._write_version, manifest, shards)
+
+            logger.info(f"Saved {len(records)} tools as version {version} ({uploaded} shards uploaded) "
+                        f"to S3 bucket: {self.bucket_name}/{self.prefix}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving tools to S3: {str(e)}")
+            return False
+
+    async def load_tools(self) -> List[MCPTool]:
+        """
+        Load the current version of the catalog from S3.
+
+        Returns:
+            List of tools loaded from S3.
+        """
+        try:
+            manifest = await asyncio.to_thread(self._read_manifest)
+            if manifest is None:
+                logger.warning(f"No tool catalog found in S3 bucket: {self.bucket_name}/{self.prefix}")
+                return []
+
+            shards = await self._read_shards(manifest)
+            tools = MCPTool.bulk_from_stored(record for records in shards.values() for record in records)
+
+            logger.info(f"Loaded {len(tools)} tools from version {manifest['version']} "
+                        f"in S3 bucket: {self.bucket_name}/{self.prefix}")
+            return tools
+        except Exception as e:
+            logger.error(f"Error loading tools from S3: {str(e)}")
+            return []
+
+    async def iter_tools(self) -> AsyncIterator[MCPTool]:
+        """
+        Iterate over the current version of the catalog one shard at a time.
+
+        A few shards are fetched ahead in parallel, so at most those are held
+        in memory at once.
+
+        Yields:
+            Tools, shard by shard.
+        """
+        manifest = await asyncio.to_thread(self._read_manifest)
+        if manifest is None:
+            return
+
+        keys = [shard['key'] for shard in manifest['shards'].values()]
+        timestamp = get_timestamp()
+        pending: List[asyncio.Task] = []
+        try:
+            for i in range(len(keys)):
+                while len(pending) <= ITER_PREFETCH_SHARDS and i + len(pending) < len(keys):
+                    pending.append(asyncio.create_task(
+                        asyncio.to_thread(self._get_records, keys[i + len(pending)])
+                    ))
+                records = await pending.pop(0)
+                for record in records:
+                    yield MCPTool.from_stored(record, timestamp)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def save_changes(self, upserted: List[MCPTool], removed_ids: List[str]) -> bool:
+        """
+        Apply a set of catalog changes, rewriting only the shards they touch.
+
+        Args:
+            upserted: Tools to add, or to replace the stored tool with the same ID.
+            removed_ids: IDs of tools to remove.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        if not upserted and not removed_ids:
+            return True
+
+        try:
+            manifest = await asyncio.to_thread(self._read_manifest)
+            if manifest is not None and manifest['shard_count'] != self.shard_count:
+                # Re-shard the whole catalog
+                return await self.save_tools(self._apply(await self.load_tools(), upserted, removed_ids))
+
+            touched = {self.shard_of(tool.id) for tool in upserted} | {self.shard_of(i) for i in removed_ids}
+            shards = await self._read_shards(manifest, touched) if manifest is not None else {}
+
+            by_id: Dict[str, Record] = {
+                record['id']: record for name in touched for record in shards.get(name, [])
+            }
+            for tool_id in removed_ids:
+                by_id.pop(tool_id, None)
+            for tool in upserted:
+                by_id[tool.id] = tool
+            changed = {name: [] for name in touched}
+            for name, records in self._bucket(list(by_id.values())).items():
+                changed[name] = records
+
+            version, uploaded = await asyncio.to_thread(self._write_version, manifest, changed)
+
+            logger.info(f"Saved {len(upserted)} changed and {len(removed_ids)} removed tools as version "
+                        f"{version} ({uploaded} shards uploaded) to S3 bucket: {self.bucket_name}/{self.prefix}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving tool changes to S3: {str(e)}")
+            return False
+
+    @staticmethod
+    def _apply(tools: List[MCPTool], upserted: List[MCPTool], removed_ids: List[str]) -> List[MCPTool]:
+        removed = set(removed_ids)
+        by_id = {tool.id: tool for tool in tools if tool.id not in removed}
+        by_id.update((tool.id, tool) for tool in upserted)
+        return list(by_id.values())
@@ -0,0 +1,366 @@
+"""
+SQLite storage service for MCP tools.
+
+The catalog is a SQLite database with a row per tool, a row per tool and
+source it was found in, and an FTS5 index over each tool's name, description
+and tags. Lookups by ID, by source and by text are served by indexes instead
+of a scan of the catalog.
+
+Saving a set of changes stages the tools in a temporary table with one
+batched insert, then applies them to the tool table, the source table and
+the index with a few set-based statements in one transaction. Only tools
+whose record changed are rewritten and re-indexed. The index is maintained
+here rather than by triggers, which cost an index update per row.
+
+Each row keeps the whole tool as JSON next to the indexed columns, so tools
+load without validation and the database can be queried with SQLite's JSON
+functions for offline analysis. After editing the tool table by hand, run
+``INSERT INTO tools_fts (tools_fts) VALUES ('rebuild')``.
+"""
+
+import asyncio
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+
+from ..models import MCPTool
+from ..utils.helpers import get_timestamp
+from ..utils.logging import get_logger
+from ..utils.serialization import loads, model_to_json
+
+logger = get_logger(__name__)
+
+# Tools read per query when iterating
+ITER_PAGE_SIZE = 1000
+# Seconds to wait for another connection's write lock
+BUSY_TIMEOUT = 30
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tools (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    record TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tool_sources (
+    source_url TEXT NOT NULL,
+    tool_id TEXT NOT NULL REFERENCES tools (id) ON DELETE CASCADE,
+    PRIMARY KEY (source_url, tool_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS tool_sources_tool_id ON tool_sources (tool_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS tools_fts USING fts5(
+    name, description, tags,
+    content='tools', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+"""
+
+# Per-connection tables that hold a write while it is applied
+TEMP_TABLES = (
+    'CREATE TEMP TABLE IF NOT EXISTS staged ('
+    'seq INTEGER PRIMARY KEY, id TEXT UNIQUE, name TEXT, description TEXT, tags TEXT, record TEXT)',
+    'CREATE TEMP TABLE IF NOT EXISTS changed (id TEXT PRIMARY KEY) WITHOUT ROWID',
+    'CREATE TEMP TABLE IF NOT EXISTS removed (id TEXT PRIMARY KEY) WITHOUT ROWID',
+)
+
+
+def _tool_row(tool: MCPTool) -> Tuple[str, str, str, str, str]:
+    tags = ' '.join(tool.metadata.get('tags') or [])
+    return tool.id, tool.name, tool.description, tags, model_to_json(tool).decode('utf-8')
+
+
+def _source_rows(tool: MCPTool) -> Iterator[Tuple[str, str]]:
+    for source_url in {tool.source_url, *(tool.metadata.get('sources') or [])}:
+        yield source_url, tool.id
+
+
+def _match_expression(text: str) -> str:
+    """
+    Turn free text into an FTS5 query matching every word as a prefix.
+
+    Args:
+        text: Words to search for.
+
+    Returns:
+        The FTS5 query.
+    """
+    words = text.split()
+    return ' '.join('"' + word.replace('"', '""') + '"*' for word in words)
+
+
+class SqliteStorage:
+    """
+    SQLite storage service for MCP tools.
+    """
+
+    def __init__(self, file_path: Optional[str] = None):
+        """
+        Initialize the SQLite storage service.
+
+        Args:
+            file_path: Path to the database. If None, uses the default path.
+        """
+        if file_path:
+            self.file_path = Path(file_path)
+        else:
+            self.file_path = Path(__file__).parents[3] / 'data' / 'tools.db'
+
+        # Ensure data directory exists
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._schema_ready = False
+
+    @contextmanager
+    def _connect(self, write: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Open a connection in a transaction, creating the schema on first use.
+
+        Args:
+            write: True to take the write lock up front, so the transaction
+                   cannot fail halfway on another writer's lock.
+
+        Yields:
+            A connection that commits when the block succeeds and rolls back
+            when it raises.
+        """
+        connection = sqlite3.connect(self.file_path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        try:
+            connection.execute('PRAGMA journal_mode = WAL')
+            connection.execute('PRAGMA synchronous = NORMAL')
+            connection.execute('PRAGMA foreign_keys = ON')
+            if not self._schema_ready:
+                connection.executescript(SCHEMA)
+                connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+                self._schema_ready = True
+
+            connection.execute('BEGIN IMMEDIATE' if write else 'BEGIN')
+            try:
+                yield connection
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _stage(connection: sqlite3.Connection, tools: List[MCPTool], removed_ids: List[str]) -> None:
+        for statement in TEMP_TABLES:
+            connection.execute(statement)
+        for table in ('staged', 'changed', 'removed'):
+            connection.execute(f'DELETE FROM temp.{table}')
+
+        # Later tools with the same ID win
+        connection.executemany('INSERT OR REPLACE INTO temp.staged (id, name, description, tags, record) '
+                               'VALUES (?, ?, ?, ?, ?)',
+                               (_tool_row(tool) for tool in tools))
+        connection.executemany('INSERT OR IGNORE INTO temp.removed VALUES (?)',
+                               ((tool_id,) for tool_id in removed_ids))
+
+    @staticmethod
+    def _apply_staged(connection: sqlite3.Connection, tools: List[MCPTool]) -> None:
+        """
+        Remove the tools in temp.removed and upsert the ones in temp.staged.
+
+        Args:
+            connection: Connection in a write transaction.
+            tools: The staged tools, for their source membership.
+        """
+        connection.execute(
+            'INSERT INTO temp.changed SELECT staged.id FROM temp.staged AS staged '
+            'LEFT JOIN tools ON tools.id = staged.id WHERE tools.record IS NOT staged.record'
+        )
+        # Old index entries of removed and changed tools
+        connection.execute(
+            "INSERT INTO tools_fts (tools_fts, rowid, name, description, tags) "
+            "SELECT 'delete', rowid, name, description, tags FROM tools "
+            "WHERE id IN (SELECT id FROM temp.removed UNION ALL SELECT id FROM temp.changed)"
+        )
+        connection.execute('DELETE FROM tools WHERE id IN (SELECT id FROM temp.removed)')
+
+        connection.execute(
+            'INSERT INTO tools (id, name, description, tags, record) '
+            'SELECT id, name, description, tags, record FROM temp.staged WHERE id IN (SELECT id FROM temp.changed) '
+            'ORDER BY seq ON CONFLICT (id) DO UPDATE SET name = excluded.name, description = excluded.description, '
+            'tags = excluded.tags, record = excluded.record'
+        )
+        # FTS5 takes entries in rowid order far faster than in any other
+        connection.execute(
+            'INSERT INTO tools_fts (rowid, name, description, tags) '
+            'SELECT rowid, name, description, tags FROM tools WHERE id IN (SELECT id FROM temp.changed) '
+            'ORDER BY rowid'
+        )
+
+        # Membership is replaced along with the tool
+        changed = {tool_id for tool_id, in connection.execute('SELECT id FROM temp.changed')}
+        connection.execute('DELETE FROM tool_sources WHERE tool_id IN (SELECT id FROM temp.changed)')
+        connection.executemany(
+            'INSERT OR IGNORE INTO tool_sources (source_url, tool_id) VALUES (?, ?)',
+            sorted(row for tool in tools if tool.id in changed for row in _source_rows(tool)),
+        )
+
+    def _save_tools_sync(self, tools: List[MCPTool]) -> None:
+        with self._connect(write=True) as connection:
+            self._stage(connection, tools, [])
+            connection.execute(
+                'INSERT INTO temp.removed SELECT id FROM tools WHERE id NOT IN (SELECT id FROM temp.staged)'
+            )
+            self._apply_staged(connection, tools)
+
+    def _save_changes_sync(self, upserted: List[MCPTool], removed_ids: List[str]) -> None:
+        with self._connect(write=True) as connection:
+            self._stage(connection, upserted, removed_ids)
+            self._apply_staged(connection, upserted)
+
+    def _query_sync(self, sql: str, parameters: Tuple = ()) -> List[Tuple]:
+        with self._connect() as connection:
+            return connection.execute(sql, parameters).fetchall()
+
+    async def _load(self, sql: str, parameters: Tuple = ()) -> List[MCPTool]:
+        rows = await asyncio.to_thread(self._query_sync, sql, parameters)
+        return MCPTool.bulk_from_stored(loads(record) for record, in rows)
+
+    async def save_tools(self, tools: List[MCPTool]) -> bool:
+        """
+        Replace the catalog in the database with a set of tools.
+
+        Args:
+            tools: List of tools to save.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        try:
+            await asyncio.to_thread(self._save_tools_sync, tools)
+
+            logger.info(f"Saved {len(tools)} tools to {self.file_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving tools to SQLite: {str(e)}")
+            return False
+
+    async def load_tools(self) -> List[MCPTool]:
+        """
+        Load every tool from the database.
+
+        Returns:
+            List of tools, in the order they were first saved.
+        """
+        try:
+            if not self.file_path.exists():
+                logger.warning(f"No tool catalog found at {self.file_path}")
+                return []
+
+            tools = await self._load('SELECT record FROM tools ORDER BY rowid')
+
+            logger.info(f"Loaded {len(tools)} tools from {self.file_path}")
+            return tools
+        except Exception as e:
+            logger.error(f"Error loading tools from SQLite: {str(e)}")
+            return []
+
+    async def iter_tools(self) -> AsyncIterator[MCPTool]:
+        """
+        Iterate over the tools in the database a page at a time.
+
+        Yields:
+            Tools, in the order they were first saved.
+        """
+        if not self.file_path.exists():
+            return
+
+        timestamp = get_timestamp()
+        last_rowid = 0
+        while True:
+            page = await asyncio.to_thread(
+                self._query_sync,
+                'SELECT rowid, record FROM tools WHERE rowid > ? ORDER BY rowid LIMIT ?',
+                (last_rowid, ITER_PAGE_SIZE),
+            )
+            for last_rowid, record in page:
+                yield MCPTool.from_stored(loads(record), timestamp)
+            if len(page) < ITER_PAGE_SIZE:
+                return
+
+    async def save_changes(self, upserted: List[MCPTool], removed_ids: List[str]) -> bool:
+        """
+        Apply a set of catalog changes in one transaction.
+
+        Args:
+            upserted: Tools to add, or to replace the stored tool with the same ID.
+            removed_ids: IDs of tools to remove.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        if not upserted and not removed_ids:
+            return True
+
+        try:
+            await asyncio.to_thread(self._save_changes_sync, upserted, removed_ids)
+
+            logger.info(f"Saved {len(upserted)} changed and {len(removed_ids)} removed tools to {self.file_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving tool changes to SQLite: {str(e)}")
+            return False
+
+    async def get_tool(self, tool_id: str) -> Optional[MCPTool]:
+        """
+        Look up a tool by ID.
+
+        Args:
+            tool_id: ID of the tool.
+
+        Returns:
+            The tool, or None if it is not in the catalog.
+        """
+        tools = await self._load('SELECT record FROM tools WHERE id = ?', (tool_id,))
+        return tools[0] if tools else None
+
+    async def tools_for_source(self, source_url: str) -> List[MCPTool]:
+        """
+        Look up the tools found in a source.
+
+        Args:
+            source_url: URL of the source.
+
+        Returns:
+            Tools listed by the source, including ones merged from other sources.
+        """
+        return await self._load(
+            'SELECT tools.record FROM tool_sources JOIN tools ON tools.id = tool_sources.tool_id '
+            'WHERE tool_sources.source_url = ? ORDER BY tools.rowid',
+            (source_url,),
+        )
+
+    async def search(self, text: str, limit: int = 20) -> List[MCPTool]:
+        """
+        Search tool names, descriptions and tags.
+
+        Every word must match the start of a word in one of the fields, so
+        ``git serv`` finds "GitHub server".
+
+        Args:
+            text: Words to search for.
+            limit: Most tools to return.
+
+        Returns:
+            Matching tools, best match first.
+        """
+        expression = _match_expression(text)
+        if not expression:
+            return []
+
+        # Name matches weigh most, then tags, then the description
+        return await self._load(
+            'SELECT tools.record FROM tools_fts JOIN tools ON tools.rowid = tools_fts.rowid '
+            'WHERE tools_fts MATCH ? ORDER BY bm25(tools_fts, 10.0, 1.0, 5.0) LIMIT ?',
+            (expression, limit),
+        )
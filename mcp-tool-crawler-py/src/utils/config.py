@@ -25,6 +25,9 @@ DYNAMODB_SOURCES_TABLE = os.getenv('DYNAMODB_SOURCES_TABLE', 'mcp-sources')
 DYNAMODB_CRAWLERS_TABLE = os.getenv('DYNAMODB_CRAWLERS_TABLE', 'mcp-crawlers')
 DYNAMODB_CRAWL_RESULTS_TABLE = os.getenv('DYNAMODB_CRAWL_RESULTS_TABLE', 'mcp-crawl-results')
 
+# Key prefix of the sharded tool catalog
+S3_CATALOG_PREFIX = os.getenv('S3_CATALOG_PREFIX', 'catalog/')
+
 # S3 Source List Configuration
 S3_SOURCE_LIST_KEY = os.getenv('S3_SOURCE_LIST_KEY', 'sources.yaml')
 
@@ -36,9 +39,62 @@ OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4')
 CRAWLER_TIMEOUT = int(os.getenv('CRAWLER_TIMEOUT', '30000'))
 CRAWLER_USER_AGENT = os.getenv('CRAWLER_USER_AGENT', 'MCP-Tool-Crawler/1.0')
 CRAWLER_CONCURRENCY_LIMIT = int(os.getenv('CRAWLER_CONCURRENCY_LIMIT', '5'))
+CRAWLER_CONNECTION_POOL_SIZE = int(os.getenv('CRAWLER_CONNECTION_POOL_SIZE', '100'))
+CRAWLER_CONNECTION_POOL_SIZE_PER_HOST = int(os.getenv('CRAWLER_CONNECTION_POOL_SIZE_PER_HOST', '10'))
+# YAML/JSON keyword taxonomy for MCP relevance and tags (built-in if unset)
+CRAWLER_TAXONOMY_FILE = os.getenv('CRAWLER_TAXONOMY_FILE', '')
+# Largest decompressed response body read into memory (0 disables the limit)
+CRAWLER_MAX_BODY_BYTES = int(os.getenv('CRAWLER_MAX_BODY_BYTES', str(10 * 1024 * 1024)))
+
+# Tool catalog storage (auto, local, jsonl, sqlite, s3 or s3_sharded), and the
+# superseded records a JSON Lines catalog tolerates before compacting, however
+# small it is
+STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'auto')
+STORAGE_COMPACTION_MIN_RECORDS = int(os.getenv('STORAGE_COMPACTION_MIN_RECORDS', '1000'))
+# Compression of saved catalogs (none, gzip or zstd); zstd needs zstandard
+CATALOG_COMPRESSION = os.getenv('CATALOG_COMPRESSION', 'none')
+# Shards of a sharded S3 catalog, and catalog versions kept before pruning
+STORAGE_S3_SHARD_COUNT = int(os.getenv('STORAGE_S3_SHARD_COUNT', '64'))
+STORAGE_S3_RETAINED_VERSIONS = int(os.getenv('STORAGE_S3_RETAINED_VERSIONS', '3'))
+
+# HTTP cache for conditional requests (auto, local, s3 or none)
+HTTP_CACHE_BACKEND = os.getenv('HTTP_CACHE_BACKEND', 'auto')
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', str(Path(__file__).parents[2] / 'data' / 'http_cache'))
+HTTP_CACHE_S3_PREFIX = os.getenv('HTTP_CACHE_S3_PREFIX', 'http-cache/')
+
+# Request rate limits: requests per second per host, burst size, GitHub hosts'
+# rate, and the longest wait in seconds for a rate-limit reset before failing
+CRAWLER_HOST_RATE_LIMIT = float(os.getenv('CRAWLER_HOST_RATE_LIMIT', '2'))
+CRAWLER_HOST_BURST = int(os.getenv('CRAWLER_HOST_BURST', '4'))
+GITHUB_HOST_RATE_LIMIT = float(os.getenv('GITHUB_HOST_RATE_LIMIT', '20'))
+CRAWLER_MAX_RATE_LIMIT_WAIT = float(os.getenv('CRAWLER_MAX_RATE_LIMIT_WAIT', '60'))
+CRAWLER_MAX_RATE_LIMIT_RETRIES = int(os.getenv('CRAWLER_MAX_RATE_LIMIT_RETRIES', '3'))
+
+# In-process retries of failed fetches (attempts, backoff in seconds) and the
+# per-host circuit breaker (consecutive failures to open, seconds to stay open)
+CRAWLER_RETRY_ATTEMPTS = int(os.getenv('CRAWLER_RETRY_ATTEMPTS', '3'))
+CRAWLER_RETRY_BASE_DELAY = float(os.getenv('CRAWLER_RETRY_BASE_DELAY', '0.5'))
+CRAWLER_RETRY_MAX_DELAY = float(os.getenv('CRAWLER_RETRY_MAX_DELAY', '8'))
+CRAWLER_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CRAWLER_CIRCUIT_FAILURE_THRESHOLD', '5'))
+CRAWLER_CIRCUIT_RESET_TIMEOUT = float(os.getenv('CRAWLER_CIRCUIT_RESET_TIMEOUT', '60'))
+
+# Near-duplicate detection: minimum similarity of two tools' name and
+# description to merge them, and the LSH bands and rows per band
+DEDUP_SIMILARITY_THRESHOLD = float(os.getenv('DEDUP_SIMILARITY_THRESHOLD', '0.5'))
+DEDUP_LSH_BANDS = int(os.getenv('DEDUP_LSH_BANDS', '16'))
+DEDUP_LSH_ROWS = int(os.getenv('DEDUP_LSH_ROWS', '4'))
 
 # GitHub API
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN', '')
+# Additional tokens to rotate across, comma-separated
+GITHUB_TOKENS = os.getenv('GITHUB_TOKENS', '')
+GITHUB_API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com')
+GITHUB_RAW_URL = os.getenv('GITHUB_RAW_URL', 'https://raw.githubusercontent.com')
+GITHUB_GRAPHQL_URL = os.getenv('GITHUB_GRAPHQL_URL', 'https://api.github.com/graphql')
+# Repositories per batched GraphQL query (0 disables batching)
+GITHUB_GRAPHQL_BATCH_SIZE = int(os.getenv('GITHUB_GRAPHQL_BATCH_SIZE', '25'))
+# How long a resolved default branch / README path is reused, in seconds
+GITHUB_README_CACHE_TTL = int(os.getenv('GITHUB_README_CACHE_TTL', str(7 * 24 * 3600)))
 
 # Logging
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -73,6 +129,7 @@ def get_config() -> Dict[str, Any]:
             "s3": {
                 "bucket_name": S3_BUCKET_NAME,
                 "tool_catalog_key": "tools.json",
+                "tool_catalog_prefix": S3_CATALOG_PREFIX,
                 "source_list_key": S3_SOURCE_LIST_KEY,
             },
         },
@@ -84,9 +141,50 @@ def get_config() -> Dict[str, Any]:
             "timeout": CRAWLER_TIMEOUT,
             "user_agent": CRAWLER_USER_AGENT,
             "concurrency_limit": CRAWLER_CONCURRENCY_LIMIT,
+            "connection_pool_size": CRAWLER_CONNECTION_POOL_SIZE,
+            "connection_pool_size_per_host": CRAWLER_CONNECTION_POOL_SIZE_PER_HOST,
+            "max_body_bytes": CRAWLER_MAX_BODY_BYTES,
+            "taxonomy_file": CRAWLER_TAXONOMY_FILE,
+        },
+        "storage": {
+            "backend": STORAGE_BACKEND,
+            "compaction_min_records": STORAGE_COMPACTION_MIN_RECORDS,
+            "compression": CATALOG_COMPRESSION,
+            "s3_shard_count": STORAGE_S3_SHARD_COUNT,
+            "s3_retained_versions": STORAGE_S3_RETAINED_VERSIONS,
+        },
+        "http_cache": {
+            "backend": HTTP_CACHE_BACKEND,
+            "directory": HTTP_CACHE_DIR,
+            "s3_prefix": HTTP_CACHE_S3_PREFIX,
+        },
+        "rate_limit": {
+            "host_rate": CRAWLER_HOST_RATE_LIMIT,
+            "host_burst": CRAWLER_HOST_BURST,
+            "github_rate": GITHUB_HOST_RATE_LIMIT,
+            "max_wait": CRAWLER_MAX_RATE_LIMIT_WAIT,
+            "max_retries": CRAWLER_MAX_RATE_LIMIT_RETRIES,
+        },
+        "retry": {
+            "max_attempts": CRAWLER_RETRY_ATTEMPTS,
+            "base_delay": CRAWLER_RETRY_BASE_DELAY,
+            "max_delay": CRAWLER_RETRY_MAX_DELAY,
+            "circuit_failure_threshold": CRAWLER_CIRCUIT_FAILURE_THRESHOLD,
+            "circuit_reset_timeout": CRAWLER_CIRCUIT_RESET_TIMEOUT,
+        },
+        "dedup": {
+            "similarity_threshold": DEDUP_SIMILARITY_THRESHOLD,
+            "lsh_bands": DEDUP_LSH_BANDS,
+            "lsh_rows": DEDUP_LSH_ROWS,
         },
         "github": {
             "token": GITHUB_TOKEN,
+            "tokens": GITHUB_TOKENS,
+            "api_url": GITHUB_API_URL,
+            "raw_url": GITHUB_RAW_URL,
+            "graphql_url": GITHUB_GRAPHQL_URL,
+            "graphql_batch_size": GITHUB_GRAPHQL_BATCH_SIZE,
+            "readme_cache_ttl": GITHUB_README_CACHE_TTL,
         },
         "sources": PREDEFINED_SOURCES,
         "logging": {
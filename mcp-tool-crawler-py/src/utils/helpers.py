@@ -6,7 +6,7 @@ import re
 import uuid
 from datetime import datetime
 from typing import List, Set, Dict, Any, Optional
-from urllib.parse import urlparse
+from urllib.parse import parse_qsl, urlencode, urlparse, urlsplit
 
 
 def generate_id(prefix: str = '') -> str:
@@ -119,6 +119,79 @@ def extract_domain(url: str) -> str:
         return ''
 
 
+# Query parameters that only track where a click came from
+TRACKING_QUERY_PARAMS = {'ref', 'ref_src', 'fbclid', 'gclid'}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Reduce a URL to a canonical form, so different spellings of the same
+    link compare equal.
+    
+    The scheme becomes https, the host is lowercased and loses any "www." and
+    default port, the fragment, tracking parameters and trailing slashes are
+    dropped, and the remaining query parameters are sorted. GitHub repository
+    paths are lowercased, lose a ".git" suffix, and a bare "/tree/<branch>"
+    or "/blob/<branch>" is reduced to the repository itself.
+    
+    Args:
+        url: URL to canonicalize.
+        
+    Returns:
+        Canonical URL, or the stripped input if it is not an absolute URL.
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.scheme or not parts.hostname:
+        return url
+    
+    host = parts.hostname.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if port is not None and port not in (80, 443):
+        host = f"{host}:{port}"
+    
+    path = re.sub(r'/{2,}', '/', parts.path).rstrip('/')
+    if host == 'github.com':
+        segments = path.strip('/').split('/')
+        if len(segments) >= 2:
+            segments[0] = segments[0].lower()
+            segments[1] = segments[1].lower()
+            if segments[1].endswith('.git'):
+                segments[1] = segments[1][:-4]
+            if len(segments) == 4 and segments[2] in ('tree', 'blob'):
+                segments = segments[:2]
+            path = '/' + '/'.join(segments)
+    
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_QUERY_PARAMS
+    ))
+    
+    return f"https://{host}{path}" + (f"?{query}" if query else '')
+
+
+def generate_tool_id(url: str) -> str:
+    """
+    Derive a tool's ID from its URL.
+    
+    Every spelling of a URL that canonicalize_url() reduces to the same
+    canonical form gets the same ID, so re-crawls and other sources listing
+    the tool produce the same key.
+    
+    Args:
+        url: URL of the tool.
+        
+    Returns:
+        ID of the form ``tool-<uuid5>``.
+    """
+    return f"tool-{uuid.uuid5(uuid.NAMESPACE_URL, canonicalize_url(url))}"
+
+
 def deduplicate_by_key(items: List[Dict], key: str) -> List[Dict]:
     """
     Remove duplicates from a list of dictionaries based on a key.
@@ -0,0 +1,200 @@
+"""
+Persistent cache backends for conditional HTTP requests.
+
+The HTTP client stores the ETag, Last-Modified and body of every cacheable
+response here, and revalidates with ``If-None-Match``/``If-Modified-Since`` on
+the next fetch. Backends are plain key/value stores of JSON records, so other
+per-source state can share them.
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import boto3
+
+from .config import get_config
+from .logging import get_logger
+from .serialization import dumps, loads
+
+logger = get_logger(__name__)
+config = get_config()
+
+
+def _hash_key(key: str) -> str:
+    """
+    Hash a cache key into a filesystem- and S3-safe name.
+
+    Args:
+        key: Cache key.
+
+    Returns:
+        Hex digest of the key.
+    """
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+class CacheBackend(ABC):
+    """
+    Base class for cache backends.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a record from the cache.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            The cached record, or None if not present.
+        """
+        raise NotImplementedError("Subclasses must implement get()")
+
+    @abstractmethod
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store a record in the cache.
+
+        Args:
+            key: Cache key.
+            value: JSON-serializable record.
+        """
+        raise NotImplementedError("Subclasses must implement set()")
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """
+        Remove a record from the cache.
+
+        Args:
+            key: Cache key.
+        """
+        raise NotImplementedError("Subclasses must implement delete()")
+
+
+class LocalCacheBackend(CacheBackend):
+    """
+    Cache backend that stores one JSON file per key in a local directory.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialize the local cache backend.
+
+        Args:
+            directory: Directory to store records in. If None, uses the value from config.
+        """
+        self.directory = Path(directory or config['http_cache']['directory'])
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{_hash_key(key)}.json"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                return loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache record {path}: {str(e)}")
+            return None
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        path = self._path(key)
+        # Write to a temp file and rename so readers never see a partial record
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(dumps(value))
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    async def delete(self, key: str) -> None:
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+
+class S3CacheBackend(CacheBackend):
+    """
+    Cache backend that stores one JSON object per key under an S3 prefix.
+    """
+
+    def __init__(self, bucket_name: Optional[str] = None, prefix: Optional[str] = None):
+        """
+        Initialize the S3 cache backend.
+
+        Args:
+            bucket_name: S3 bucket name. If None, uses the value from config.
+            prefix: Key prefix for cache objects. If None, uses the value from config.
+        """
+        self.bucket_name = bucket_name or config['aws']['s3']['bucket_name']
+        self.prefix = prefix if prefix is not None else config['http_cache']['s3_prefix']
+        self.s3_client = boto3.client('s3')
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{_hash_key(key)}.json"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            response = await asyncio.to_thread(
+                self.s3_client.get_object, Bucket=self.bucket_name, Key=self._key(key)
+            )
+        except self.s3_client.exceptions.NoSuchKey:
+            return None
+        except Exception as e:
+            logger.warning(f"Error reading cache record from S3: {str(e)}")
+            return None
+
+        return loads(response['Body'].read())
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        await asyncio.to_thread(
+            self.s3_client.put_object,
+            Bucket=self.bucket_name,
+            Key=self._key(key),
+            Body=dumps(value),
+            ContentType='application/json',
+        )
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(
+            self.s3_client.delete_object, Bucket=self.bucket_name, Key=self._key(key)
+        )
+
+
+def get_cache_backend() -> Optional[CacheBackend]:
+    """
+    Get the configured cache backend.
+
+    With the default ``auto`` setting, uses S3CacheBackend in production and
+    LocalCacheBackend in development, mirroring ``get_storage()``.
+
+    Returns:
+        A cache backend instance, or None if caching is disabled.
+    """
+    backend = config['http_cache']['backend']
+
+    if backend == 'auto':
+        backend = 's3' if os.environ.get('ENVIRONMENT', 'development') == 'production' else 'local'
+
+    if backend == 's3':
+        return S3CacheBackend()
+    if backend == 'local':
+        return LocalCacheBackend()
+    if backend == 'none':
+        return None
+
+    raise ValueError(f"Unknown HTTP cache backend: {backend}")
@@ -0,0 +1,525 @@
+"""
+Shared asynchronous HTTP client for the MCP Tool Crawler.
+
+All crawlers fetch through a single pooled ``aiohttp`` session so that
+concurrent crawls overlap their network I/O instead of blocking the event loop.
+"""
+
+import asyncio
+import base64
+import codecs
+import time
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+from multidict import CIMultiDict
+
+from .config import get_config
+from .http_cache import CacheBackend, get_cache_backend
+from .logging import get_logger
+from .rate_limit import (GitHubTokenPool, HostScheduler, RateLimitExceeded,
+                         get_github_tokens, parse_retry_after)
+from .resilience import CircuitBreakerRegistry, RetryPolicy
+
+logger = get_logger(__name__)
+config = get_config()
+
+# Bytes read from the socket at a time when streaming a response body
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class HttpError(Exception):
+    """
+    Raised when an HTTP request fails or returns an error status.
+    """
+
+    def __init__(self, message: str, url: str, status: Optional[int] = None):
+        """
+        Initialize the error.
+
+        Args:
+            message: Error message.
+            url: URL that was requested.
+            status: HTTP status code, or None if no response was received.
+        """
+        super().__init__(message)
+        self.url = url
+        self.status = status
+
+
+class CircuitOpenError(HttpError):
+    """
+    Raised without sending a request when the host's circuit breaker is open.
+    """
+
+
+class HttpResponse:
+    """
+    A fully read HTTP response.
+    """
+
+    __slots__ = ('url', 'status', 'headers', 'body', 'not_modified', 'truncated')
+
+    def __init__(self, url: str, status: int, headers: Mapping[str, str], body: bytes,
+                 not_modified: bool = False, truncated: bool = False):
+        """
+        Initialize the response.
+
+        Args:
+            url: Final URL of the response.
+            status: HTTP status code.
+            headers: Response headers (looked up case-insensitively).
+            body: Raw response body.
+            not_modified: True if the server answered 304 and the body was
+                          replayed from the HTTP cache.
+            truncated: True if reading stopped at the body size limit.
+        """
+        self.url = url
+        self.status = status
+        self.headers = CIMultiDict(headers)
+        self.body = body
+        self.not_modified = not_modified
+        self.truncated = truncated
+
+    @property
+    def text(self) -> str:
+        """
+        Response body decoded as UTF-8.
+
+        A multi-byte character cut off by truncation is dropped rather than
+        replaced.
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        return decoder.decode(self.body, final=not self.truncated)
+
+    @property
+    def ok(self) -> bool:
+        """
+        True if the status code is below 400.
+        """
+        return self.status < 400
+
+
+class HttpClient:
+    """
+    Pooled asynchronous HTTP client.
+
+    The underlying session is created lazily on first use and is bound to the
+    running event loop. The client can be used as an async context manager;
+    nested uses share the session and it is closed when the outermost user exits.
+
+    If a cache backend is given, GET requests are revalidated with
+    ``If-None-Match``/``If-Modified-Since`` and 304 responses are answered from
+    the cache. If a scheduler is given, requests are paced per host; if a token
+    pool is given, GitHub requests are authenticated from it.
+
+    Transient failures (connection errors, timeouts, 408 and 5xx responses) are
+    retried with jittered exponential backoff, and a per-host circuit breaker
+    fails requests fast once a host keeps failing.
+
+    Response bodies are streamed (and decompressed) chunk by chunk and reading
+    stops once ``max_body_bytes`` have been received, so an oversized page
+    cannot exhaust memory.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, user_agent: Optional[str] = None,
+                 pool_size: Optional[int] = None, pool_size_per_host: Optional[int] = None,
+                 cache: Optional[CacheBackend] = None, scheduler: Optional[HostScheduler] = None,
+                 token_pool: Optional[GitHubTokenPool] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+                 max_body_bytes: Optional[int] = None):
+        """
+        Initialize the HTTP client.
+
+        Args:
+            timeout: Total request timeout in seconds. If None, uses the value from config.
+            user_agent: User-Agent header to send. If None, uses the value from config.
+            pool_size: Maximum number of open connections. If None, uses the value from config.
+            pool_size_per_host: Maximum number of open connections per host.
+                                If None, uses the value from config.
+            cache: Backend for conditional-request caching. If None, responses
+                   are not cached.
+            scheduler: Per-host request scheduler. If None, requests are not paced.
+            token_pool: GitHub tokens to authenticate GitHub requests with.
+            retry_policy: Backoff for transient failures. If None, uses the
+                          defaults from config.
+            circuit_breakers: Per-host circuit breakers. If None, uses the
+                              defaults from config.
+            max_body_bytes: Default limit on decompressed response bodies; zero
+                            or less disables it. If None, uses the value from config.
+        """
+        self.cache = cache
+        self.scheduler = scheduler
+        self.token_pool = token_pool
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breakers = circuit_breakers or CircuitBreakerRegistry()
+        self.max_body_bytes = (max_body_bytes if max_body_bytes is not None
+                               else config['crawler']['max_body_bytes'])
+        self.max_rate_limit_wait = config['rate_limit']['max_wait']
+        self.max_rate_limit_retries = config['rate_limit']['max_retries']
+        self.timeout = timeout if timeout is not None else config['crawler']['timeout'] / 1000
+        self.user_agent = user_agent or config['crawler']['user_agent']
+        self.pool_size = pool_size or config['crawler']['connection_pool_size']
+        self.pool_size_per_host = pool_size_per_host or config['crawler']['connection_pool_size_per_host']
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._users = 0
+
+    async def __aenter__(self) -> 'HttpClient':
+        self._users += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._users -= 1
+        if self._users <= 0:
+            self._users = 0
+            await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the session for the running event loop, creating it if needed.
+
+        Returns:
+            An open aiohttp session.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size_per_host,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'User-Agent': self.user_agent},
+            )
+            self._loop = loop
+        return self._session
+
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      raise_for_status: bool = True, max_body: Optional[int] = None,
+                      **kwargs) -> HttpResponse:
+        """
+        Send an HTTP request and read the full response.
+
+        Requests wait for a slot from the host scheduler, GitHub requests carry
+        a token from the pool, and rate-limited responses (403/429 with an
+        exhausted quota or a Retry-After header) are retried once the limit
+        allows, on another token where possible. Transient failures are retried
+        with backoff and counted by the host's circuit breaker.
+
+        Args:
+            method: HTTP method.
+            url: URL to request.
+            headers: Optional extra request headers.
+            raise_for_status: If True, raise HttpError for 4xx/5xx responses.
+            max_body: Stop reading the body after this many bytes and mark the
+                      response truncated. If None, uses the client's limit.
+            **kwargs: Extra arguments passed to ``aiohttp.ClientSession.request``.
+
+        Returns:
+            The response.
+
+        Raises:
+            CircuitOpenError: If the host's circuit breaker is open.
+            HttpError: If the request fails, or returns an error status and
+                       raise_for_status is True.
+        """
+        host = urlparse(url).hostname or ''
+        limit = self.max_body_bytes if max_body is None else max_body
+        use_pool = (self.token_pool is not None and self.token_pool.applies_to(host)
+                    and not any(key.lower() == 'authorization' for key in (headers or {})))
+        breaker = self.circuit_breakers.get(host)
+        attempts = 0
+        rate_limit_retries = 0
+
+        while True:
+            if not breaker.allow_request():
+                raise CircuitOpenError(f"{method} {url} refused: circuit open for {host}", url)
+
+            request_headers = dict(headers or {})
+            token = None
+            if use_pool:
+                try:
+                    token = await self.token_pool.acquire()
+                except RateLimitExceeded as e:
+                    raise HttpError(str(e), url, 429) from e
+                request_headers['Authorization'] = f"Bearer {token}"
+
+            if self.scheduler is not None:
+                await self.scheduler.acquire(host)
+
+            attempts += 1
+            try:
+                result = await self._send(method, url, request_headers, limit, **kwargs)
+            except HttpError:
+                breaker.record_failure()
+                if attempts >= self.retry_policy.max_attempts:
+                    raise
+                await self._backoff(url, attempts, 'request failed')
+                continue
+
+            if result.status >= 500 or result.status == 408:
+                breaker.record_failure()
+                if attempts < self.retry_policy.max_attempts:
+                    await self._backoff(url, attempts, f"HTTP {result.status}")
+                    continue
+                break
+
+            breaker.record_success()
+
+            if token is not None:
+                self.token_pool.update(token, result.headers)
+
+            delay = self._rate_limit_delay(result, host, token)
+            if (delay is None or rate_limit_retries >= self.max_rate_limit_retries
+                    or delay > self.max_rate_limit_wait):
+                break
+
+            rate_limit_retries += 1
+            logger.info(f"Rate limited by {host} (HTTP {result.status}), retry {rate_limit_retries} in {delay:.1f}s")
+            if self.scheduler is not None:
+                self.scheduler.defer(host, delay)
+            elif delay > 0:
+                await asyncio.sleep(delay)
+
+        if raise_for_status and not result.ok:
+            raise HttpError(f"{method} {url} returned HTTP {result.status}", url, result.status)
+
+        return result
+
+    async def _backoff(self, url: str, attempts: int, reason: str) -> None:
+        """
+        Sleep before retrying a failed attempt.
+        """
+        delay = self.retry_policy.backoff(attempts)
+        logger.info(f"Retrying {url} after {reason} (attempt {attempts + 1}) in {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+    async def _send(self, method: str, url: str, headers: Dict[str, str],
+                    max_body: int, **kwargs) -> HttpResponse:
+        """
+        Send a single request attempt, reading at most max_body bytes of the body.
+
+        Raises:
+            HttpError: If no response was received.
+        """
+        session = self._get_session()
+
+        try:
+            async with session.request(method, url, headers=headers, **kwargs) as response:
+                body = bytearray()
+                truncated = False
+                # The stream yields decompressed data, so the limit applies to
+                # what ends up in memory rather than to bytes on the wire
+                async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+                    body += chunk
+                    if 0 < max_body <= len(body):
+                        truncated = len(body) > max_body or not response.content.at_eof()
+                        del body[max_body:]
+                        break
+
+                if truncated:
+                    logger.warning(f"Response from {url} exceeded {max_body} bytes, truncated")
+
+                return HttpResponse(
+                    url=str(response.url),
+                    status=response.status,
+                    headers=response.headers,
+                    body=bytes(body),
+                    truncated=truncated,
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise HttpError(f"{method} {url} failed: {e!r}", url) from e
+
+    def _rate_limit_delay(self, response: HttpResponse, host: str,
+                          token: Optional[str]) -> Optional[float]:
+        """
+        Work out whether a response was rate limited and how long to back off.
+
+        Args:
+            response: The response.
+            host: Host the request went to.
+            token: Pool token the request carried, if any.
+
+        Returns:
+            Seconds to wait before retrying, or None if not rate limited.
+        """
+        if response.status not in (403, 429):
+            return None
+
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        if retry_after is not None:
+            return retry_after
+
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            try:
+                reset_at = float(response.headers.get('X-RateLimit-Reset', '0'))
+            except ValueError:
+                reset_at = 0.0
+
+            if token is not None:
+                # Rotate: the pool skips this token, or waits for the earliest reset
+                self.token_pool.mark_exhausted(token, reset_at)
+                return 0.0
+            return max(0.0, reset_at - time.time())
+
+        if response.status == 429:
+            return 1.0
+
+        return None
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+                  raise_for_status: bool = True, use_cache: bool = True,
+                  max_body: Optional[int] = None, **kwargs) -> HttpResponse:
+        """
+        Send a GET request, revalidating against the HTTP cache if configured.
+
+        Args:
+            url: URL to request.
+            headers: Optional extra request headers.
+            raise_for_status: If True, raise HttpError for 4xx/5xx responses.
+            use_cache: If False, bypass the HTTP cache for this request.
+            max_body: Stop reading the body after this many bytes. If None, uses
+                      the client's limit. Truncated bodies are never cached, and
+                      a limited request bypasses the cache entirely.
+            **kwargs: Extra arguments passed to ``request``.
+
+        Returns:
+            The response. If the server answered 304, the cached body is
+            returned with status 200 and ``not_modified`` set.
+        """
+        if self.cache is None or not use_cache or max_body is not None:
+            return await self.request('GET', url, headers=headers,
+                                      raise_for_status=raise_for_status,
+                                      max_body=max_body, **kwargs)
+
+        cache_key = f"http:{url}"
+        entry = await self._read_cache(cache_key)
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        response = await self.request('GET', url, headers=request_headers,
+                                      raise_for_status=False, **kwargs)
+
+        if response.status == 304 and entry:
+            logger.debug(f"Not modified, serving from cache: {url}")
+            return HttpResponse(
+                url=response.url,
+                status=200,
+                headers=entry.get('headers', {}),
+                body=base64.b64decode(entry['body']),
+                not_modified=True,
+            )
+
+        if raise_for_status and not response.ok:
+            raise HttpError(f"GET {url} returned HTTP {response.status}", url, response.status)
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status == 200 and not response.truncated and (etag or last_modified):
+            await self._write_cache(cache_key, {
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'headers': {
+                    key: value for key, value in response.headers.items()
+                    if key.lower() in ('content-type', 'etag', 'last-modified')
+                },
+                'body': base64.b64encode(response.body).decode('ascii'),
+            })
+
+        return response
+
+    async def _read_cache(self, key: str) -> Optional[Dict]:
+        """
+        Read a cache record, treating backend errors as a miss.
+        """
+        try:
+            return await self.cache.get(key)
+        except Exception as e:
+            logger.warning(f"Error reading HTTP cache: {str(e)}")
+            return None
+
+    async def _write_cache(self, key: str, value: Dict) -> None:
+        """
+        Write a cache record, logging and ignoring backend errors.
+        """
+        try:
+            await self.cache.set(key, value)
+        except Exception as e:
+            logger.warning(f"Error writing HTTP cache: {str(e)}")
+
+    async def get_text(self, url: str, headers: Optional[Dict[str, str]] = None,
+                       max_bytes: Optional[int] = None) -> str:
+        """
+        Fetch a URL and return its body as text.
+
+        Args:
+            url: URL to fetch.
+            headers: Optional extra request headers.
+            max_bytes: Stop reading after this many bytes. If None, uses the
+                       client's limit.
+
+        Returns:
+            Response body as a string.
+        """
+        response = await self.get(url, headers=headers, max_body=max_bytes)
+        return response.text
+
+    async def close(self) -> None:
+        """
+        Close the underlying session, if open.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+_http_client: Optional[HttpClient] = None
+
+
+def get_http_client() -> HttpClient:
+    """
+    Get the shared HTTP client.
+
+    Returns:
+        The process-wide HttpClient instance.
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = HttpClient(
+            cache=get_cache_backend(),
+            scheduler=HostScheduler(),
+            token_pool=GitHubTokenPool(get_github_tokens()),
+        )
+    return _http_client
+
+
+def fetch_text_sync(url: str, headers: Optional[Dict[str, str]] = None,
+                    max_bytes: Optional[int] = None) -> str:
+    """
+    Fetch a URL with the shared client from synchronous code.
+
+    Args:
+        url: URL to fetch.
+        headers: Optional extra request headers.
+        max_bytes: Stop reading after this many bytes. If None, uses the
+                   client's limit.
+
+    Returns:
+        Response body as a string.
+    """
+    async def _fetch() -> str:
+        async with get_http_client() as client:
+            return await client.get_text(url, headers=headers, max_bytes=max_bytes)
+
+    return asyncio.run(_fetch())
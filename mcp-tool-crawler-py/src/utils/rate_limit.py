@@ -0,0 +1,321 @@
+"""
+Rate limiting for outgoing crawler requests.
+
+Provides a per-host token-bucket scheduler shared by all crawlers, and a pool of
+GitHub tokens that requests are spread across according to the rate-limit
+headers GitHub returns.
+"""
+
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, List, Mapping, Optional
+from urllib.parse import urlparse
+
+from .config import get_config
+from .logging import get_logger
+
+logger = get_logger(__name__)
+config = get_config()
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when a request cannot be made without waiting longer than allowed.
+    """
+
+    def __init__(self, message: str, retry_at: float):
+        """
+        Initialize the error.
+
+        Args:
+            message: Error message.
+            retry_at: Epoch seconds after which the request may succeed.
+        """
+        super().__init__(message)
+        self.retry_at = retry_at
+
+
+class TokenBucket:
+    """
+    Token bucket that paces callers to a steady rate with bounded bursts.
+
+    Callers reserve a slot synchronously and then sleep until it comes due, so
+    no lock is needed and concurrent callers are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second. A rate of zero or less disables limiting.
+            burst: Maximum tokens the bucket can hold.
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stop handing out tokens for a while, e.g. after a Retry-After response.
+
+        Args:
+            seconds: How long to pause for.
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def reserve(self) -> float:
+        """
+        Reserve a token.
+
+        Returns:
+            Seconds the caller must wait before using the token.
+        """
+        now = time.monotonic()
+        pause_wait = max(0.0, self._paused_until - now)
+
+        if self.rate <= 0:
+            return pause_wait
+
+        self._refill(now)
+        self._tokens -= 1
+        deficit_wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        return max(pause_wait, deficit_wait)
+
+    async def acquire(self) -> None:
+        """
+        Wait until a token is available and take it.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class HostScheduler:
+    """
+    Per-host request scheduler.
+
+    Each host gets its own token bucket, so a slow politeness limit on one
+    website does not hold back requests to others.
+    """
+
+    def __init__(self, default_rate: Optional[float] = None, default_burst: Optional[int] = None,
+                 host_rates: Optional[Mapping[str, float]] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            default_rate: Requests per second for hosts without a specific limit.
+                          If None, uses the value from config.
+            default_burst: Burst size for every host. If None, uses the value from config.
+            host_rates: Requests per second for specific hosts. If None, GitHub
+                        hosts get the GitHub limit from config.
+        """
+        self.default_rate = default_rate if default_rate is not None else config['rate_limit']['host_rate']
+        self.default_burst = default_burst or config['rate_limit']['host_burst']
+        if host_rates is None:
+            host_rates = {host: config['rate_limit']['github_rate'] for host in github_hosts()}
+        self.host_rates = dict(host_rates)
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate = self.host_rates.get(host, self.default_rate)
+            bucket = TokenBucket(rate, self.default_burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    async def acquire(self, host: str) -> None:
+        """
+        Wait for a request slot on a host.
+
+        Args:
+            host: Host name.
+        """
+        await self._bucket(host).acquire()
+
+    def defer(self, host: str, seconds: float) -> None:
+        """
+        Hold back all requests to a host for a while.
+
+        Args:
+            host: Host name.
+            seconds: How long to hold requests back for.
+        """
+        logger.info(f"Deferring requests to {host} for {seconds:.1f}s")
+        self._bucket(host).pause(seconds)
+
+
+class _TokenState:
+    __slots__ = ('token', 'remaining', 'reset_at')
+
+    def __init__(self, token: str):
+        self.token = token
+        # Unknown until the first response carrying rate-limit headers
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+
+
+class GitHubTokenPool:
+    """
+    Pool of GitHub tokens that requests are spread across.
+
+    Every request takes the token with the most remaining quota, and the quota
+    is updated from the ``X-RateLimit-*`` headers of each response. Once every
+    token is exhausted, callers wait for the earliest reset.
+    """
+
+    def __init__(self, tokens: Iterable[str], hosts: Optional[Iterable[str]] = None,
+                 max_wait: Optional[float] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            tokens: GitHub tokens. Empty and duplicate tokens are ignored.
+            hosts: Hosts the tokens are sent to. If None, uses the GitHub hosts from config.
+            max_wait: Longest time in seconds to wait for a quota reset before
+                      failing. If None, uses the value from config.
+        """
+        unique = list(dict.fromkeys(token.strip() for token in tokens if token and token.strip()))
+        self._states = [_TokenState(token) for token in unique]
+        self._by_token = {state.token: state for state in self._states}
+        self.hosts = set(hosts) if hosts is not None else github_hosts()
+        self.max_wait = max_wait if max_wait is not None else config['rate_limit']['max_wait']
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def applies_to(self, host: str) -> bool:
+        """
+        True if requests to this host should carry a pool token.
+
+        Args:
+            host: Host name.
+        """
+        return bool(self._states) and host in self.hosts
+
+    def _available(self, now: float) -> List[_TokenState]:
+        return [state for state in self._states
+                if state.remaining is None or state.remaining > 0 or state.reset_at <= now]
+
+    async def acquire(self) -> str:
+        """
+        Take the token with the most remaining quota, waiting for a reset if needed.
+
+        Returns:
+            A token.
+
+        Raises:
+            RateLimitExceeded: If every token is exhausted for longer than max_wait.
+        """
+        now = time.time()
+        available = self._available(now)
+
+        if not available:
+            state = min(self._states, key=lambda s: s.reset_at)
+            wait = state.reset_at - now
+            if wait > self.max_wait:
+                raise RateLimitExceeded(
+                    f"All {len(self._states)} GitHub tokens exhausted for {wait:.0f}s", state.reset_at
+                )
+            logger.info(f"All GitHub tokens exhausted, waiting {wait:.1f}s for reset")
+            await asyncio.sleep(max(0.0, wait))
+            state.remaining = None
+            return state.token
+
+        state = max(available, key=lambda s: float('inf') if s.remaining is None else s.remaining)
+        if state.remaining is not None:
+            if state.remaining <= 0:
+                # Its reset time has passed
+                state.remaining = None
+            else:
+                state.remaining -= 1
+        return state.token
+
+    def update(self, token: str, headers: Mapping[str, str]) -> None:
+        """
+        Record the quota reported by a response.
+
+        Args:
+            token: Token the request was made with.
+            headers: Response headers.
+        """
+        state = self._by_token.get(token)
+        if state is None:
+            return
+
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        try:
+            if remaining is not None:
+                state.remaining = int(remaining)
+            if reset is not None:
+                state.reset_at = float(reset)
+        except ValueError:
+            pass
+
+    def mark_exhausted(self, token: str, reset_at: float) -> None:
+        """
+        Take a token out of rotation until a given time.
+
+        Args:
+            token: The exhausted token.
+            reset_at: Epoch seconds when its quota resets.
+        """
+        state = self._by_token.get(token)
+        if state is not None:
+            state.remaining = 0
+            state.reset_at = max(state.reset_at, reset_at)
+
+
+def github_hosts() -> set:
+    """
+    Get the hosts GitHub tokens and limits apply to.
+
+    Returns:
+        Host names of the configured GitHub API, GraphQL and raw content URLs.
+    """
+    urls = [config['github']['api_url'], config['github']['graphql_url'], config['github']['raw_url']]
+    return {urlparse(url).hostname for url in urls if urlparse(url).hostname}
+
+
+def get_github_tokens() -> List[str]:
+    """
+    Get the configured GitHub tokens.
+
+    Returns:
+        Tokens from GITHUB_TOKENS (comma-separated) followed by GITHUB_TOKEN.
+    """
+    tokens = [token.strip() for token in config['github']['tokens'].split(',')]
+    tokens.append(config['github']['token'])
+    return [token for token in tokens if token]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header, given either in seconds or as an HTTP date.
+
+    Args:
+        value: Header value.
+
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,156 @@
+"""
+Retry and circuit-breaker primitives for crawler fetches.
+
+Transient failures of a single fetch are retried in-process with exponential
+backoff and full jitter, and a per-host circuit breaker stops sending requests
+to a host that keeps failing so it cannot tie up concurrency slots.
+"""
+
+import random
+import time
+from typing import Dict, Optional
+
+from .config import get_config
+from .logging import get_logger
+
+logger = get_logger(__name__)
+config = get_config()
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter.
+    """
+
+    def __init__(self, max_attempts: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts: Total attempts per fetch, including the first.
+                          If None, uses the value from config.
+            base_delay: Backoff before the first retry, in seconds.
+                        If None, uses the value from config.
+            max_delay: Upper bound on any single backoff, in seconds.
+                       If None, uses the value from config.
+        """
+        self.max_attempts = max(1, max_attempts if max_attempts is not None else config['retry']['max_attempts'])
+        self.base_delay = base_delay if base_delay is not None else config['retry']['base_delay']
+        self.max_delay = max_delay if max_delay is not None else config['retry']['max_delay']
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Get the delay before a retry.
+
+        Args:
+            attempt: Number of attempts made so far (1 after the first failure).
+
+        Returns:
+            Seconds to sleep, drawn uniformly from [0, min(max_delay, base_delay * 2^(attempt-1))].
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a single host.
+
+    Closed: requests flow. After ``failure_threshold`` consecutive failures the
+    circuit opens and requests fail immediately. Once ``reset_timeout`` has
+    passed it lets a single trial request through (half-open); success closes
+    it again, failure re-opens it.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds to stay open before allowing a trial request.
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent now.
+
+        Returns:
+            True if the request may go ahead.
+        """
+        if self.state == self.CLOSED:
+            return True
+
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+
+        return False
+
+    def record_success(self) -> None:
+        """
+        Record a successful request.
+        """
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """
+        Record a failed request.
+        """
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class CircuitBreakerRegistry:
+    """
+    One circuit breaker per host.
+    """
+
+    def __init__(self, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            failure_threshold: Consecutive failures that open a host's circuit.
+                               If None, uses the value from config.
+            reset_timeout: Seconds a circuit stays open. If None, uses the value from config.
+        """
+        self.failure_threshold = failure_threshold or config['retry']['circuit_failure_threshold']
+        self.reset_timeout = reset_timeout if reset_timeout is not None else config['retry']['circuit_reset_timeout']
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, host: str) -> CircuitBreaker:
+        """
+        Get the breaker for a host.
+
+        Args:
+            host: Host name.
+
+        Returns:
+            The host's circuit breaker.
+        """
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            self._breakers[host] = breaker
+        return breaker
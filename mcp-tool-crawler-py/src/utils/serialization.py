@@ -0,0 +1,95 @@
+"""
+JSON serialization for storage and Lambda responses.
+
+Models are serialized by pydantic's own serializer, which writes JSON straight
+from the model without building an intermediate dict. Plain values go through
+orjson when it is installed and the standard library otherwise. Output is
+always compact UTF-8, so both paths produce the same bytes for the same data.
+"""
+
+import json
+from typing import Any, Dict, Union
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Serialize a JSON-compatible value.
+
+    Args:
+        value: Value made of dicts, lists, strings, numbers, booleans and None.
+
+    Returns:
+        Compact UTF-8 JSON.
+    """
+    if orjson is not None:
+        # Like json, accept str subclasses (such as header names) and scalars as keys
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return _encoder.encode(value).encode('utf-8')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Deserialize JSON.
+
+    Args:
+        data: JSON text or UTF-8 bytes.
+
+    Returns:
+        The decoded value.
+
+    Raises:
+        ValueError: If the data is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def model_to_json(model: BaseModel) -> bytes:
+    """
+    Serialize a model.
+
+    Args:
+        model: The model.
+
+    Returns:
+        Compact UTF-8 JSON of the model's fields.
+    """
+    return type(model).__pydantic_serializer__.to_json(model)
+
+
+def model_to_dict(model: BaseModel) -> Dict[str, Any]:
+    """
+    Convert a model to JSON-compatible values, e.g. for a Lambda response.
+
+    Args:
+        model: The model.
+
+    Returns:
+        The model's fields, with enums as their values.
+    """
+    return model.model_dump(mode='json')
+
+
+def record_to_json(record: Union[BaseModel, Dict[str, Any]]) -> bytes:
+    """
+    Serialize a model or a record already decoded from storage.
+
+    Args:
+        record: The model or record.
+
+    Returns:
+        Compact UTF-8 JSON.
+    """
+    if isinstance(record, BaseModel):
+        return model_to_json(record)
+    return dumps(record)
@@ -1,5 +1,7 @@
 """Pytest configuration file."""
+import json
 import os
+import re
 import sys
 import pytest
 
@@ -36,4 +38,127 @@ def test_crawler_strategy_data():
         "source_type": "website",
         "code": "def extract_tools(content):\n    return []",
         "version": "1.0.0"
-    }
\ No newline at end of file
+    }
+
+class _Route:
+    """A canned response served by the local test HTTP server."""
+
+    def __init__(self, status=200, body=b"", headers=None, delay=0.0):
+        self.status = status
+        self.body = body.encode("utf-8") if isinstance(body, str) else body
+        self.headers = headers or {}
+        self.delay = delay
+
+
+class LocalHTTPServer:
+    """A threaded HTTP server on localhost that serves registered routes."""
+
+    def __init__(self):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self):
+                import time
+
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                server.requests.append((self.command, self.path, dict(self.headers), body))
+
+                route = server.routes.get((self.command, self.path))
+                if callable(route):
+                    route = route(self.command, self.path, dict(self.headers), body)
+                if route is None:
+                    route = _Route(status=404, body=b"Not Found")
+
+                if route.delay:
+                    time.sleep(route.delay)
+
+                self.send_response(route.status)
+                for key, value in route.headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(route.body)))
+                self.end_headers()
+                self.wfile.write(route.body)
+
+            do_GET = _handle
+            do_POST = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        self.routes = {}
+        self.requests = []
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add(self, path, body=b"", status=200, headers=None, delay=0.0, method="GET"):
+        """Register a canned response for a path."""
+        self.routes[(method, path)] = _Route(status, body, headers, delay)
+
+    def add_handler(self, path, handler, method="GET"):
+        """Register a callable returning a route for a path."""
+        self.routes[(method, path)] = handler
+
+    def paths(self):
+        """Return the paths requested so far."""
+        return [path for _, path, _, _ in self.requests]
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def http_server():
+    """Return a local HTTP server that test code can register routes on."""
+    server = LocalHTTPServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def make_route():
+    """Return the route factory used by handler callables."""
+    return _Route
+
+
+REPOSITORY_PATTERN = re.compile(r'(r\d+): repository\(owner: "([^"]+)", name: "([^"]+)"\)')
+
+
+@pytest.fixture
+def graphql_server(http_server, make_route):
+    """A fake GraphQL endpoint serving READMEs for a set of repositories."""
+    repos = {}
+
+    def handler(method, path, headers, body):
+        query = json.loads(body)["query"]
+        data = {}
+        for alias, owner, name in REPOSITORY_PATTERN.findall(query):
+            repo = repos.get((owner, name))
+            if repo is None:
+                data[alias] = None
+                continue
+            data[alias] = {
+                "defaultBranchRef": {"name": repo["branch"]},
+                "pushedAt": "2026-10-01T00:00:00Z",
+                "readme0": None,
+                "readme1": {"text": repo["readme"], "isTruncated": False},
+            }
+        return make_route(body=json.dumps({"data": data}),
+                          headers={"Content-Type": "application/json"})
+
+    http_server.add_handler("/graphql", handler, method="POST")
+    http_server.repos = repos
+    return http_server
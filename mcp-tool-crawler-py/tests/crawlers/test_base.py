@@ -0,0 +1,66 @@
+"""Test module for the base crawler."""
+import asyncio
+import time
+from typing import List
+
+from src.crawlers.base import BaseCrawler
+from src.models import MCPTool, Source, SourceType
+from src.utils.http_client import HttpClient
+
+
+class SlowPageCrawler(BaseCrawler):
+    """Crawler that fetches a single page and reports one tool."""
+
+    async def discover_tools(self) -> List[MCPTool]:
+        await self.fetch_text(self.source.url)
+        return [MCPTool(
+            name="MCP Server",
+            description="An MCP server",
+            url=self.source.url,
+            source_url=self.source.url,
+        )]
+
+
+def make_source(url: str) -> Source:
+    return Source(url=url, name="Test", type=SourceType.WEBSITE, has_known_crawler=True)
+
+
+class TestBaseCrawler:
+    """Test the async crawler contract."""
+
+    def test_execute_sync_wrapper(self, http_server):
+        """Test that execute() runs the async crawl to completion."""
+        http_server.add("/page", "hello")
+        crawler = SlowPageCrawler(make_source(f"{http_server.url}/page"), HttpClient())
+
+        result = crawler.execute()
+
+        assert result.success
+        assert result.tools_discovered == 1
+
+    def test_failed_fetch_reports_error(self, http_server):
+        """Test that an HTTP error produces a failed CrawlResult."""
+        crawler = SlowPageCrawler(make_source(f"{http_server.url}/missing"), HttpClient())
+
+        result = crawler.execute()
+
+        assert not result.success
+        assert "404" in result.error
+
+    def test_crawls_overlap_on_shared_client(self, http_server):
+        """Test that concurrent crawls do not serialize on network I/O."""
+        http_server.add("/slow", "ok", delay=0.3)
+        client = HttpClient()
+        crawlers = [SlowPageCrawler(make_source(f"{http_server.url}/slow"), client)
+                    for _ in range(5)]
+
+        async def run_all():
+            async with client:
+                return await asyncio.gather(*(c.execute_async() for c in crawlers))
+
+        start = time.monotonic()
+        results = asyncio.run(run_all())
+        elapsed = time.monotonic() - start
+
+        assert all(result.success for result in results)
+        assert elapsed < 1.0
@@ -0,0 +1,68 @@
+"""Test module for keyword classification."""
+import pytest
+
+from src.crawlers.classifier import DEFAULT_TAXONOMY, KeywordClassifier, load_taxonomy
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return KeywordClassifier(DEFAULT_TAXONOMY)
+
+
+class TestKeywordClassifier:
+    """Test relevance and tag matching."""
+
+    def test_matches_whole_words_only(self, classifier):
+        """Test that short keywords do not match inside other words."""
+        result = classifier.classify("Google storage for a good drag and drop UI")
+
+        assert not result.relevant
+        assert result.tags == ["ui"]
+
+    def test_relevance_and_tags_in_one_scan(self, classifier):
+        """Test that a single scan yields the verdict and every tag."""
+        result = classifier.classify("MCP-server SDK in Go and C# with semantic search")
+
+        assert result.relevant
+        assert result.tags == ["c#", "go", "library", "search"]
+
+    def test_plural_and_prefixed_keywords(self, classifier):
+        """Test that plurals match and a longer keyword keeps its prefix's labels."""
+        assert classifier.classify("Useful AI tools").relevant
+
+        result = classifier.classify("Retrieval augmented generation with autonomous agents")
+        assert result.relevant
+        assert result.tags == ["agent", "rag"]
+
+    def test_overlapping_keywords(self):
+        """Test that keywords overlapping in the text are all matched."""
+        classifier = KeywordClassifier({"tags": {"a": ["ai context"], "b": ["context window"]}})
+
+        assert classifier.classify("an ai context window").tags == ["a", "b"]
+
+    def test_loads_taxonomy_file(self, tmp_path):
+        """Test that a taxonomy can be loaded from a YAML file."""
+        path = tmp_path / "taxonomy.yaml"
+        path.write_text("relevance: [widget]\ntags:\n  gadget: [gizmo]\nlanguages: [zig]\n")
+
+        classifier = KeywordClassifier(load_taxonomy(str(path)))
+        result = classifier.classify("A widget gizmo written in Zig")
+
+        assert result.relevant
+        assert result.tags == ["gadget", "zig"]
+
+    def test_batch_matches_single_classification(self, classifier):
+        """Test that a batch gives the same results as classifying one text at a time."""
+        texts = [
+            "MCP server\nfor Go",
+            "",
+            "İstanbul retrieval tool",
+            "A spreadsheet",
+            "vector store in Rust",
+        ]
+
+        batch = classifier.classify_batch(texts)
+
+        assert [(c.relevant, c.tags) for c in batch] == \
+            [(c.relevant, c.tags) for c in map(classifier.classify, texts)]
+        assert [c.relevant for c in batch] == [True, False, True, False, True]
@@ -0,0 +1,224 @@
+"""Test module for the GitHub awesome list crawler."""
+import asyncio
+import base64
+import json
+
+from src.crawlers.github_awesome_list import GitHubAwesomeListCrawler
+from src.crawlers.github_readme import ReadmeResolver
+from src.crawlers.incremental import LineDiff
+from src.models import Source, SourceType
+from src.utils.http_cache import LocalCacheBackend
+from src.utils.http_client import HttpClient
+
+README = "# Awesome MCP\n\n- [MCP Server](https://github.com/x/mcp-server) - An MCP server\n"
+
+
+def readme_api_body(owner, repo, branch, path, content=README):
+    return json.dumps({
+        "name": path.rsplit("/", 1)[-1],
+        "path": path,
+        "url": f"https://api.github.com/repos/{owner}/{repo}/contents/{path}?ref={branch}",
+        "download_url": f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}/{path}",
+        "content": base64.b64encode(content.encode()).decode(),
+        "encoding": "base64",
+    })
+
+
+def make_crawler(http_server, owner="octo", repo="awesome-mcp", resolver=None):
+    source = Source(url=f"https://github.com/{owner}/{repo}", name="Awesome",
+                    type=SourceType.GITHUB_AWESOME_LIST, has_known_crawler=True)
+    crawler = GitHubAwesomeListCrawler(source, HttpClient())
+    crawler.readme_resolver = resolver or ReadmeResolver(
+        api_url=http_server.url, raw_url=http_server.url, ttl_seconds=3600
+    )
+    return crawler
+
+
+class TestReadmeResolution:
+    """Test README location resolution and caching."""
+
+    def test_resolves_once_then_fetches_raw(self, http_server):
+        """Test that a repeat crawl makes exactly one raw request."""
+        http_server.add("/repos/octo/awesome-mcp/readme",
+                        readme_api_body("octo", "awesome-mcp", "master", "readme.md"))
+        http_server.add("/octo/awesome-mcp/master/readme.md", README)
+        resolver = ReadmeResolver(api_url=http_server.url, raw_url=http_server.url,
+                                  ttl_seconds=3600)
+
+        first = make_crawler(http_server, resolver=resolver).execute()
+        assert http_server.paths() == ["/repos/octo/awesome-mcp/readme"]
+
+        second = make_crawler(http_server, resolver=resolver).execute()
+        assert http_server.paths()[1:] == ["/octo/awesome-mcp/master/readme.md"]
+
+        assert first.tools_discovered == 1
+        assert second.tools_discovered == 1
+
+    def test_stale_location_is_re_resolved(self, http_server):
+        """Test that a 404 on a cached location triggers a fresh lookup."""
+        http_server.add("/repos/octo/awesome-mcp/readme",
+                        readme_api_body("octo", "awesome-mcp", "trunk", "docs/README.md"))
+        resolver = ReadmeResolver(api_url=http_server.url, raw_url=http_server.url,
+                                  ttl_seconds=3600)
+        make_crawler(http_server, resolver=resolver).execute()
+        location = resolver._locations[("octo", "awesome-mcp")]
+        location.branch = "main"
+
+        result = make_crawler(http_server, resolver=resolver).execute()
+
+        assert result.success
+        assert http_server.paths()[1:] == [
+            "/octo/awesome-mcp/main/docs/README.md",
+            "/repos/octo/awesome-mcp/readme",
+        ]
+        assert resolver._locations[("octo", "awesome-mcp")].branch == "trunk"
+
+    def test_missing_readme_fails(self, http_server):
+        """Test that a repository without a README fails the crawl."""
+        result = make_crawler(http_server).execute()
+
+        assert not result.success
+        assert "No README found" in result.error
+
+
+class TestContentDigest:
+    """Test skipping crawls of byte-identical content."""
+
+    def test_identical_readme_skips_parsing(self, http_server, mocker):
+        """Test that a README matching the stored digest is not parsed again."""
+        http_server.add("/repos/octo/awesome-mcp/readme",
+                        readme_api_body("octo", "awesome-mcp", "main", "README.md"))
+        http_server.add("/octo/awesome-mcp/main/README.md", README)
+        resolver = ReadmeResolver(api_url=http_server.url, raw_url=http_server.url,
+                                  ttl_seconds=3600)
+
+        first = make_crawler(http_server, resolver=resolver).execute()
+        assert first.tools_discovered == 1 and first.content_digest
+
+        crawler = make_crawler(http_server, resolver=resolver)
+        crawler.source.last_crawl_status = "success"
+        crawler.source.metadata["content_digest"] = first.content_digest
+        parse = mocker.spy(crawler, "_extract_tools_from_readme")
+        second = crawler.execute()
+
+        assert second.success and second.unchanged
+        assert second.tools_discovered == 0
+        assert second.content_digest == first.content_digest
+        parse.assert_not_called()
+
+    def test_changed_readme_is_parsed(self, http_server):
+        """Test that content differing from the stored digest is parsed."""
+        http_server.add("/repos/octo/awesome-mcp/readme",
+                        readme_api_body("octo", "awesome-mcp", "main", "README.md"))
+        crawler = make_crawler(http_server)
+        crawler.source.last_crawl_status = "success"
+        crawler.source.metadata["content_digest"] = crawler.compute_digest("# Old README\n")
+
+        result = crawler.execute()
+
+        assert not result.unchanged
+        assert result.tools_discovered == 1
+        assert result.content_digest == crawler.compute_digest(README)
+
+
+class TestReadmeParsing:
+    """Test extraction of tools from README content."""
+
+    def test_extracts_list_items_and_table_rows(self, http_server):
+        """Test that list items and table rows are parsed in document order."""
+        content = "\n".join([
+            "# Tools",
+            "| [Table MCP](https://github.com/t/table) | MCP server in a table |",
+            "  * [List MCP](https://github.com/l/list): - MCP client",
+            "- [Unrelated](https://github.com/u/u) - A spreadsheet",
+            "+ [Bare MCP](https://github.com/b/bare)",
+            "| [Empty](https://github.com/e/e) |",
+        ])
+
+        tools = make_crawler(http_server)._extract_tools_from_readme(content)
+
+        assert [(tool.name, tool.url, tool.description) for tool in tools] == [
+            ("Table MCP", "https://github.com/t/table", "MCP server in a table"),
+            ("List MCP", "https://github.com/l/list", "MCP client"),
+            ("Bare MCP", "https://github.com/b/bare", "Bare MCP"),
+        ]
+
+    def test_sections_become_tags(self, http_server):
+        """Test that headings and parent list items categorise nested entries."""
+        content = "\n".join([
+            "# Awesome",
+            "## MCP Servers",
+            "- **Databases**",
+            "  - [Postgres](https://github.com/p/pg) - Query a database",
+            "  - <a href=\"https://github.com/s/sqlite\">SQLite</a> - Local files",
+            "- [Reference][ref] - Referenced later",
+            "- [Contents](#mcp-servers)",
+            "",
+            "[ref]: https://github.com/r/ref",
+        ])
+
+        tools = make_crawler(http_server)._extract_tools_from_readme(content)
+
+        assert [(tool.name, tool.url) for tool in tools] == [
+            ("Postgres", "https://github.com/p/pg"),
+            ("SQLite", "https://github.com/s/sqlite"),
+            ("Reference", "https://github.com/r/ref"),
+        ]
+        assert tools[0].metadata["sections"] == ["MCP Servers", "Databases"]
+        assert {"mcp-servers", "databases"} <= set(tools[0].metadata["tags"])
+        assert tools[2].metadata["sections"] == ["MCP Servers"]
+
+
+class TestIncrementalParsing:
+    """Test re-parsing only the lines that changed since the last crawl."""
+
+    LINES = [
+        "## MCP Servers",
+        "- [Alpha](https://github.com/a/alpha) - MCP server",
+        "- [Beta](https://github.com/b/beta) - MCP client",
+        "- [Gamma](https://github.com/g/gamma) - MCP proxy",
+    ]
+
+    def test_unchanged_lines_are_carried_forward(self, http_server, mocker):
+        """Test that only added or changed lines are classified again."""
+        crawler = make_crawler(http_server)
+        previous = LineDiff(None, crawler.parse_signature())
+        crawler._extract_tools_from_readme("\n".join(self.LINES), previous)
+        assert previous.new_tools == 3
+
+        lines = self.LINES[:2] + ["- [Beta](https://github.com/b/beta) - MCP client, now async",
+                                  "- [Delta](https://github.com/d/delta) - MCP gateway"]
+        diff = LineDiff(previous.state, crawler.parse_signature())
+        classify = mocker.spy(crawler, "classify_batch")
+        tools = crawler._extract_tools_from_readme("\n".join(lines), diff)
+
+        assert [tool.name for tool in tools] == ["Alpha", "Beta", "Delta"]
+        assert tools[0].metadata["sections"] == ["MCP Servers"]
+        assert sum(len(call.args[0]) for call in classify.call_args_list) == 2
+        assert (diff.new_tools, diff.updated_tools, diff.unchanged_tools) == (1, 1, 1)
+        assert len(diff.state.lines) == 3
+
+    def test_crawl_counts_come_from_the_diff(self, http_server, tmp_path):
+        """Test that a re-crawl reports new and updated tools from saved parse state."""
+        http_server.add("/repos/octo/awesome-mcp/readme",
+                        readme_api_body("octo", "awesome-mcp", "main", "README.md",
+                                        content="\n".join(self.LINES)))
+        resolver = ReadmeResolver(api_url=http_server.url, raw_url=http_server.url,
+                                  ttl_seconds=3600)
+        cache = LocalCacheBackend(str(tmp_path))
+
+        crawler = make_crawler(http_server, resolver=resolver)
+        crawler.http = HttpClient(cache=cache)
+        first = crawler.execute()
+        assert (first.new_tools, first.updated_tools) == (3, 0)
+        # Parse state is only saved once the tools are committed
+        asyncio.run(crawler.commit())
+
+        http_server.add("/octo/awesome-mcp/main/README.md",
+                        "\n".join(self.LINES[:3] + ["- [Gamma](https://github.com/g/gamma) - MCP proxy v2"]))
+        crawler = make_crawler(http_server, resolver=resolver)
+        crawler.http = HttpClient(cache=cache)
+        second = crawler.execute()
+
+        assert second.tools_discovered == 3
+        assert (second.new_tools, second.updated_tools) == (0, 1)
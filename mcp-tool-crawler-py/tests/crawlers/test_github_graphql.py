@@ -0,0 +1,47 @@
+"""Test module for batched GitHub GraphQL fetching."""
+import asyncio
+
+from src.crawlers.github_graphql import GitHubGraphQLBatcher, repo_key
+from src.utils.http_client import HttpClient
+from src.utils.rate_limit import GitHubTokenPool
+
+
+class TestGitHubGraphQLBatcher:
+    """Test grouping repositories into GraphQL queries."""
+
+    def test_fetches_in_batches(self, graphql_server):
+        """Test that repositories are grouped batch_size per request."""
+        for i in range(5):
+            graphql_server.repos[("octo", f"repo{i}")] = {"branch": "main", "readme": f"# {i}"}
+        batcher = GitHubGraphQLBatcher(graphql_url=f"{graphql_server.url}/graphql",
+                                       batch_size=2)
+        pool = GitHubTokenPool(["test-token"], hosts={"127.0.0.1"})
+
+        async def fetch():
+            async with HttpClient(token_pool=pool) as client:
+                return await batcher.fetch_all(
+                    client, [("octo", f"repo{i}") for i in range(5)] + [("octo", "missing")]
+                )
+
+        snapshots = asyncio.run(fetch())
+
+        assert len(graphql_server.requests) == 3
+        assert graphql_server.requests[0][2]["Authorization"] == "Bearer test-token"
+        assert len(snapshots) == 5
+        snapshot = snapshots[repo_key("Octo", "REPO3")]
+        assert snapshot.readme_text == "# 3"
+        assert snapshot.readme_path == "readme.md"
+        assert snapshot.default_branch == "main"
+        assert snapshot.pushed_at == "2026-10-01T00:00:00Z"
+
+    def test_disabled_without_token(self, graphql_server):
+        """Test that no queries are sent without a token."""
+        batcher = GitHubGraphQLBatcher(graphql_url=f"{graphql_server.url}/graphql",
+                                       batch_size=2)
+
+        async def fetch():
+            async with HttpClient() as client:
+                return await batcher.fetch_all(client, [("octo", "repo")])
+
+        assert asyncio.run(fetch()) == {}
+        assert graphql_server.requests == []
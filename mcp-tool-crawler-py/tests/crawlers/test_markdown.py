@@ -0,0 +1,85 @@
+"""Test module for streaming Markdown parsing."""
+import io
+
+from src.crawlers.markdown import KnownEntry, MarkdownListParser, iter_markdown_entries
+
+
+def parse(text):
+    return [(entry.name, entry.url, entry.description, entry.sections)
+            for entry in iter_markdown_entries(io.StringIO(text))]
+
+
+class TestMarkdownListParser:
+    """Test the line-by-line Markdown parser."""
+
+    def test_yields_entries_as_lines_arrive(self):
+        """Test that an entry is produced by the line that completes it."""
+        parser = MarkdownListParser()
+
+        assert parser.feed("## Tools\n") is None
+        entry = parser.feed("- [Tool](https://example.com/tool) - Does things\n")
+
+        assert (entry.name, entry.description, entry.sections) == ("Tool", "Does things", ("Tools",))
+
+    def test_skips_code_blocks_and_relative_links(self):
+        """Test that fenced code and in-page or relative links are ignored."""
+        entries = parse("\n".join([
+            "```markdown",
+            "- [Example](https://example.com/in-code)",
+            "```",
+            "- [Contents](#contents)",
+            "- [Guide](docs/guide.md)",
+            "- [Real](https://example.com/real)",
+        ]))
+
+        assert [name for name, _, _, _ in entries] == ["Real"]
+
+    def test_setext_headings_and_nesting(self):
+        """Test setext headings and categories from link-less parent items."""
+        entries = parse("\n".join([
+            "Servers",
+            "-------",
+            "1. Storage",
+            "    * [Files](https://example.com/files)",
+            "2. [Git](https://example.com/git)",
+            "Closing paragraph.",
+            "- [After](https://example.com/after)",
+        ]))
+
+        assert [(name, sections) for name, _, _, sections in entries] == [
+            ("Files", ("Servers", "Storage")),
+            ("Git", ("Servers",)),
+            ("After", ("Servers",)),
+        ]
+
+    def test_reference_links_resolved_at_end(self):
+        """Test that reference links defined after use are yielded once resolved."""
+        entries = parse("\n".join([
+            "- [Early][e] first",
+            "- [Inline](https://example.com/inline)",
+            "- [Undefined][nope]",
+            "",
+            "[E]: https://example.com/early",
+        ]))
+
+        assert [(name, url) for name, url, _, _ in entries] == [
+            ("Inline", "https://example.com/inline"),
+            ("Early", "https://example.com/early"),
+        ]
+
+    def test_known_lines_are_not_parsed_again(self):
+        """Test that lines with a known key under the same sections are skipped."""
+        text = "\n".join([
+            "## Tools",
+            "- [Tool](https://example.com/tool) - Does things",
+            "## Other",
+            "- [Tool](https://example.com/tool) - Does things",
+        ])
+        first = list(iter_markdown_entries(io.StringIO(text)))
+        assert first[0].key != first[1].key
+
+        again = list(iter_markdown_entries(io.StringIO(text), known={first[0].key}))
+
+        assert isinstance(again[0], KnownEntry)
+        assert (again[0].key, again[0].sections) == (first[0].key, ("Tools",))
+        assert again[1].name == "Tool" and again[1].key == first[1].key
@@ -1,6 +1,7 @@
 """Test module for models."""
 import pytest
 from typing import Dict, Any
+from pydantic import VERSION as PYDANTIC_VERSION
 from src.models import Source, MCPTool, CrawlerStrategy, CrawlResult, SourceType
 
 class TestSource:
@@ -42,6 +43,65 @@ class TestMCPTool:
         assert tool.id is not None  # Should generate an ID
         assert tool.first_discovered is not None
         assert tool.last_updated is not None
+    
+    def test_mcp_tool_id_is_derived_from_url(self):
+        """Test that the same canonical URL always gives the same ID."""
+        first = MCPTool(name="A", description="A", url="https://github.com/example/mcp-tool",
+                        source_url="https://github.com/awesome/one")
+        second = MCPTool(name="B", description="B", url="http://www.github.com/Example/mcp-tool/",
+                         source_url="https://github.com/awesome/two")
+        given = MCPTool(id="tool-123", name="C", description="C", url=first.url,
+                        source_url=first.source_url)
+        
+        assert first.id == second.id
+        assert first.id.startswith("tool-")
+        assert given.id == "tool-123"
+    
+    def test_mcp_tool_from_stored_records(self):
+        """Test that stored records build the same tools without validation."""
+        stored = MCPTool(name="A", description="A", url="https://github.com/example/mcp-tool",
+                         source_url="https://github.com/awesome/one", metadata={"tags": ["api"]}).model_dump()
+        partial = {"name": "B", "description": "B", "url": "https://github.com/example/other",
+                   "source_url": "https://github.com/awesome/one"}
+        
+        full, filled = MCPTool.bulk_from_stored([stored, partial])
+        
+        assert full == MCPTool(**stored)
+        assert filled.id == MCPTool(**partial).id
+        assert filled.first_discovered == filled.last_updated
+        with pytest.raises(ValueError):
+            MCPTool.from_stored({"name": "C", "url": "https://github.com/example/c"})
+    
+    @pytest.mark.parametrize("record", [
+        {"metadata": {"tags": ["api"]}, "source_url": "https://github.com/awesome/one", "name": "A",
+         "description": "A", "url": "https://github.com/example/mcp-tool", "id": "tool-a",
+         "first_discovered": "2024-01-01T00:00:00", "last_updated": "2024-01-02T00:00:00"},
+        {"name": "B", "description": "B", "url": "https://github.com/example/other",
+         "source_url": "https://github.com/awesome/one"},
+    ])
+    def test_mcp_tool_from_stored_matches_validation(self, record):
+        """Test that from_stored() builds what validation builds on the installed pydantic."""
+        # from_stored() relies on pydantic 2's model_construct() semantics
+        assert PYDANTIC_VERSION.startswith("2."), f"Unsupported pydantic {PYDANTIC_VERSION}"
+        timestamps = {"first_discovered": "2024-01-01T00:00:00", "last_updated": "2024-01-01T00:00:00"}
+        
+        trusted = MCPTool.from_stored(record, timestamps["first_discovered"])
+        validated = MCPTool.model_validate(record)
+        if "first_discovered" not in record:
+            # Validation fills in the current time instead of the given one
+            validated = validated.model_copy(update=timestamps)
+        
+        for name in MCPTool.model_fields:
+            assert getattr(trusted, name) == getattr(validated, name), name
+        assert trusted.model_fields_set == MCPTool.model_validate(record).model_fields_set
+        assert list(trusted.model_dump().items()) == list(validated.model_dump().items())
+        assert trusted.model_dump_json() == validated.model_dump_json()
+        assert trusted.model_dump(exclude_unset=True) == MCPTool.model_validate(record).model_dump(exclude_unset=True)
+        assert trusted == validated
+        assert (trusted.__pydantic_extra__, trusted.__pydantic_private__) == (
+            validated.__pydantic_extra__, validated.__pydantic_private__)
+        trusted.name = "Renamed"
+        assert trusted.model_copy(update={"description": "Changed"}).name == "Renamed"
 
 class TestCrawlerStrategy:
     """Test the CrawlerStrategy model."""
@@ -0,0 +1,70 @@
+"""Test module for the in-memory catalog index."""
+from src.models import MCPTool
+from src.services.catalog_index import CatalogIndex
+
+
+def tool(url, description="An MCP server", source="https://github.com/octo/awesome"):
+    return MCPTool(name="Tool", description=description, url=url, source_url=source)
+
+
+class TestCatalogIndex:
+    """Test classifying discovered tools against the catalog."""
+
+    def test_new_updated_and_unchanged(self):
+        """Test that each tool is matched by canonical URL and content hash."""
+        stored = [tool("https://github.com/a/one"), tool("https://github.com/b/two")]
+        index = CatalogIndex(stored)
+
+        crawled = [
+            tool("https://github.com/A/One/"),
+            tool("https://github.com/b/two", description="Rewritten"),
+            tool("https://github.com/c/three"),
+        ]
+        changes = index.apply("https://github.com/octo/awesome", crawled)
+
+        assert [t.url for t in changes.new] == ["https://github.com/c/three"]
+        assert [t.id for t in changes.updated] == [stored[1].id]
+        assert changes.unchanged == 1 and changes.removed == []
+
+        upserted, removed = index.take_changes()
+        assert {t.url for t in upserted} == {"https://github.com/b/two", "https://github.com/c/three"}
+        assert removed == [] and index.take_changes() == ([], [])
+
+    def test_removed_once_no_source_lists_it(self):
+        """Test that a tool is only removed when every source has dropped it."""
+        first, second = "https://github.com/octo/first", "https://github.com/octo/second"
+        shared = tool("https://github.com/a/shared", source=first)
+        index = CatalogIndex([shared, tool("https://github.com/a/shared", source=second)])
+
+        assert index.apply(first, []).removed == []
+        assert "https://github.com/a/shared" in index
+
+        assert index.apply(second, []).removed == [shared.id]
+        assert "https://github.com/a/shared" not in index
+        assert index.take_changes() == ([], [shared.id])
+
+    def test_sources_survive_across_runs(self):
+        """Test that a tool dropped by one of two sources is kept by the other in later runs."""
+        first, second = "https://github.com/octo/first", "https://github.com/octo/second"
+        stored = {}
+
+        def run(crawls):
+            index = CatalogIndex(stored.values())
+            for source_url, tools in crawls:
+                index.apply(source_url, tools)
+            upserted, removed = index.take_changes()
+            stored.update((t.id, t) for t in upserted)
+            for tool_id in removed:
+                del stored[tool_id]
+
+        run([(first, [tool("https://github.com/a/shared", source=first)]),
+             (second, [tool("https://github.com/a/shared", source=second)])])
+        [shared] = stored.values()
+        assert shared.metadata["sources"] == [first, second]
+
+        run([(first, [])])
+        [shared] = stored.values()
+        assert shared.metadata["sources"] == [second]
+
+        run([(second, [])])
+        assert stored == {}
@@ -0,0 +1,66 @@
+"""Test module for the catalog query engine."""
+import asyncio
+import random
+
+from src.models import MCPTool
+from src.services.catalog_query import CatalogQuery, intersect
+from src.storage.local_storage import LocalStorage
+
+SOURCE = "https://github.com/octo/awesome"
+
+
+def tool(name, tags=(), source_url=SOURCE, sources=()):
+    return MCPTool(name=name, description="An MCP server", url=f"https://github.com/a/{name.lower()}",
+                   source_url=source_url, metadata={"tags": list(tags), "sources": list(sources)})
+
+
+def names(tools):
+    return [t.name for t in tools]
+
+
+class TestCatalogQuery:
+    """Test the inverted indexes and conjunctive queries."""
+
+    def test_conjunctive_tags_and_source(self):
+        """Test that every tag and the source must match."""
+        query = CatalogQuery([
+            tool("GitHub", ["git", "api"]),
+            tool("GitLab", ["git"], source_url="https://github.com/other/list"),
+            tool("Stripe", ["api", "payments"], sources=["https://github.com/other/list"]),
+        ])
+
+        assert names(query.search(tags=["API"])) == ["GitHub", "Stripe"]
+        assert names(query.search(tags=["git", "api"])) == ["GitHub"]
+        assert names(query.search(tags=["git", "unknown"])) == []
+        assert names(query.search(source="https://github.com/other/list")) == ["GitLab", "Stripe"]
+        assert names(query.search(tags=["api"], source="https://github.com/other/list")) == ["Stripe"]
+        assert query.tag_counts() == {"api": 2, "git": 2, "payments": 1}
+
+    def test_name_substrings(self):
+        """Test substring name search, with and without trigrams to narrow it."""
+        query = CatalogQuery([tool("GitHub Server"), tool("Postgres"), tool("Git"), tool("PostHog")])
+
+        assert names(query.search(name="git")) == ["GitHub Server", "Git"]
+        assert names(query.search(name="hub serv")) == ["GitHub Server"]
+        assert names(query.search(name="po")) == ["Postgres", "PostHog"]
+        assert names(query.search(name="posting")) == []
+        assert names(query.search(name="post", limit=1)) == ["Postgres"]
+
+    def test_intersect_matches_sets(self):
+        """Test that sorted-array intersection agrees with set intersection."""
+        rng = random.Random(7)
+        for _ in range(50):
+            postings = [sorted(rng.sample(range(500), rng.randint(0, 200))) for _ in range(rng.randint(1, 4))]
+
+            expected = sorted(set.intersection(*(set(p) for p in postings)))
+            assert intersect(postings) == expected
+
+    def test_from_storage(self, tmp_path):
+        """Test that the indexes build from a stored catalog."""
+        storage = LocalStorage(str(tmp_path / "tools.json"))
+        asyncio.run(storage.save_tools([tool("GitHub", ["git"]), tool("Stripe", ["payments"])]))
+
+        query = asyncio.run(CatalogQuery.from_storage(storage))
+
+        assert len(query) == 2
+        assert names(query.search(tags=["payments"])) == ["Stripe"]
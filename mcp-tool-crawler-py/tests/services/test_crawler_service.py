@@ -0,0 +1,114 @@
+"""Test module for the crawler service."""
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.crawlers.github_awesome_list import GitHubAwesomeListCrawler
+from src.crawlers.github_graphql import GitHubGraphQLBatcher
+from src.models import Source, SourceType
+from src.services import crawler_service
+from src.storage import get_changelog
+from src.storage.local_storage import LocalStorage
+from src.utils.http_client import HttpClient
+from src.utils.rate_limit import GitHubTokenPool
+
+README = "- [MCP Server {i}](https://github.com/x/mcp-{i}) - An MCP server\n"
+
+
+@pytest.fixture
+def service(mocker, tmp_path):
+    """A CrawlerService with DynamoDB mocked out and a local tool catalog."""
+    source_manager = mocker.patch.object(crawler_service, "SourceManager").return_value
+    source_manager.update_source_last_crawl = AsyncMock(return_value=True)
+    source_manager.update_source_digest = AsyncMock(return_value=True)
+    mocker.patch.object(crawler_service, "get_storage")
+    service = crawler_service.CrawlerService()
+    service.storage = LocalStorage(str(tmp_path / "tools.json"))
+    service.http_client = HttpClient()
+    return service
+
+
+def github_source(i):
+    return Source(url=f"https://github.com/octo/awesome-{i}", name=f"Awesome {i}",
+                  type=SourceType.GITHUB_AWESOME_LIST, has_known_crawler=True)
+
+
+class TestCrawlAllSources:
+    """Test crawling many sources at once."""
+
+    def test_github_sources_use_batched_fetch(self, service, graphql_server):
+        """Test that GitHub sources are crawled from one batched query each."""
+        sources = [github_source(i) for i in range(3)]
+        for i in range(3):
+            graphql_server.repos[("octo", f"awesome-{i}")] = {
+                "branch": "main", "readme": README.format(i=i)
+            }
+        service.github_batcher = GitHubGraphQLBatcher(
+            graphql_url=f"{graphql_server.url}/graphql", batch_size=10
+        )
+        service.http_client.token_pool = GitHubTokenPool(["t"], hosts={"127.0.0.1"})
+        service.source_manager.get_sources_to_crawl = AsyncMock(return_value=sources)
+
+        results = asyncio.run(service.crawl_all_sources())
+
+        assert [result.tools_discovered for result in results] == [1, 1, 1]
+        assert graphql_server.paths() == ["/graphql"]
+
+    def test_content_digest_is_stored_on_source(self, service, graphql_server):
+        """Test that a successful crawl records the content digest on the source."""
+        source = github_source(0)
+        graphql_server.repos[("octo", "awesome-0")] = {"branch": "main", "readme": README.format(i=0)}
+        service.github_batcher = GitHubGraphQLBatcher(graphql_url=f"{graphql_server.url}/graphql")
+        service.http_client.token_pool = GitHubTokenPool(["t"], hosts={"127.0.0.1"})
+        service.source_manager.get_sources_to_crawl = AsyncMock(return_value=[source])
+
+        [result] = asyncio.run(service.crawl_all_sources())
+
+        assert result.content_digest
+        assert source.metadata["content_digest"] == result.content_digest
+        service.source_manager.update_source_last_crawl.assert_awaited_once_with(source.id, True)
+        service.source_manager.update_source_digest.assert_awaited_once_with(source.id, result.content_digest)
+
+    def test_source_state_waits_for_the_catalog(self, service, graphql_server, mocker):
+        """Test that neither the digest nor the parse state is saved when the catalog write fails."""
+        source = github_source(0)
+        graphql_server.repos[("octo", "awesome-0")] = {"branch": "main", "readme": README.format(i=0)}
+        service.github_batcher = GitHubGraphQLBatcher(graphql_url=f"{graphql_server.url}/graphql")
+        service.http_client.token_pool = GitHubTokenPool(["t"], hosts={"127.0.0.1"})
+        service.source_manager.get_sources_to_crawl = AsyncMock(return_value=[source])
+        mocker.patch.object(service.storage, "save_changes", AsyncMock(return_value=False))
+        commit = mocker.patch.object(GitHubAwesomeListCrawler, "commit", AsyncMock())
+
+        [result] = asyncio.run(service.crawl_all_sources())
+
+        assert result.success and result.content_digest
+        assert "content_digest" not in source.metadata
+        service.source_manager.update_source_digest.assert_not_awaited()
+        commit.assert_not_awaited()
+
+    def test_catalog_changes_are_counted_and_saved(self, service, graphql_server):
+        """Test that re-crawls count new, updated and removed tools against the catalog."""
+        source = github_source(0)
+        service.github_batcher = GitHubGraphQLBatcher(graphql_url=f"{graphql_server.url}/graphql")
+        service.http_client.token_pool = GitHubTokenPool(["t"], hosts={"127.0.0.1"})
+        service.source_manager.get_sources_to_crawl = AsyncMock(return_value=[source])
+
+        def crawl(readme):
+            graphql_server.repos[("octo", "awesome-0")] = {"branch": "main", "readme": readme}
+            [result] = asyncio.run(service.crawl_all_sources())
+            return (result.new_tools, result.updated_tools, result.removed_tools)
+
+        assert crawl(README.format(i=1) + README.format(i=2)) == (2, 0, 0)
+        stored = asyncio.run(service.storage.load_tools())
+        assert crawl(README.format(i=1) + README.format(i=2)) == (0, 0, 0)
+        assert crawl(README.format(i=1).replace("An MCP", "A better MCP")) == (0, 1, 1)
+
+        [tool] = asyncio.run(service.storage.load_tools())
+        assert tool.description == "A better MCP server"
+        assert tool.id == next(t.id for t in stored if t.url == tool.url)
+
+        # One change feed entry per run that changed the catalog
+        entries = asyncio.run(get_changelog(service.storage).since())
+        assert [(len(e["added"]), len(e["updated"]), len(e["removed"])) for e in entries] == [(2, 0, 0), (0, 1, 1)]
+        assert entries[1]["updated"] == [{"id": tool.id, "version": tool.last_updated}]
@@ -0,0 +1,100 @@
+"""Test module for near-duplicate detection."""
+import asyncio
+
+from src.models import MCPTool
+from src.services.catalog_index import CatalogIndex
+from src.services.dedup import Deduplicator, MinHasher, deduplicate_catalog
+from src.storage.local_storage import LocalStorage
+
+
+def tool(name, url, description, source="https://github.com/octo/awesome-a", tags=()):
+    return MCPTool(name=name, description=description, url=url, source_url=source,
+                   metadata={"tags": list(tags)})
+
+
+GITHUB = tool("Slack MCP", "https://github.com/acme/slack-mcp",
+              "MCP server for Slack: post messages, search channels and manage threads",
+              tags=["api"])
+NPM = tool("@acme/slack-mcp", "https://www.npmjs.com/package/@acme/slack-mcp",
+           "MCP server for Slack - post messages, search channels, manage threads.",
+           source="https://github.com/octo/awesome-b", tags=["library"])
+OTHER = tool("Jira MCP", "https://github.com/acme/jira-mcp",
+             "MCP server for Jira: create issues, search projects and manage sprints")
+
+
+class TestMinHasher:
+    """Test MinHash signatures."""
+
+    def test_similar_texts_agree_on_most_positions(self):
+        """Test that signature agreement tracks shingle similarity."""
+        hasher = MinHasher(64)
+        a = hasher.signature(hasher.shingles(GITHUB.description))
+        b = hasher.signature(hasher.shingles(NPM.description))
+        c = hasher.signature(hasher.shingles("A tool for editing spreadsheets offline"))
+
+        assert len(a) == 64
+        assert sum(x == y for x, y in zip(a, b)) > sum(x == y for x, y in zip(a, c))
+        assert hasher.signature(set()) is None
+
+
+class TestDeduplicator:
+    """Test clustering and merging duplicates."""
+
+    def test_merges_npm_and_github_listings(self):
+        """Test that a reworded npm listing merges into the GitHub record."""
+        result = Deduplicator(threshold=0.5, bands=16, rows=4).deduplicate([NPM, OTHER, GITHUB])
+
+        assert result.removed_ids == [NPM.id]
+        [merged] = result.merged
+        assert merged.id == GITHUB.id
+        assert merged.metadata["sources"] == ["https://github.com/octo/awesome-a",
+                                              "https://github.com/octo/awesome-b"]
+        assert merged.metadata["duplicate_urls"] == [NPM.url]
+        assert merged.metadata["tags"] == ["api", "library"]
+        assert [t.id for t in result.tools] == [OTHER.id, GITHUB.id]
+
+    def test_distinct_repositories_are_never_merged(self):
+        """Test that two GitHub repositories stay apart however similar."""
+        twin = tool("Slack MCP", "https://github.com/fork/slack-mcp", GITHUB.description)
+
+        assert Deduplicator().cluster([GITHUB, twin]) == []
+
+    def test_catalog_dedup_is_idempotent(self, tmp_path):
+        """Test that merged duplicates stay merged on re-crawl and re-run."""
+        storage = LocalStorage(str(tmp_path / "tools.json"))
+        asyncio.run(storage.save_tools([GITHUB, NPM, OTHER]))
+
+        first = asyncio.run(deduplicate_catalog(storage))
+        second = asyncio.run(deduplicate_catalog(storage))
+
+        assert len(first.removed_ids) == 1 and second.removed_ids == []
+        index = CatalogIndex(asyncio.run(storage.load_tools()))
+        changes = index.apply(NPM.source_url, [NPM])
+        assert (changes.new, changes.unchanged, changes.removed) == ([], 1, [])
+
+    def test_recrawl_keeps_merged_records(self, tmp_path):
+        """Test that a crawl after deduplication neither rewrites nor unmerges a record."""
+        storage = LocalStorage(str(tmp_path / "tools.json"))
+
+        def crawl(listings):
+            index = CatalogIndex(asyncio.run(storage.load_tools()))
+            for source_url, tools in listings.items():
+                index.apply(source_url, [t.model_copy(deep=True) for t in tools])
+            upserted, removed = index.take_changes()
+            if upserted or removed:
+                asyncio.run(storage.save_changes(upserted, removed))
+            return upserted, removed
+
+        listings = {GITHUB.source_url: [GITHUB, OTHER], NPM.source_url: [NPM]}
+        crawl(listings)
+        asyncio.run(deduplicate_catalog(storage, Deduplicator(threshold=0.5, bands=16, rows=4)))
+
+        assert crawl(listings) == ([], [])
+
+        reworded = GITHUB.model_copy(update={"description": GITHUB.description + " in real time"})
+        listings[GITHUB.source_url] = [reworded, OTHER]
+        [updated], _ = crawl(listings)
+        assert updated.metadata["duplicate_urls"] == [NPM.url]
+        assert updated.metadata["tags"] == ["api", "library"]
+        assert updated.metadata["sources"] == [GITHUB.source_url, NPM.source_url]
+        assert crawl(listings) == ([], [])
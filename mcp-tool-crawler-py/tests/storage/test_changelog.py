@@ -0,0 +1,126 @@
+"""Test module for the catalog change feed."""
+import asyncio
+
+import boto3
+import pytest
+from moto import mock_s3
+
+from src.models import MCPTool
+from src.storage import get_changelog, save_and_record_changes
+from src.storage.changelog import LocalChangelog, S3Changelog, change_entry
+from src.storage.local_storage import LocalStorage
+from src.storage.sharded_s3_storage import ShardedS3Storage
+
+
+def tool(url):
+    return MCPTool(name="Tool", description="An MCP server", url=url,
+                   source_url="https://github.com/octo/awesome")
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_s3():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket="catalog-bucket")
+        yield client
+
+
+class TestChangelog:
+    """Test appending entries and reading them after a cursor."""
+
+    def test_entries_split_added_and_updated(self):
+        """Test that an entry lists each change with the tool's version."""
+        new, changed = tool("https://github.com/a/new"), tool("https://github.com/a/changed")
+
+        entry = change_entry([new, changed], ["tool-gone"], {new.id})
+
+        assert entry["added"] == [{"id": new.id, "version": new.last_updated}]
+        assert entry["updated"] == [{"id": changed.id, "version": changed.last_updated}]
+        assert entry["removed"] == ["tool-gone"]
+
+    def test_local_since_cursor(self, tmp_path):
+        """Test that entries are numbered in order and read back after a cursor."""
+        changelog = LocalChangelog(str(tmp_path / "tools.changes.jsonl"))
+
+        sequences = [asyncio.run(changelog.append(change_entry([], [f"tool-{i}"], []))) for i in range(3)]
+
+        assert sequences == [1, 2, 3]
+        assert [e["removed"] for e in asyncio.run(changelog.since(1))] == [["tool-1"], ["tool-2"]]
+        assert [e["sequence"] for e in asyncio.run(changelog.since(0, limit=2))] == [1, 2]
+        assert asyncio.run(changelog.since(3)) == []
+
+    def test_local_torn_entry_is_skipped(self, tmp_path):
+        """Test that an entry cut short by a crash neither breaks reads nor reuses its number."""
+        changelog = LocalChangelog(str(tmp_path / "tools.changes.jsonl"))
+        asyncio.run(changelog.append(change_entry([], ["tool-1"], [])))
+        with open(changelog.file_path, "a") as f:
+            f.write('{"sequence":2,"removed":["tool-')
+
+        assert asyncio.run(changelog.append(change_entry([], ["tool-2"], []))) == 2
+        assert [e["removed"] for e in asyncio.run(changelog.since())] == [["tool-1"], ["tool-2"]]
+
+    def test_s3_since_cursor(self, s3):
+        """Test that S3 entries are numbered in order and read back after a cursor."""
+        changelog = S3Changelog("catalog-bucket", "catalog/changes/")
+        for i in range(3):
+            asyncio.run(changelog.append(change_entry([], [f"tool-{i}"], [])))
+        # A writer that stopped before moving the head
+        s3.delete_object(Bucket="catalog-bucket", Key="catalog/changes/head.json")
+
+        assert asyncio.run(changelog.append(change_entry([], ["tool-3"], []))) == 4
+        assert [e["sequence"] for e in asyncio.run(changelog.since(2))] == [3, 4]
+
+    def test_changelog_sits_next_to_the_catalog(self, tmp_path, s3):
+        """Test that each backend's changelog is placed beside its catalog."""
+        storage = LocalStorage(str(tmp_path / "tools.json.gz"))
+        sharded = ShardedS3Storage(bucket_name="catalog-bucket", prefix="catalog/")
+
+        assert get_changelog(storage).file_path == tmp_path / "tools.changes.jsonl"
+        assert get_changelog(sharded).prefix == "catalog/changes/"
+        assert asyncio.run(save_and_record_changes(storage, [], []))
+        assert asyncio.run(get_changelog(storage).since()) == []
+        assert asyncio.run(save_and_record_changes(storage, [tool("https://github.com/a/one")], []))
+        assert [e["sequence"] for e in asyncio.run(get_changelog(storage).since())] == [1]
+
+    def test_failed_append_is_recorded_next_run(self, tmp_path, monkeypatch):
+        """Test that a change saved while the changelog was failing is recorded by the next write."""
+        storage = LocalStorage(str(tmp_path / "tools.json"))
+        one, two = tool("https://github.com/a/one"), tool("https://github.com/a/two")
+        append = LocalChangelog._append_sync
+
+        def failing(self, entry):
+            raise OSError("disk full")
+        monkeypatch.setattr(LocalChangelog, "_append_sync", failing)
+        assert asyncio.run(save_and_record_changes(storage, [one], []))
+        assert asyncio.run(get_changelog(storage).since()) == []
+
+        monkeypatch.setattr(LocalChangelog, "_append_sync", append)
+        assert asyncio.run(save_and_record_changes(storage, [two], []))
+        entries = asyncio.run(get_changelog(storage).since())
+        assert [e["updated"][0]["id"] for e in entries] == [one.id, two.id]
+        assert list(get_changelog(storage).pending_dir.iterdir()) == []
+
+    def test_failed_write_is_not_recorded(self, tmp_path, monkeypatch):
+        """Test that changes the catalog write rejected never reach the changelog."""
+        storage = LocalStorage(str(tmp_path / "tools.json"))
+
+        async def failing(upserted, removed_ids):
+            return False
+        monkeypatch.setattr(storage, "save_changes", failing)
+        assert not asyncio.run(save_and_record_changes(storage, [tool("https://github.com/a/one")], []))
+        assert asyncio.run(get_changelog(storage).publish_pending())
+        assert asyncio.run(get_changelog(storage).since()) == []
+
+    def test_s3_pending_entries_publish_in_order(self, s3):
+        """Test that S3 pending entries are appended oldest first and then removed."""
+        changelog = S3Changelog("catalog-bucket", "catalog/changes/")
+        first = asyncio.run(changelog.stage(change_entry([], ["tool-1"], [])))
+        asyncio.run(changelog.stage(change_entry([], ["tool-2"], [])))
+        discarded = asyncio.run(changelog.stage(change_entry([], ["tool-3"], [])))
+        asyncio.run(changelog.discard(discarded))
+
+        assert first is not None
+        assert asyncio.run(changelog.publish_pending())
+        assert [e["removed"] for e in asyncio.run(changelog.since())] == [["tool-1"], ["tool-2"]]
+        assert "Contents" not in s3.list_objects_v2(Bucket="catalog-bucket", Prefix="catalog/changes/pending/")
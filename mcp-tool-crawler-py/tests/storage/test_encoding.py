@@ -0,0 +1,41 @@
+"""Test module for streaming catalog encoding."""
+import gzip
+import io
+import json
+
+import pytest
+
+from src.storage import encoding
+from src.storage.encoding import encode_catalog, iter_catalog
+
+RECORDS = [{"id": f"tool-{i}", "name": "Tool é" * i, "tags": ["a", "b"], "stars": i * 1.5}
+           for i in range(30)]
+
+
+class TestCatalogEncoding:
+    """Test encoding and incrementally decoding catalogs."""
+
+    @pytest.mark.parametrize("compression", ["none", "gzip"])
+    def test_round_trip_across_chunks(self, compression, monkeypatch):
+        """Test that records straddling read chunks decode intact."""
+        monkeypatch.setattr(encoding, "READ_CHUNK_SIZE", 7)
+        data = encode_catalog(RECORDS, compression)
+
+        assert list(iter_catalog(io.BytesIO(data))) == RECORDS
+
+    def test_output_is_a_json_array(self):
+        """Test that an uncompressed catalog stays readable as plain JSON."""
+        assert json.loads(encode_catalog(RECORDS)) == RECORDS
+
+    def test_reads_pretty_printed_catalogs(self):
+        """Test that catalogs written with indentation are still read."""
+        data = gzip.compress(json.dumps(RECORDS, indent=2).encode("utf-8"))
+
+        assert list(iter_catalog(io.BytesIO(data))) == RECORDS
+
+    def test_truncated_catalog_is_an_error(self):
+        """Test that a catalog cut short does not pass as complete."""
+        data = encode_catalog(RECORDS)[:-10]
+
+        with pytest.raises(ValueError):
+            list(iter_catalog(io.BytesIO(data)))
@@ -0,0 +1,82 @@
+"""Test module for append-only JSON Lines tool storage."""
+import asyncio
+
+from src.models import MCPTool
+from src.services.catalog_index import CatalogIndex
+from src.storage.jsonl_storage import JsonLinesStorage
+
+
+def tool(url, description="An MCP server"):
+    return MCPTool(name="Tool", description=description, url=url,
+                   source_url="https://github.com/octo/awesome")
+
+
+def log_lines(storage):
+    return storage.file_path.read_text().splitlines()
+
+
+class TestJsonLinesStorage:
+    """Test the append log, its replay and compaction."""
+
+    def test_changes_are_appended_and_replayed(self, tmp_path):
+        """Test that saving changes appends records instead of rewriting the catalog."""
+        storage = JsonLinesStorage(str(tmp_path / "tools.jsonl"))
+        one, two = tool("https://github.com/a/one"), tool("https://github.com/a/two")
+
+        asyncio.run(storage.save_tools([one, two]))
+        asyncio.run(storage.save_changes([tool("https://github.com/a/one", "Updated")], [two.id]))
+
+        assert len(log_lines(storage)) == 4
+        [stored] = asyncio.run(JsonLinesStorage(str(storage.file_path)).load_tools())
+        assert stored.id == one.id
+        assert stored.description == "Updated"
+
+    def test_torn_last_record_is_skipped(self, tmp_path):
+        """Test that a record cut short by a crash does not corrupt the catalog."""
+        storage = JsonLinesStorage(str(tmp_path / "tools.jsonl"))
+        asyncio.run(storage.save_tools([tool("https://github.com/a/one")]))
+        with open(storage.file_path, "a") as f:
+            f.write('{"op":"put","tool":{"id":"tool-torn"')
+
+        asyncio.run(storage.save_changes([tool("https://github.com/a/two")], []))
+
+        tools = asyncio.run(storage.load_tools())
+        assert [t.url for t in tools] == ["https://github.com/a/one", "https://github.com/a/two"]
+
+    def test_compaction_keeps_only_live_records(self, tmp_path):
+        """Test that compaction drops superseded records and keeps the catalog."""
+        storage = JsonLinesStorage(str(tmp_path / "tools.jsonl"), compaction_min_records=2)
+
+        async def crawl():
+            await storage.save_tools([tool("https://github.com/a/one"), tool("https://github.com/a/two")])
+            await storage.load_tools()
+            for i in range(5):
+                await storage.save_changes([tool("https://github.com/a/one", f"Version {i}")], [])
+            await storage.compact()
+            return await storage.load_tools()
+
+        tools = asyncio.run(crawl())
+
+        assert len(log_lines(storage)) == 2
+        assert {t.description for t in tools} == {"Version 4", "An MCP server"}
+
+    def test_crawls_compact_the_log(self, tmp_path):
+        """Test that crawls reading the catalog through iter_tools() still compact it."""
+        source = "https://github.com/octo/awesome"
+
+        async def crawl(run):
+            storage = JsonLinesStorage(str(tmp_path / "tools.jsonl"), compaction_min_records=5)
+            catalog = await CatalogIndex.from_storage(storage)
+            catalog.apply(source, [tool(f"https://github.com/a/tool-{i}", f"Run {run}") for i in range(5)])
+            upserted, removed_ids = catalog.take_changes()
+            await storage.save_changes(upserted, removed_ids)
+            if storage._compaction is not None:
+                # Let the background compaction finish before the run ends
+                await storage._compaction
+            return storage
+
+        for run in range(6):
+            storage = asyncio.run(crawl(run))
+
+        assert len(log_lines(storage)) < 15
+        assert {t.description for t in asyncio.run(storage.load_tools())} == {"Run 5"}
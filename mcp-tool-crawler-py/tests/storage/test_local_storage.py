@@ -0,0 +1,60 @@
+"""Test module for local tool storage."""
+import asyncio
+
+from src.models import MCPTool
+from src.storage import iter_tool_batches
+from src.storage import local_storage
+from src.storage.local_storage import LocalStorage
+
+
+def tool(url, description="An MCP server"):
+    return MCPTool(name="Tool", description=description, url=url,
+                   source_url="https://github.com/octo/awesome")
+
+
+class TestLocalStorage:
+    """Test saving and loading the tool catalog."""
+
+    def test_repeated_saves_are_idempotent(self, tmp_path):
+        """Test that re-crawled tools upsert by ID instead of growing the catalog."""
+        storage = LocalStorage(str(tmp_path / "tools.json"))
+
+        asyncio.run(storage.save_tools([tool("https://github.com/a/one"), tool("https://github.com/A/One/")]))
+        asyncio.run(storage.save_changes([tool("https://github.com/a/one", "Updated")], []))
+
+        [stored] = asyncio.run(storage.load_tools())
+        assert stored.description == "Updated"
+        assert stored.id == tool("https://github.com/a/one").id
+
+    def test_gzip_catalog_round_trip(self, tmp_path):
+        """Test that a compressed catalog is saved compressed and loads back."""
+        storage = LocalStorage(str(tmp_path / "tools.json.gz"), compression="gzip")
+
+        asyncio.run(storage.save_tools([tool("https://github.com/a/one")]))
+
+        assert storage.file_path.read_bytes()[:2] == b"\x1f\x8b"
+        [stored] = asyncio.run(LocalStorage(str(storage.file_path)).load_tools())
+        assert stored.url == "https://github.com/a/one"
+
+    def test_default_path_keeps_existing_catalog(self, tmp_path, monkeypatch):
+        """Test that enabling compression keeps using a catalog saved at the old default path."""
+        monkeypatch.setattr(local_storage, "DATA_DIR", tmp_path)
+        asyncio.run(LocalStorage(compression="none").save_tools([tool("https://github.com/a/one")]))
+
+        storage = LocalStorage(compression="gzip")
+
+        assert storage.file_path == tmp_path / "tools.json"
+        [stored] = asyncio.run(storage.load_tools())
+        assert stored.url == "https://github.com/a/one"
+        (tmp_path / "tools.json").unlink()
+        assert LocalStorage(compression="gzip").file_path == tmp_path / "tools.json.gz"
+
+    def test_iter_tools_in_batches(self, tmp_path):
+        """Test that the catalog can be consumed in fixed-size batches."""
+        storage = LocalStorage(str(tmp_path / "tools.json"))
+        asyncio.run(storage.save_tools([tool(f"https://github.com/a/tool-{i}") for i in range(5)]))
+
+        async def consume():
+            return [[t.url[-1] for t in batch] async for batch in iter_tool_batches(storage, 2)]
+
+        assert asyncio.run(consume()) == [["0", "1"], ["2", "3"], ["4"]]
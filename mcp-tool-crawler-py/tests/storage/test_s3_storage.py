@@ -0,0 +1,123 @@
+"""Test module for S3 tool storage."""
+import asyncio
+import threading
+
+import boto3
+from moto import mock_s3
+
+from src.models import MCPTool
+from src.storage import s3_storage
+from src.storage.s3_storage import S3Storage
+from src.utils.serialization import dumps
+
+
+def tool(url, description="An MCP server"):
+    return MCPTool(name="Tool", description=description, url=url,
+                   source_url="https://github.com/octo/awesome")
+
+
+class TestS3Storage:
+    """Test saving and loading the catalog in S3."""
+
+    @mock_s3
+    def test_compressed_catalog_round_trip(self, monkeypatch):
+        """Test that a gzip catalog is tagged with its Content-Encoding and loads back."""
+        monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+        client = boto3.client("s3")
+        client.create_bucket(Bucket="catalog-bucket")
+        storage = S3Storage(bucket_name="catalog-bucket", key="tools.json", compression="gzip")
+
+        asyncio.run(storage.save_tools([tool("https://github.com/a/one")]))
+        asyncio.run(storage.save_changes([tool("https://github.com/a/two")], []))
+
+        encoding = client.head_object(Bucket="catalog-bucket", Key="tools.json")["ContentEncoding"]
+        assert encoding.split(",")[0] == "gzip"
+        tools = asyncio.run(S3Storage(bucket_name="catalog-bucket", key="tools.json").load_tools())
+        assert sorted(t.url for t in tools) == ["https://github.com/a/one", "https://github.com/a/two"]
+
+    @mock_s3
+    def test_iter_tools_streams_the_catalog(self, monkeypatch):
+        """Test iterating over the catalog, and over a missing one."""
+        monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+        boto3.client("s3").create_bucket(Bucket="catalog-bucket")
+        storage = S3Storage(bucket_name="catalog-bucket", key="tools.json")
+
+        async def consume():
+            return [t.url async for t in storage.iter_tools()]
+
+        assert asyncio.run(consume()) == []
+        asyncio.run(storage.save_tools([tool("https://github.com/a/one"), tool("https://github.com/a/two")]))
+        assert asyncio.run(consume()) == ["https://github.com/a/one", "https://github.com/a/two"]
+
+    @mock_s3
+    def test_s3_calls_run_off_the_event_loop(self, monkeypatch):
+        """Test that every S3 call is made from a worker thread, not the event loop's."""
+        monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+        boto3.client("s3").create_bucket(Bucket="catalog-bucket")
+        storage = S3Storage(bucket_name="catalog-bucket", key="tools.json")
+        threads = []
+        for name in ("head_object", "get_object", "upload_fileobj"):
+            method = getattr(storage.s3_client, name)
+
+            def record(*args, _method=method, **kwargs):
+                threads.append(threading.get_ident())
+                return _method(*args, **kwargs)
+            monkeypatch.setattr(storage.s3_client, name, record)
+
+        async def run():
+            await storage.save_tools([tool("https://github.com/a/one")])
+            await storage.save_changes([tool("https://github.com/a/two")], [])
+            await storage.load_tools()
+            [t async for t in storage.iter_tools()]
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(run())
+        assert len(threads) >= 5 and loop_thread not in threads
+
+    @mock_s3
+    def test_iter_tools_reads_in_batches(self, monkeypatch):
+        """Test that batched reads keep catalog order and share one timestamp per call."""
+        monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+        client = boto3.client("s3")
+        client.create_bucket(Bucket="catalog-bucket")
+        records = [{"name": "Tool", "description": "An MCP server", "url": f"https://github.com/a/t{i}",
+                    "source_url": "https://github.com/octo/awesome"} for i in range(5)]
+        client.put_object(Bucket="catalog-bucket", Key="tools.json", Body=dumps(records))
+        monkeypatch.setattr(s3_storage, "ITER_BATCH_SIZE", 2)
+        calls = []
+        monkeypatch.setattr(s3_storage, "get_timestamp", lambda: calls.append(1) or f"2024-01-0{len(calls)}")
+        storage = S3Storage(bucket_name="catalog-bucket", key="tools.json")
+
+        async def consume():
+            return [t async for t in storage.iter_tools()]
+
+        tools = asyncio.run(consume())
+
+        assert [t.url for t in tools] == [r["url"] for r in records]
+        assert len(calls) == 1 and {t.first_discovered for t in tools} == {"2024-01-01"}
+
+    @mock_s3
+    def test_iter_tools_closes_the_body_on_early_stop(self, monkeypatch):
+        """Test that a consumer stopping early closes the streaming download."""
+        monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+        boto3.client("s3").create_bucket(Bucket="catalog-bucket")
+        storage = S3Storage(bucket_name="catalog-bucket", key="tools.json")
+        asyncio.run(storage.save_tools([tool(f"https://github.com/a/t{i}") for i in range(5)]))
+        monkeypatch.setattr(s3_storage, "ITER_BATCH_SIZE", 2)
+        bodies = []
+        get_object = storage.s3_client.get_object
+
+        def record(**kwargs):
+            response = get_object(**kwargs)
+            bodies.append(response["Body"])
+            return response
+        monkeypatch.setattr(storage.s3_client, "get_object", record)
+
+        async def first():
+            tools = storage.iter_tools()
+            tool = await tools.__anext__()
+            await tools.aclose()
+            return tool.url
+
+        assert asyncio.run(first()) == "https://github.com/a/t0"
+        assert len(bodies) == 1 and bodies[0]._raw_stream.closed
@@ -0,0 +1,157 @@
+"""Test module for sharded S3 tool storage."""
+import asyncio
+import datetime
+import itertools
+
+import boto3
+import moto.s3.models
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_s3
+
+from src.models import MCPTool
+from src.storage.sharded_s3_storage import CatalogVersionConflict, ShardedS3Storage
+
+
+def tool(url, description="An MCP server"):
+    return MCPTool(name="Tool", description=description, url=url,
+                   source_url="https://github.com/octo/awesome")
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_s3():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket="catalog-bucket")
+        yield client
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Give each S3 object a LastModified a second after the one before."""
+    start = datetime.datetime(2024, 1, 1)
+    ticks = itertools.count()
+    monkeypatch.setattr(moto.s3.models, "utcnow", lambda: start + datetime.timedelta(seconds=next(ticks)))
+
+
+def conditional_puts(storage, monkeypatch):
+    """Enforce IfMatch and IfNoneMatch on the storage's PUTs, which moto ignores."""
+    put_object = storage.s3_client.put_object
+
+    def put(**kwargs):
+        try:
+            etag = storage.s3_client.head_object(Bucket=kwargs["Bucket"], Key=kwargs["Key"])["ETag"]
+        except ClientError:
+            etag = None
+        if ("IfMatch" in kwargs and kwargs["IfMatch"] != etag) or ("IfNoneMatch" in kwargs and etag):
+            raise ClientError({"Error": {"Code": "PreconditionFailed"},
+                               "ResponseMetadata": {"HTTPStatusCode": 412}}, "PutObject")
+        return put_object(**kwargs)
+
+    monkeypatch.setattr(storage.s3_client, "put_object", put)
+
+
+def keys(client, prefix):
+    response = client.list_objects_v2(Bucket="catalog-bucket", Prefix=prefix)
+    return sorted(item["Key"] for item in response.get("Contents", []))
+
+
+class TestShardedS3Storage:
+    """Test shard uploads, the manifest pointer and pruning."""
+
+    def test_round_trip(self, s3):
+        """Test that a saved catalog loads back from its shards."""
+        storage = ShardedS3Storage(bucket_name="catalog-bucket", prefix="catalog/", shard_count=4)
+        tools = [tool(f"https://github.com/a/tool-{i}") for i in range(20)]
+
+        asyncio.run(storage.save_tools(tools))
+
+        loaded = asyncio.run(storage.load_tools())
+        assert sorted(t.id for t in loaded) == sorted(t.id for t in tools)
+        assert len(keys(s3, "catalog/shards/")) == 4
+
+    def test_changes_upload_only_touched_shards(self, s3):
+        """Test that a change rewrites its own shard and keeps the others."""
+        storage = ShardedS3Storage(bucket_name="catalog-bucket", prefix="catalog/", shard_count=4)
+        tools = [tool(f"https://github.com/a/tool-{i}") for i in range(20)]
+        asyncio.run(storage.save_tools(tools))
+        before = set(keys(s3, "catalog/shards/"))
+
+        updated = tool("https://github.com/a/tool-0", "Updated")
+        asyncio.run(storage.save_changes([updated], [tools[1].id]))
+
+        added = set(keys(s3, "catalog/shards/")) - before
+        touched = {storage.shard_of(updated.id), storage.shard_of(tools[1].id)}
+        assert {key.split("/")[-1].split("-")[0] for key in added} == touched
+
+        loaded = {t.id: t for t in asyncio.run(storage.load_tools())}
+        assert len(loaded) == 19
+        assert loaded[updated.id].description == "Updated"
+
+    def test_old_versions_are_pruned(self, s3, clock):
+        """Test that only the retained versions and their shards are kept."""
+        storage = ShardedS3Storage(bucket_name="catalog-bucket", prefix="catalog/", shard_count=1,
+                                   retained_versions=2)
+
+        for i in range(4):
+            asyncio.run(storage.save_changes([tool("https://github.com/a/one", f"Version {i}")], []))
+
+        assert [key[:31] for key in keys(s3, "catalog/manifests/")] == ["catalog/manifests/000000000003-",
+                                                                        "catalog/manifests/000000000004-"]
+        assert len(keys(s3, "catalog/shards/")) == 2
+        [loaded] = asyncio.run(storage.load_tools())
+        assert loaded.description == "Version 3"
+
+    def test_unpublished_shards_survive_pruning(self, s3, clock):
+        """Test that a shard newer than the retained manifests is kept for its writer."""
+        storage = ShardedS3Storage(bucket_name="catalog-bucket", prefix="catalog/", shard_count=1,
+                                   retained_versions=2)
+        asyncio.run(storage.save_changes([tool("https://github.com/a/one", "Version 0")], []))
+        asyncio.run(storage.save_changes([tool("https://github.com/a/one", "Version 1")], []))
+        # Another writer's shard, uploaded before its manifest
+        s3.put_object(Bucket="catalog-bucket", Key="catalog/shards/0-unpublished.json", Body=b"[]")
+
+        asyncio.run(storage.save_changes([tool("https://github.com/a/one", "Version 2")], []))
+
+        assert "catalog/shards/0-unpublished.json" in keys(s3, "catalog/shards/")
+        assert len(keys(s3, "catalog/shards/")) == 3
+
+    def test_racing_writers_publish_once(self, s3, monkeypatch):
+        """Test that of two writers building on the same version, only the first publishes."""
+        storage = ShardedS3Storage(bucket_name="catalog-bucket", prefix="catalog/", shard_count=1)
+        conditional_puts(storage, monkeypatch)
+        asyncio.run(storage.save_tools([tool("https://github.com/a/one")]))
+        # Both writers have read version 1 and passed any check before either swaps
+        first, second = storage._read_manifest(), storage._read_manifest()
+        one, two = tool("https://github.com/a/one"), tool("https://github.com/a/two")
+
+        storage._write_version(first, {"0": [one, two]})
+        with pytest.raises(CatalogVersionConflict):
+            storage._write_version(second, {"0": [one, tool("https://github.com/a/three")]})
+
+        assert storage._read_manifest()["version"] == 2
+        assert sorted(t.url for t in asyncio.run(storage.load_tools())) == ["https://github.com/a/one",
+                                                                              "https://github.com/a/two"]
+
+    def test_first_writers_publish_once(self, s3, monkeypatch):
+        """Test that only one of two writers creating the catalog publishes it."""
+        storage = ShardedS3Storage(bucket_name="catalog-bucket", prefix="catalog/", shard_count=1)
+        conditional_puts(storage, monkeypatch)
+
+        storage._write_version(None, {"0": [tool("https://github.com/a/one")]})
+        with pytest.raises(CatalogVersionConflict):
+            storage._write_version(None, {"0": [tool("https://github.com/a/two")]})
+
+        assert [t.url for t in asyncio.run(storage.load_tools())] == ["https://github.com/a/one"]
+
+    def test_iter_tools_reads_every_shard(self, s3):
+        """Test that iterating shard by shard yields the whole catalog."""
+        storage = ShardedS3Storage(bucket_name="catalog-bucket", prefix="catalog/", shard_count=8)
+        tools = [tool(f"https://github.com/a/tool-{i}") for i in range(40)]
+        asyncio.run(storage.save_tools(tools))
+
+        async def consume():
+            return [t.id async for t in storage.iter_tools()]
+
+        assert sorted(asyncio.run(consume())) == sorted(t.id for t in tools)
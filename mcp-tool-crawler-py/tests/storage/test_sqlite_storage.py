@@ -0,0 +1,70 @@
+"""Test module for SQLite tool storage."""
+import asyncio
+import sqlite3
+
+from src.models import MCPTool
+from src.storage.sqlite_storage import SqliteStorage
+
+
+def tool(url, name="Tool", description="An MCP server", tags=(), sources=()):
+    return MCPTool(name=name, description=description, url=url, source_url="https://github.com/octo/awesome",
+                   metadata={"tags": list(tags), "sources": list(sources)})
+
+
+class TestSqliteStorage:
+    """Test the tool table, source membership and the full-text index."""
+
+    def test_save_changes_and_replace(self, tmp_path):
+        """Test that changes upsert and delete rows and a save replaces the catalog."""
+        storage = SqliteStorage(str(tmp_path / "tools.db"))
+        one, two, three = (tool(f"https://github.com/a/{name}") for name in ("one", "two", "three"))
+
+        asyncio.run(storage.save_tools([one, two]))
+        asyncio.run(storage.save_changes([tool("https://github.com/a/one", description="Updated"), three],
+                                         [two.id]))
+
+        tools = asyncio.run(SqliteStorage(str(storage.file_path)).load_tools())
+        assert [(t.id, t.description) for t in tools] == [(one.id, "Updated"), (three.id, "An MCP server")]
+
+        asyncio.run(storage.save_tools([two]))
+
+        async def consume():
+            return [t.id async for t in storage.iter_tools()]
+
+        assert asyncio.run(consume()) == [two.id]
+        assert asyncio.run(storage.get_tool(one.id)) is None
+
+    def test_search_follows_changes(self, tmp_path):
+        """Test that the full-text index matches names, descriptions and tags as they change."""
+        storage = SqliteStorage(str(tmp_path / "tools.db"))
+        github = tool("https://github.com/a/github", name="GitHub Server", tags=["developer-tools"])
+        postgres = tool("https://github.com/a/postgres", name="Postgres", description="Query a database")
+        asyncio.run(storage.save_tools([github, postgres]))
+
+        assert [t.id for t in asyncio.run(storage.search("git serv"))] == [github.id]
+        assert [t.id for t in asyncio.run(storage.search("developer"))] == [github.id]
+        assert [t.id for t in asyncio.run(storage.search("database"))] == [postgres.id]
+        assert asyncio.run(storage.search('"unbalanced')) == []
+
+        asyncio.run(storage.save_changes([tool("https://github.com/a/postgres", name="Postgres",
+                                               description="Read tables")], []))
+
+        assert asyncio.run(storage.search("database")) == []
+        # Raises if the index no longer matches the tool table
+        with sqlite3.connect(storage.file_path) as connection:
+            connection.execute("INSERT INTO tools_fts (tools_fts) VALUES ('integrity-check')")
+
+    def test_tools_for_source(self, tmp_path):
+        """Test that a tool belongs to its own source and to every source merged into it."""
+        storage = SqliteStorage(str(tmp_path / "tools.db"))
+        merged = tool("https://github.com/a/one", sources=["https://github.com/other/list"])
+        single = tool("https://github.com/a/two")
+        asyncio.run(storage.save_tools([merged, single]))
+
+        assert ([t.id for t in asyncio.run(storage.tools_for_source("https://github.com/octo/awesome"))]
+                == [merged.id, single.id])
+        assert [t.id for t in asyncio.run(storage.tools_for_source("https://github.com/other/list"))] == [merged.id]
+
+        asyncio.run(storage.save_changes([], [merged.id]))
+
+        assert asyncio.run(storage.tools_for_source("https://github.com/other/list")) == []
@@ -0,0 +1,25 @@
+"""Test module for helper functions."""
+from src.utils.helpers import canonicalize_url
+
+
+class TestCanonicalizeUrl:
+    """Test URL canonicalization."""
+
+    def test_spellings_of_the_same_repository_match(self):
+        """Test that scheme, host, case, suffix and branch variants collapse."""
+        urls = [
+            "https://github.com/owner/repo",
+            "http://www.GitHub.com/Owner/Repo.git/",
+            "https://github.com/owner/repo/tree/main",
+            "https://github.com/owner/repo#readme",
+        ]
+
+        assert {canonicalize_url(url) for url in urls} == {"https://github.com/owner/repo"}
+
+    def test_subpaths_and_queries(self):
+        """Test that subpaths are kept and tracking parameters are dropped."""
+        assert (canonicalize_url("https://github.com/o/r/tree/main/src/server/")
+                == "https://github.com/o/r/tree/main/src/server")
+        assert (canonicalize_url("https://Example.com:443/a//b/?utm_source=x&b=2&a=1")
+                == "https://example.com/a/b?a=1&b=2")
+        assert canonicalize_url(" not a url ") == "not a url"
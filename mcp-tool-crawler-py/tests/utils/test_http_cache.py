@@ -0,0 +1,121 @@
+"""Test module for conditional-request HTTP caching."""
+import asyncio
+from typing import List
+
+import boto3
+from moto import mock_s3
+
+from src.crawlers.base import BaseCrawler
+from src.models import MCPTool, Source, SourceType
+from src.utils.http_cache import LocalCacheBackend, S3CacheBackend
+from src.utils.http_client import HttpClient
+
+
+def add_etag_route(http_server, make_route, path, body, etag='"v1"'):
+    """Serve body with an ETag, answering 304 when the client revalidates."""
+    def handler(method, request_path, headers, request_body):
+        if headers.get("If-None-Match") == etag:
+            return make_route(status=304)
+        return make_route(body=body, headers={"ETag": etag})
+
+    http_server.add_handler(path, handler)
+
+
+async def fetch_twice(client, url):
+    async with client:
+        first = await client.get(url)
+        second = await client.get(url)
+    return first, second
+
+
+class ReadmeCrawler(BaseCrawler):
+    """Crawler that parses one tool per line of the fetched page."""
+
+    async def discover_tools(self) -> List[MCPTool]:
+        text = await self.fetch_text(self.source.url, skip_if_unchanged=True)
+        self.raise_if_unchanged(text)
+        return [MCPTool(name=line, description=line, url=self.source.url,
+                        source_url=self.source.url) for line in text.splitlines()]
+
+
+class TestHttpCache:
+    """Test conditional GET through the HTTP client."""
+
+    def test_revalidates_with_etag(self, http_server, make_route, tmp_path):
+        """Test that the second fetch sends If-None-Match and replays the body."""
+        add_etag_route(http_server, make_route, "/readme", "# Tools")
+        client = HttpClient(cache=LocalCacheBackend(str(tmp_path)))
+
+        first, second = asyncio.run(fetch_twice(client, f"{http_server.url}/readme"))
+
+        assert not first.not_modified
+        assert second.not_modified
+        assert second.status == 200
+        assert second.text == "# Tools"
+        assert http_server.requests[1][2].get("If-None-Match") == '"v1"'
+
+    def test_crawler_short_circuits_on_304(self, http_server, make_route, tmp_path):
+        """Test that a 304 after a successful crawl skips parsing."""
+        add_etag_route(http_server, make_route, "/readme", "tool-a\ntool-b")
+        client = HttpClient(cache=LocalCacheBackend(str(tmp_path)))
+        source = Source(url=f"{http_server.url}/readme", name="Test",
+                        type=SourceType.WEBSITE, has_known_crawler=True)
+
+        first = ReadmeCrawler(source, client).execute()
+        source.last_crawl_status = "success"
+        source.metadata["content_digest"] = first.content_digest
+        second = ReadmeCrawler(source, client).execute()
+
+        assert first.tools_discovered == 2 and not first.unchanged
+        assert second.success and second.unchanged
+        assert second.tools_discovered == 0
+
+    def test_304_after_failed_crawl_reparses(self, http_server, make_route, tmp_path):
+        """Test that the cached body is parsed if the last crawl did not succeed."""
+        add_etag_route(http_server, make_route, "/readme", "tool-a")
+        client = HttpClient(cache=LocalCacheBackend(str(tmp_path)))
+        source = Source(url=f"{http_server.url}/readme", name="Test",
+                        type=SourceType.WEBSITE, has_known_crawler=True,
+                        last_crawl_status="failed")
+
+        ReadmeCrawler(source, client).execute()
+        result = ReadmeCrawler(source, client).execute()
+
+        assert not result.unchanged
+        assert result.tools_discovered == 1
+
+    def test_304_without_stored_digest_reparses(self, http_server, make_route, tmp_path):
+        """Test that a 304 is not trusted until the body's tools were committed."""
+        add_etag_route(http_server, make_route, "/readme", "tool-a")
+        client = HttpClient(cache=LocalCacheBackend(str(tmp_path)))
+        source = Source(url=f"{http_server.url}/readme", name="Test",
+                        type=SourceType.WEBSITE, has_known_crawler=True)
+
+        first = ReadmeCrawler(source, client).execute()
+        # The crawl succeeded but the catalog write did not, so no digest was saved
+        source.last_crawl_status = "success"
+        second = ReadmeCrawler(source, client).execute()
+
+        assert not second.unchanged and second.tools_discovered == 1
+
+        # Once saved, a parser change still makes the unchanged body parse again
+        source.metadata["content_digest"] = first.content_digest
+        crawler = ReadmeCrawler(source, client)
+        crawler.parser_version = "2"
+        third = crawler.execute()
+
+        assert not third.unchanged and third.tools_discovered == 1
+
+    @mock_s3
+    def test_s3_backend_round_trip(self, monkeypatch):
+        """Test storing and reading records under an S3 prefix."""
+        monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+        boto3.client("s3").create_bucket(Bucket="cache-bucket")
+        backend = S3CacheBackend(bucket_name="cache-bucket", prefix="http-cache/")
+
+        async def round_trip():
+            assert await backend.get("http:https://example.com") is None
+            await backend.set("http:https://example.com", {"etag": '"x"'})
+            return await backend.get("http:https://example.com")
+
+        assert asyncio.run(round_trip()) == {"etag": '"x"'}
@@ -0,0 +1,73 @@
+"""Test module for the shared HTTP client."""
+import asyncio
+import gzip
+
+from src.utils.http_cache import LocalCacheBackend
+from src.utils.http_client import HttpClient, HttpResponse
+
+
+async def fetch(client, url, **kwargs):
+    async with client:
+        return await client.get(url, **kwargs)
+
+
+class TestBodyLimit:
+    """Test memory-bounded reading of response bodies."""
+
+    def test_stops_reading_at_limit(self, http_server):
+        """Test that an oversized body is cut off at the limit and marked truncated."""
+        http_server.add("/big", b"x" * (1024 * 1024))
+        client = HttpClient(max_body_bytes=1000)
+
+        response = asyncio.run(fetch(client, f"{http_server.url}/big"))
+
+        assert len(response.body) == 1000
+        assert response.truncated
+
+    def test_body_within_limit_is_complete(self, http_server):
+        """Test that a body exactly at the limit is not marked truncated."""
+        http_server.add("/small", b"y" * 1000)
+        client = HttpClient(max_body_bytes=1000)
+
+        response = asyncio.run(fetch(client, f"{http_server.url}/small"))
+
+        assert response.body == b"y" * 1000
+        assert not response.truncated
+
+    def test_limit_applies_to_decompressed_body(self, http_server):
+        """Test that gzip bodies are decompressed incrementally and capped after decompression."""
+        http_server.add("/gz", gzip.compress(b"z" * 500_000), headers={"Content-Encoding": "gzip"})
+        client = HttpClient(max_body_bytes=100_000)
+
+        response = asyncio.run(fetch(client, f"{http_server.url}/gz"))
+
+        assert response.body == b"z" * 100_000
+        assert response.truncated
+
+    def test_per_request_limit(self, http_server):
+        """Test that a per-request limit overrides the client default."""
+        http_server.add("/page", "<html>" + "a" * 10_000)
+        client = HttpClient()
+
+        async def fetch_text():
+            async with client:
+                return await client.get_text(f"{http_server.url}/page", max_bytes=6)
+
+        assert asyncio.run(fetch_text()) == "<html>"
+
+    def test_truncated_body_not_cached(self, http_server, tmp_path):
+        """Test that a truncated body is never stored in the HTTP cache."""
+        http_server.add("/big", b"x" * 5000, headers={"ETag": '"v1"'})
+        client = HttpClient(cache=LocalCacheBackend(str(tmp_path)), max_body_bytes=100)
+
+        asyncio.run(fetch(client, f"{http_server.url}/big"))
+
+        assert not list(tmp_path.iterdir())
+
+    def test_text_drops_cut_multibyte_character(self):
+        """Test that a character split by truncation is dropped from the text."""
+        body = "héllo".encode("utf-8")[:2]
+        response = HttpResponse(url="http://example.com", status=200, headers={},
+                                body=body, truncated=True)
+
+        assert response.text == "h"
@@ -0,0 +1,97 @@
+"""Test module for request rate limiting."""
+import asyncio
+import time
+
+from src.utils.http_client import HttpClient
+from src.utils.rate_limit import GitHubTokenPool, HostScheduler, TokenBucket
+
+
+class TestTokenBucket:
+    """Test token bucket pacing."""
+
+    def test_paces_after_burst(self):
+        """Test that requests beyond the burst are spread at the configured rate."""
+        bucket = TokenBucket(rate=20, burst=2)
+
+        async def take(n):
+            for _ in range(n):
+                await bucket.acquire()
+
+        start = time.monotonic()
+        asyncio.run(take(6))
+        elapsed = time.monotonic() - start
+
+        assert 0.15 <= elapsed < 0.5
+
+
+class TestRateLimitedRequests:
+    """Test how the HTTP client reacts to rate-limit responses."""
+
+    def test_rotates_to_token_with_quota(self, http_server, make_route):
+        """Test that an exhausted token is swapped for another one in the pool."""
+        reset = str(int(time.time()) + 3600)
+
+        def handler(method, path, headers, body):
+            if headers.get("Authorization") == "Bearer exhausted":
+                return make_route(status=403, headers={
+                    "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset,
+                })
+            return make_route(body="ok", headers={"X-RateLimit-Remaining": "4999"})
+
+        http_server.add_handler("/repos", handler)
+        pool = GitHubTokenPool(["exhausted", "fresh"], hosts={"127.0.0.1"})
+        client = HttpClient(token_pool=pool)
+
+        async def fetch_twice():
+            async with client:
+                await client.get(f"{http_server.url}/repos")
+                return await client.get(f"{http_server.url}/repos")
+
+        # The pool has no quota information at first, so either token may go first
+        response = asyncio.run(fetch_twice())
+
+        assert response.text == "ok"
+        used = [request[2]["Authorization"] for request in http_server.requests]
+        assert used[-2:] == ["Bearer fresh", "Bearer fresh"]
+        assert used.count("Bearer exhausted") <= 1
+
+    def test_honours_retry_after(self, http_server, make_route):
+        """Test that a 429 with Retry-After is retried after the given delay."""
+        calls = []
+
+        def handler(method, path, headers, body):
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                return make_route(status=429, headers={"Retry-After": "0.3"})
+            return make_route(body="ok")
+
+        http_server.add_handler("/page", handler)
+        client = HttpClient(scheduler=HostScheduler(default_rate=0, host_rates={}))
+
+        async def fetch():
+            async with client:
+                return await client.get(f"{http_server.url}/page")
+
+        response = asyncio.run(fetch())
+
+        assert response.text == "ok"
+        assert calls[1] - calls[0] >= 0.3
+
+    def test_gives_up_when_reset_is_too_far(self, http_server, make_route):
+        """Test that an unauthenticated limit far in the future fails fast."""
+        http_server.add("/api", status=403, headers={
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(int(time.time()) + 3600),
+        })
+        client = HttpClient()
+
+        async def fetch():
+            async with client:
+                return await client.get(f"{http_server.url}/api", raise_for_status=False)
+
+        start = time.monotonic()
+        response = asyncio.run(fetch())
+
+        assert response.status == 403
+        assert time.monotonic() - start < 1.0
+        assert len(http_server.requests) == 1
@@ -0,0 +1,90 @@
+"""Test module for fetch retries and circuit breaking."""
+import asyncio
+import time
+
+import pytest
+
+from src.utils.http_client import CircuitOpenError, HttpClient, HttpError
+from src.utils.resilience import CircuitBreaker, CircuitBreakerRegistry, RetryPolicy
+
+
+class TestRetryPolicy:
+    """Test backoff delays."""
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test that delays stay within the exponential ceiling and the cap."""
+        policy = RetryPolicy(max_attempts=5, base_delay=0.5, max_delay=2)
+
+        for attempt, ceiling in [(1, 0.5), (2, 1.0), (3, 2.0), (6, 2.0)]:
+            delays = [policy.backoff(attempt) for _ in range(50)]
+            assert all(0 <= delay <= ceiling for delay in delays)
+            assert len(set(delays)) > 1
+
+
+class TestCircuitBreaker:
+    """Test circuit breaker state transitions."""
+
+    def test_half_open_trial_closes_circuit(self):
+        """Test that a successful trial after the reset timeout closes the circuit."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        breaker.record_failure()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+
+        time.sleep(0.06)
+        assert breaker.allow_request()
+        # Only one trial request at a time
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request()
+
+
+class TestRetriedRequests:
+    """Test how the HTTP client retries transient failures."""
+
+    def test_retries_server_error(self, http_server, make_route):
+        """Test that a 503 followed by a 200 succeeds."""
+        calls = []
+
+        def handler(method, path, headers, body):
+            calls.append(path)
+            if len(calls) == 1:
+                return make_route(status=503)
+            return make_route(body="ok")
+
+        http_server.add_handler("/flaky", handler)
+        client = HttpClient(retry_policy=RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.01))
+
+        async def fetch():
+            async with client:
+                return await client.get(f"{http_server.url}/flaky")
+
+        response = asyncio.run(fetch())
+
+        assert response.text == "ok"
+        assert len(calls) == 2
+
+    def test_open_circuit_fails_fast(self, http_server):
+        """Test that requests are refused without being sent once the circuit opens."""
+        http_server.add("/down", "", status=500)
+        client = HttpClient(
+            retry_policy=RetryPolicy(max_attempts=2, base_delay=0, max_delay=0),
+            circuit_breakers=CircuitBreakerRegistry(failure_threshold=2, reset_timeout=60),
+        )
+
+        async def fetch_twice():
+            async with client:
+                with pytest.raises(HttpError) as first:
+                    await client.get(f"{http_server.url}/down")
+                with pytest.raises(CircuitOpenError):
+                    await client.get(f"{http_server.url}/down")
+                return first.value
+
+        error = asyncio.run(fetch_twice())
+
+        assert error.status == 500
+        assert len(http_server.paths()) == 2
@@ -0,0 +1,38 @@
+"""Test module for JSON serialization."""
+import json
+
+from src.models import MCPTool, Source, SourceType
+from src.utils import serialization
+from src.utils.serialization import dumps, loads, model_to_dict, model_to_json, record_to_json
+
+
+class TestSerialization:
+    """Test model and value serialization."""
+
+    def test_model_json_matches_its_dict(self):
+        """Test that a model serializes like its JSON-compatible dict."""
+        tool = MCPTool(name="Tool", description="Ünïcode — server", url="https://github.com/a/tool",
+                       source_url="https://github.com/octo/awesome", metadata={"tags": ["api"], "stars": 3})
+
+        assert model_to_json(tool) == dumps(model_to_dict(tool))
+        assert record_to_json(tool) == record_to_json(model_to_dict(tool))
+        assert MCPTool(**loads(model_to_json(tool))) == tool
+
+    def test_enums_become_values(self):
+        """Test that dicts for responses and DynamoDB hold plain values."""
+        source = Source(url="https://github.com/octo/awesome", name="Awesome",
+                        type=SourceType.GITHUB_AWESOME_LIST, has_known_crawler=True)
+
+        assert model_to_dict(source)["type"] == SourceType.GITHUB_AWESOME_LIST.value
+        assert json.loads(json.dumps(model_to_dict(source))) == model_to_dict(source)
+
+    def test_standard_library_fallback_matches(self, monkeypatch):
+        """Test that output is the same with and without orjson."""
+        value = {"name": "Tööl", "tags": ["a", "b"], "stars": 3, "score": 0.5, "ok": True, "none": None, 1: "x"}
+        fast = dumps(value)
+
+        monkeypatch.setattr(serialization, "orjson", None)
+
+        assert dumps(value) == fast
+        expected = {"name": "Tööl", "tags": ["a", "b"], "stars": 3, "score": 0.5, "ok": True, "none": None, "1": "x"}
+        assert loads(fast) == loads(fast.decode("utf-8")) == expected